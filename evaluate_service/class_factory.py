@@ -17,10 +17,9 @@ class ClassFactory(object):
     __registry__ = {}
 
     @classmethod
-    def register(cls):
+    def register(cls, alias=None):
         """Register class into registry.
 
-        :param type_name: type_name: type name of class registry
         :param alias: alias of class name
         :return: wrapper
         """
@@ -31,7 +30,7 @@ class ClassFactory(object):
             :param t_cls: class need to register
             :return: wrapper of t_cls
             """
-            t_cls_name = t_cls.__name__
+            t_cls_name = alias if alias is not None else t_cls.__name__
             if t_cls_name not in cls.__registry__:
                 cls.__registry__[t_cls_name] = t_cls
             else:
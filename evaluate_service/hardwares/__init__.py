@@ -1,5 +1,6 @@
 from .davinci.davinci import Davinci
 from .mobile.mobile import Mobile
 from .kirin990_npu.kirin990_npu import Kirin990_npu
+from .cpu_onnx.cpu_onnx import CpuOnnx
 
-__all__ = ['Davinci', "Mobile", "Kirin990_npu"]
+__all__ = ['Davinci', "Mobile", "Kirin990_npu", "CpuOnnx"]
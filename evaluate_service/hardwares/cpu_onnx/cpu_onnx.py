@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020. Huawei Technologies Co., Ltd. All rights reserved.
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# MIT License for more details.
+
+"""The hardware of local cpu with onnxruntime."""
+import logging
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from evaluate_service.class_factory import ClassFactory
+import numpy as np
+
+
+@ClassFactory.register(alias="cpu_onnx")
+class CpuOnnx(object):
+    """Run the onnx models on the cpu of the evaluate service machine with onnxruntime."""
+
+    model_name = "cpu_onnx_model.onnx"
+    max_sessions = 8
+    _sessions = OrderedDict()
+    _lock = threading.Lock()
+
+    def __init__(self, optional_params):
+        self.threads = int(optional_params.get("cpu_onnx_threads") or 0)
+        self.trusted = bool(optional_params.get("cpu_onnx_trusted", False))
+
+    def convert_model(self, backend, model, weight, **kwargs):
+        """Convert the pytorch/onnx model to onnx model.
+
+        :param backend: the backend can be one of "pytorch" and "onnx"
+        :type backend: str
+        :param model: the model file need to convert, a TorchScript model saved by `torch.jit.save` for
+            pytorch, or a whole model saved by `torch.save` if the service runs with `-cpu_onnx_trusted`
+        :type model: str
+        :param weight: the state dict of the pytorch model, optional
+        :type weight: str
+        """
+        save_dir = kwargs["save_dir"]
+        os.makedirs(save_dir, exist_ok=True)
+        onnx_model = os.path.join(save_dir, self.model_name)
+        if backend == "onnx":
+            shutil.copyfile(model, onnx_model)
+        elif backend == "pytorch":
+            self._pytorch2onnx(model, weight, kwargs.get("input_shape"), onnx_model)
+        else:
+            raise ValueError("The backend of cpu_onnx must be pytorch or onnx, but get {}.".format(backend))
+
+    def inference(self, converted_model, input_data, **kwargs):
+        """Inference in cpu with onnxruntime.
+
+        :param converted_model: converted model file
+        :type backend: str
+        :param input_data: the input data file of float32
+        :type model: str
+        :param input_shape: the input shape of the request, such as "input:1,3,224,224", required if the
+            model has more than one dynamic axis
+        :type input_shape: str
+        :return: the latency in ms and the first output
+        :rtype: tuple
+        """
+        if not os.path.isfile(converted_model):
+            converted_model = os.path.join(converted_model, self.model_name)
+        session = self._get_session(converted_model)
+        model_input = session.get_inputs()[0]
+        input_shape = kwargs.get("input_shape")
+        if input_shape:
+            shape = _parse_shape(input_shape)
+        else:
+            shape = [dim if isinstance(dim, int) else -1 for dim in model_input.shape]
+            if shape.count(-1) > 1:
+                raise ValueError("The model has more than one dynamic axis, the input shape must be provided.")
+        data = np.fromfile(input_data, dtype=np.float32).reshape(shape)
+        start = time.perf_counter()
+        outputs = session.run(None, {model_input.name: data})
+        latency = (time.perf_counter() - start) * 1000
+        return latency, outputs[0].flatten().tolist()
+
+    def _get_session(self, onnx_model):
+        """Get the session of the model, the sessions are cached and warmed up."""
+        import onnxruntime
+        key = (os.path.realpath(onnx_model), os.path.getmtime(onnx_model), self.threads)
+        with self._lock:
+            if key in self._sessions:
+                self._sessions.move_to_end(key)
+                return self._sessions[key]
+            options = onnxruntime.SessionOptions()
+            if self.threads > 0:
+                options.intra_op_num_threads = self.threads
+            session = onnxruntime.InferenceSession(onnx_model, options, providers=["CPUExecutionProvider"])
+            model_input = session.get_inputs()[0]
+            shape = [dim if isinstance(dim, int) else 1 for dim in model_input.shape]
+            session.run(None, {model_input.name: np.zeros(shape, dtype=np.float32)})
+            self._sessions[key] = session
+            if len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+            logging.info("Create the onnxruntime session of {}.".format(onnx_model))
+            return session
+
+    def _pytorch2onnx(self, model, weight, input_shape, onnx_model):
+        """Export a pytorch model to onnx model."""
+        import torch
+        if not input_shape:
+            raise ValueError("The input shape must be provided to convert pytorch model.")
+        input_shape = _parse_shape(input_shape)
+        try:
+            torch_model = torch.jit.load(model, map_location="cpu")
+        except RuntimeError:
+            if not self.trusted:
+                raise ValueError("The pytorch model must be a TorchScript model saved by torch.jit.save, "
+                                 "whole models are only accepted if the service runs with -cpu_onnx_trusted.")
+            torch_model = torch.load(model, map_location="cpu")
+        if weight:
+            torch_model.load_state_dict(self._load_weights(weight))
+        torch_model.eval()
+        torch.onnx.export(torch_model, torch.randn(input_shape), onnx_model, input_names=["input"],
+                          output_names=["output"], dynamic_axes={"input": {0: "batch"}, "output": {0: "batch"}})
+
+    def _load_weights(self, weight):
+        """Load the state dict without unpickling objects other than tensors and containers."""
+        import inspect
+        import torch
+        if "weights_only" in inspect.signature(torch.load).parameters:
+            return torch.load(weight, map_location="cpu", weights_only=True)
+        if not self.trusted:
+            raise ValueError("The torch version does not support weights_only loading, the weight file is only "
+                             "accepted if the service runs with -cpu_onnx_trusted.")
+        return torch.load(weight, map_location="cpu")
+
+
+def _parse_shape(input_shape):
+    """Parse the input shape such as "input:1,3,224,224" or "1,3,224,224"."""
+    return [int(dim) for dim in input_shape.split(":")[-1].split(",")]
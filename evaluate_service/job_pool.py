@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020. Huawei Technologies Co., Ltd. All rights reserved.
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# MIT License for more details.
+
+"""The job queue and per-hardware worker pool of the evaluate service."""
+import logging
+import queue
+import threading
+import time
+import uuid
+
+
+class Job(object):
+    """An evaluation job.
+
+    :param hardware: name of the hardware
+    :type hardware: str
+    :param func: function to evaluate, called with the device lock and returns the result dict
+    :type func: function
+    """
+
+    def __init__(self, hardware, func):
+        self.task_id = uuid.uuid4().hex
+        self.hardware = hardware
+        self.func = func
+        self.status = "queued"
+        self.result = None
+        self.submit_time = time.time()
+        self.finish_time = None
+        self.done = threading.Event()
+
+    def to_dict(self):
+        """Return the state of the job."""
+        return {"task_id": self.task_id, "hardware": self.hardware, "status": self.status, "result": self.result}
+
+
+class JobPool(object):
+    """Run the jobs of each hardware in a pool of worker threads.
+
+    Conversions run concurrently in the workers, while the inferences on a hardware hold one of
+    its `devices` slots, so a device never runs two models at the same time.
+
+    :param workers: number of worker threads of each hardware
+    :type workers: int
+    :param devices: number of devices of each hardware
+    :type devices: int
+    :param keep_time: seconds to keep the finished jobs for polling
+    :type keep_time: int
+    """
+
+    def __init__(self, workers=1, devices=1, keep_time=3600):
+        self.workers = workers
+        self.devices = devices
+        self.keep_time = keep_time
+        self._jobs = {}
+        self._queues = {}
+        self._device_locks = {}
+        self._lock = threading.Lock()
+
+    def submit(self, hardware, func):
+        """Put a job into the queue of the hardware, and return it."""
+        job = Job(hardware, func)
+        with self._lock:
+            self._clean()
+            self._jobs[job.task_id] = job
+            if hardware not in self._queues:
+                self._start_workers(hardware)
+        self._queues[hardware].put(job)
+        return job
+
+    def get(self, task_id):
+        """Get a job by task id, return None if it does not exist."""
+        return self._jobs.get(task_id)
+
+    def device_lock(self, hardware):
+        """Get the lock of the devices of the hardware."""
+        with self._lock:
+            if hardware not in self._device_locks:
+                self._device_locks[hardware] = threading.BoundedSemaphore(self.devices)
+            return self._device_locks[hardware]
+
+    def _start_workers(self, hardware):
+        self._queues[hardware] = queue.Queue()
+        for index in range(self.workers):
+            worker = threading.Thread(target=self._work, args=(hardware,), daemon=True,
+                                      name="{}-worker-{}".format(hardware, index))
+            worker.start()
+
+    def _work(self, hardware):
+        while True:
+            job = self._queues[hardware].get()
+            job.status = "running"
+            try:
+                job.result = job.func(self.device_lock(hardware))
+                job.status = "finished"
+            except Exception as e:
+                logging.error("[ERROR] Job {} failed: {}".format(job.task_id, e))
+                job.result = {"status": "Job failed.", "error_message": str(e)}
+                job.status = "failed"
+            job.finish_time = time.time()
+            job.done.set()
+
+    def _clean(self):
+        expired_time = time.time() - self.keep_time
+        expired = [task_id for task_id, job in self._jobs.items()
+                   if job.finish_time is not None and job.finish_time < expired_time]
+        for task_id in expired:
+            self._jobs.pop(task_id)
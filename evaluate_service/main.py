@@ -24,7 +24,7 @@ except Exception:
     os.system("pip3 install Flask-RESTful==0.3.8")
     os.system("pip3 install Werkzeug==1.0.1")
 
-from flask import Flask, request
+from flask import Flask, request, send_file
 from flask_restful import Resource, Api
 
 try:
@@ -37,10 +37,14 @@ import multiprocessing
 import time
 import shutil
 from evaluate_service.class_factory import ClassFactory
+from evaluate_service.job_pool import JobPool
+from evaluate_service.model_cache import ModelCache
 from .hardwares import *  # noqa F401
 import datetime
 import traceback
+import uuid
 import argparse
+import numpy as np
 
 
 app = Flask(__name__)
@@ -54,12 +58,22 @@ class Evaluate(Resource):
         self.result = {"latency": "9999", "out_data": [], "status": "sucess", "timestamp": "", "error_message": ""}
 
     @classmethod
-    def _add_params(cls, work_path, optional_params):
+    def _add_params(cls, work_path, optional_params, job_pool, model_cache=None):
         cls.current_path = work_path
         cls.optional_params = optional_params
+        cls.job_pool = job_pool
+        cls.model_cache = model_cache
 
     def post(self):
         """Interface to response to the post request of the client."""
+        if not self._prepare():
+            return self.result
+        job = self.job_pool.submit(self.hardware, self.evaluate)
+        job.done.wait()
+        return self.response(job.result)
+
+    def _prepare(self):
+        """Parse the parameters and upload the files, return False if failed."""
         try:
             self.parse_paras()
             self.upload_files()
@@ -69,15 +83,16 @@ class Evaluate(Resource):
             self.result["error_message"] = traceback.format_exc()
             logging.error("[ERROR] Params error!")
             traceback.print_exc()
-            return self.result
+            return False
+        return True
 
+    def evaluate(self, device_lock):
+        """Convert the model and run the inferences, the inferences hold the device lock."""
         if self.reuse_model == "True":
             logging.warning("Reuse the model, no need to convert the model.")
         else:
             try:
-                self.hardware_instance.convert_model(backend=self.backend, model=self.model, weight=self.weight,
-                                                     save_dir=self.share_dir, input_shape=self.input_shape,
-                                                     out_nodes=self.out_nodes, precision=self.precision)
+                self.convert_model()
             except Exception:
                 self.result["status"] = "Model convert failed."
                 self.result["error_message"] = traceback.format_exc()
@@ -85,13 +100,11 @@ class Evaluate(Resource):
                 traceback.print_exc()
                 return self.result
         try:
-            latency_sum = 0
-            for repeat in range(min(self.repeat_times, 10)):
-                latency, output = self.hardware_instance.inference(converted_model=self.share_dir,
-                                                                   input_data=self.input_data)
-                latency_sum += float(latency)
-            self.result["latency"] = latency_sum / self.repeat_times
-            self.result["out_data"] = output
+            with device_lock:
+                if self.input_data.endswith(".npz"):
+                    self.result["out_file"] = self.inference_bundle()
+                else:
+                    self.result["latency"], self.result["out_data"] = self.inference(self.input_data)
         except Exception:
             self.result["status"] = "Inference failed."
             self.result["error_message"] = traceback.format_exc()
@@ -99,6 +112,59 @@ class Evaluate(Resource):
             traceback.print_exc()
         return self.result
 
+    def inference(self, input_data):
+        """Run the inferences of an input file, and return the average latency and the output."""
+        latency_sum = 0
+        for repeat in range(min(self.repeat_times, 10)):
+            latency, output = self.hardware_instance.inference(converted_model=self.share_dir,
+                                                               input_data=input_data, input_shape=self.input_shape)
+            latency_sum += float(latency)
+        return latency_sum / self.repeat_times, output
+
+    def inference_bundle(self):
+        """Run the inferences of the inputs in a bundle back to back, and save the latencies and outputs.
+
+        The bundle is a npz file of the inputs named `input_0`, `input_1`, ..., and the result is a npz
+        file of the array `latency` and the outputs named `output_0`, `output_1`, ....
+        """
+        latencies = []
+        outputs = {}
+        with np.load(self.input_data) as bundle:
+            for index in range(len(bundle.files)):
+                input_data = os.path.join(self.upload_file_path, "bundle_{}".format(index), "input.bin")
+                os.makedirs(os.path.dirname(input_data))
+                bundle["input_{}".format(index)].tofile(input_data)
+                latency, output = self.inference(input_data)
+                latencies.append(latency)
+                outputs["output_{}".format(index)] = np.array(output, dtype=np.float32)
+        out_file = os.path.join(self.upload_file_path, "output.npz")
+        np.savez(out_file, latency=np.array(latencies), **outputs)
+        return out_file
+
+    @classmethod
+    def response(cls, result):
+        """Make the response of a result, the result of a bundle is sent as a npz file."""
+        if result.get("status") == "sucess" and "out_file" in result:
+            return send_file(result["out_file"], mimetype="application/octet-stream")
+        return result
+
+    def convert_model(self):
+        """Convert the model, a model converted before with the same files and parameters is reused."""
+        def _convert(save_dir):
+            self.hardware_instance.convert_model(backend=self.backend, model=self.model, weight=self.weight,
+                                                 save_dir=save_dir, input_shape=self.input_shape,
+                                                 out_nodes=self.out_nodes, precision=self.precision)
+
+        if self.model_cache is None:
+            return _convert(self.share_dir)
+        key = ModelCache.make_key(self.model, self.weight, backend=self.backend, hardware=self.hardware,
+                                  input_shape=self.input_shape, out_nodes=self.out_nodes,
+                                  precision=self.precision, optional_params=sorted(self.optional_params.items()))
+        hit = self.model_cache.get_or_convert(key, self.share_dir, _convert)
+        if hit:
+            logging.warning("The converted model is found in the cache, no need to convert the model.")
+        self.result["cache"] = {"hit": hit, "hit_rate": self.model_cache.hit_rate}
+
     def parse_paras(self):
         """Parse the parameters in the request from the client."""
         self.backend = request.form["backend"]
@@ -115,7 +181,9 @@ class Evaluate(Resource):
         self.now_time = datetime.datetime.now().strftime('%Y%m%d%H%M%S%f')
         self.result["timestamp"] = self.now_time
         logging.warning("The timestamp is {}.".format(self.now_time))
-        self.upload_file_path = os.path.join(self.current_path, "out", self.now_time)
+        # requests are served concurrently, the suffix keeps the upload folders apart
+        self.upload_file_path = os.path.join(self.current_path, "out", "{}_{}".format(
+            self.now_time, uuid.uuid4().hex[:8]))
         self.share_dir = os.path.join(self.current_path, "out", self.job_id)
         os.makedirs(self.upload_file_path)
 
@@ -138,6 +206,26 @@ class Evaluate(Resource):
         logging.warning("upload file sucess!")
 
 
+class EvaluateJob(Evaluate):
+    """Asynchronous Evaluate Service, submit a job and poll its result."""
+
+    def post(self):
+        """Submit a job, the response contains the task id to poll."""
+        if not self._prepare():
+            return self.result
+        job = self.job_pool.submit(self.hardware, self.evaluate)
+        return {"task_id": job.task_id, "status": job.status, "timestamp": self.now_time}
+
+    def get(self, task_id):
+        """Get the status of a job, and its result if it is finished."""
+        job = self.job_pool.get(task_id)
+        if job is None:
+            return {"task_id": task_id, "status": "Job not found."}, 404
+        if job.status == "finished" and "out_file" in job.result:
+            return self.response(job.result)
+        return job.to_dict()
+
+
 def _clean_data_path(clean_interval, work_path):
     while True:
         _clean_time = time.time() - clean_interval
@@ -167,6 +255,17 @@ def _parse_args():
                         help="the user to acess ATLAS200200 DK")
     parser.add_argument("-atlas_host_ip", "--atlas_host_ip", type=str, required=False, default=None,
                         help="the ip of ATLAS200200 DK")
+    parser.add_argument("-workers", "--workers", type=int, required=False, default=4,
+                        help="the number of worker threads of each hardware to convert models and run inferences")
+    parser.add_argument("-devices", "--devices", type=int, required=False, default=1,
+                        help="the number of devices of each hardware which can run inferences at the same time")
+    parser.add_argument("-cpu_onnx_threads", "--cpu_onnx_threads", type=int, required=False, default=0,
+                        help="the intra op threads of the cpu_onnx hardware, 0 to use the default of onnxruntime")
+    parser.add_argument("-cpu_onnx_trusted", "--cpu_onnx_trusted", action="store_true",
+                        help="let the cpu_onnx hardware unpickle the whole pytorch models uploaded by the clients, "
+                             "which runs their code, only for trusted clients")
+    parser.add_argument("-cache_size", "--cache_size", type=float, required=False, default=10,
+                        help="the max size in GB of the converted models cache, 0 to disable the cache")
     args = parser.parse_args()
     return args
 
@@ -180,10 +279,16 @@ def run():
     work_path = args.work_path
     optional_params = {"davinci_environment_type": args.davinci_environment_type,
                        "ddk_user_name": args.ddk_user_name,
-                       "atlas_host_ip": args.atlas_host_ip
+                       "atlas_host_ip": args.atlas_host_ip,
+                       "cpu_onnx_threads": args.cpu_onnx_threads,
+                       "cpu_onnx_trusted": args.cpu_onnx_trusted
                        }
     p = multiprocessing.Process(target=_clean_data_path, args=(clean_interval, work_path), daemon=True)
     p.start()
-    Evaluate._add_params(work_path, optional_params)
+    model_cache = None
+    if args.cache_size > 0:
+        model_cache = ModelCache(os.path.join(work_path, "cache"), args.cache_size)
+    Evaluate._add_params(work_path, optional_params, JobPool(args.workers, args.devices), model_cache)
     api.add_resource(Evaluate, '/')
-    app.run(host=ip_address, port=listen_port, threaded=False)
+    api.add_resource(EvaluateJob, '/job', '/job/<string:task_id>')
+    app.run(host=ip_address, port=listen_port, threaded=True)
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020. Huawei Technologies Co., Ltd. All rights reserved.
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# MIT License for more details.
+
+"""The content-addressed cache of converted models."""
+import hashlib
+import logging
+import os
+import shutil
+import threading
+
+
+class ModelCache(object):
+    """Cache the converted models, keyed by the hash of the model files and the conversion parameters.
+
+    :param cache_path: the folder of the cache
+    :type cache_path: str
+    :param max_size: the max size of the cache in GB, the least recently used models are removed
+    :type max_size: float
+    """
+
+    def __init__(self, cache_path, max_size=10):
+        self.cache_path = cache_path
+        self.max_size = int(max_size * (1 << 30))
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        os.makedirs(cache_path, exist_ok=True)
+
+    @classmethod
+    def make_key(cls, model, weight, **params):
+        """Make the key of a conversion.
+
+        :param model: the model file
+        :param weight: the weight file, may be empty
+        :param params: the parameters of conversion, such as backend, hardware and input_shape
+        :return: the key
+        :rtype: str
+        """
+        sha = hashlib.sha256()
+        for _file in [model, weight]:
+            if _file and os.path.isfile(_file):
+                with open(_file, "rb") as f:
+                    for block in iter(lambda: f.read(1 << 20), b""):
+                        sha.update(block)
+            sha.update(b"\0")
+        for name in sorted(params):
+            sha.update("{}={};".format(name, params[name]).encode())
+        return sha.hexdigest()
+
+    def get_or_convert(self, key, save_dir, convert_fn):
+        """Copy the cached model to `save_dir`, or convert it by `convert_fn(save_dir)` and cache it.
+
+        Each job gets its own copy, so the inferences may write into `save_dir` without changing the
+        cache entry. Models are only cached if the conversion writes files into `save_dir`, the hardwares
+        which keep the converted models elsewhere, such as on a mobile phone, are converted every time.
+
+        :param key: the key made by `make_key`
+        :type key: str
+        :param save_dir: the folder of the converted model used by the inferences
+        :type save_dir: str
+        :param convert_fn: the function to convert the model into a folder
+        :type convert_fn: function
+        :return: whether the model is found in the cache
+        :rtype: bool
+        """
+        cached_path = os.path.join(self.cache_path, key)
+        with self._key_lock(key):
+            if os.path.isdir(cached_path):
+                os.utime(cached_path)
+                self._remove(save_dir)
+                shutil.copytree(cached_path, save_dir)
+                self._count(True)
+                return True
+            self._remove(save_dir)
+            convert_fn(save_dir)
+            self._count(False)
+            if os.path.isdir(save_dir) and os.listdir(save_dir):
+                tmp_path = "{}.tmp".format(cached_path)
+                shutil.rmtree(tmp_path, ignore_errors=True)
+                shutil.copytree(save_dir, tmp_path)
+                os.rename(tmp_path, cached_path)
+        self._evict()
+        return False
+
+    @classmethod
+    def _remove(cls, path):
+        if os.path.islink(path):
+            os.unlink(path)
+        elif os.path.isdir(path):
+            shutil.rmtree(path)
+
+    @property
+    def hit_rate(self):
+        """Get the hit rate of the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _key_lock(self, key):
+        with self._lock:
+            if key not in self._key_locks:
+                self._key_locks[key] = threading.Lock()
+            return self._key_locks[key]
+
+    def _evict(self):
+        entries = []
+        for key in os.listdir(self.cache_path):
+            path = os.path.join(self.cache_path, key)
+            if key.endswith(".tmp") or not os.path.isdir(path):
+                continue
+            size = sum(os.path.getsize(os.path.join(root, name)) for root, _, files in os.walk(path) for name in files)
+            entries.append((os.path.getmtime(path), path, size))
+        total = sum(entry[2] for entry in entries)
+        for _, path, size in sorted(entries):
+            if total <= self.max_size:
+                break
+            # skip the entries being copied or converted
+            key_lock = self._key_lock(os.path.basename(path))
+            if not key_lock.acquire(blocking=False):
+                continue
+            try:
+                logging.warning("remove converted model from cache: {}".format(path))
+                shutil.rmtree(path, ignore_errors=True)
+            finally:
+                key_lock.release()
+            total -= size
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020. Huawei Technologies Co., Ltd. All rights reserved.
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# MIT License for more details.
+
+"""Load test of the evaluate service with concurrent clients."""
+import argparse
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+import requests
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description="Load test of the evaluate service")
+    parser.add_argument("-s", "--host", type=str, required=True, help="the url of the service, eg. http://ip:port")
+    parser.add_argument("-hw", "--hardware", type=str, required=True, help="the hardware to evaluate on")
+    parser.add_argument("-b", "--backend", type=str, required=True, help="the backend of the model file")
+    parser.add_argument("-m", "--model_file", type=str, required=True, help="the model file to upload")
+    parser.add_argument("-d", "--data_file", type=str, required=True, help="the input data file to upload")
+    parser.add_argument("-c", "--clients", type=int, default=8, help="the number of concurrent clients")
+    parser.add_argument("-n", "--requests", type=int, default=4, help="the number of requests of each client")
+    parser.add_argument("-a", "--async_mode", action="store_true", help="submit jobs and poll their results")
+    parser.add_argument("-r", "--repeat_times", type=int, default=1, help="the repeat times of inference")
+    return parser.parse_args()
+
+
+def _evaluate(args, session):
+    data = {"backend": args.backend, "hardware": args.hardware, "reuse_model": "False",
+            "job_id": uuid.uuid4().hex, "repeat_times": args.repeat_times}
+    with open(args.model_file, "rb") as model_file, open(args.data_file, "rb") as data_file:
+        files = {"model_file": model_file, "data_file": data_file}
+        if not args.async_mode:
+            return session.post(args.host, files=files, data=data, proxies={"http": None}).json()
+        task = session.post(args.host + "/job", files=files, data=data, proxies={"http": None}).json()
+    while True:
+        job = session.get("{}/job/{}".format(args.host, task["task_id"]), proxies={"http": None}).json()
+        if job["status"] in ["finished", "failed"]:
+            return job["result"]
+        time.sleep(0.1)
+
+
+def _client(args):
+    durations = []
+    failures = 0
+    with requests.Session() as session:
+        for _ in range(args.requests):
+            start = time.time()
+            result = _evaluate(args, session)
+            durations.append(time.time() - start)
+            if result.get("status") != "sucess":
+                failures += 1
+    return durations, failures
+
+
+def _load_test():
+    args = _parse_args()
+    start = time.time()
+    with ThreadPoolExecutor(max_workers=args.clients) as executor:
+        results = list(executor.map(_client, [args] * args.clients))
+    total_time = time.time() - start
+    durations = sorted(duration for result in results for duration in result[0])
+    failures = sum(result[1] for result in results)
+    print("clients: {}, requests: {}, failures: {}".format(args.clients, len(durations), failures))
+    print("throughput: {:.2f} requests/s".format(len(durations) / total_time))
+    print("latency of requests, p50: {:.3f}s, p90: {:.3f}s, max: {:.3f}s".format(
+        durations[len(durations) // 2], durations[int(len(durations) * 0.9)], durations[-1]))
+
+
+if __name__ == "__main__":
+    _load_test()
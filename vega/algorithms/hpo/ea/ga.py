@@ -13,7 +13,7 @@
 import random
 import logging
 import numpy as np
-from vega.common.pareto_front import get_pareto_index
+from vega.common.pareto_front import ParetoArchive
 
 
 logger = logging.getLogger(__name__)
@@ -36,6 +36,8 @@ class GeneticAlgorithm(object):
         # }
         self.scores = {}
         self.sample_count = 0
+        self.archive = ParetoArchive()
+        self._config_ids = {}
 
     def add(self, config, score):
         """Add feature and label to train model.
@@ -44,15 +46,17 @@ class GeneticAlgorithm(object):
         :param label:
         :return:
         """
-        found = False
-        for value in self.scores.values():
-            if value["config"] == config:
-                value["score"] = score
-                found = True
-                break
-        if not found:
-            self.sample_count += 1
-            self.scores[self.sample_count] = {"config": config, "score": score}
+        id = self._config_ids.get(_config_key(config))
+        if id is None:
+            id = self._new_sample(config)
+        self.scores[id]["score"] = score
+        self.archive.add(id, score)
+
+    def _new_sample(self, config):
+        self.sample_count += 1
+        self.scores[self.sample_count] = {"config": config}
+        self._config_ids.setdefault(_config_key(config), self.sample_count)
+        return self.sample_count
 
     def propose(self, num=1):
         """Propose hyper-parameters to json.
@@ -61,16 +65,14 @@ class GeneticAlgorithm(object):
         :return: list
         """
         if self.sample_count < max(self.random_samples, 2):
-            self.sample_count += 1
             config = self.search_space.sample()
-            self.scores[self.sample_count] = {"config": config}
+            self._new_sample(config)
             logger.info(f"propose random sample: {config}")
             return [config]
 
         config = self.evolute()
         if config:
-            self.sample_count += 1
-            self.scores[self.sample_count] = {"config": config}
+            self._new_sample(config)
             logger.info(f"propose evaluated sample: {config}")
             return [config]
         else:
@@ -88,20 +90,16 @@ class GeneticAlgorithm(object):
 
     def selection(self):
         """Select pareto front individual."""
-        ids = [id for id, value in self.scores.items() if "score" in value]
-        if len(ids) == 0:
+        if len(self.archive) == 0:
             return None
-        rewards = [self.scores[id]["score"] for id in ids]
-        indexes = get_pareto_index(np.array(rewards)).tolist()
-        pareto = [id for i, id in enumerate(ids) if indexes[i]]
+        pareto = self.archive.sample(2)
+        # the ids of samples are 1 to sample_count
+        while len(pareto) < 2:
+            id = random.randint(1, self.sample_count)
+            if id not in pareto:
+                pareto.append(id)
 
-        if len(pareto) < 2:
-            others = [id for id in self.scores if id not in pareto]
-            pareto = pareto + random.sample(others, 2 - len(pareto))
-        else:
-            pareto = random.sample(pareto, 2)
-
-        return [value["config"] for id, value in self.scores.items() if id in pareto]
+        return [self.scores[id]["config"] for id in sorted(pareto)]
 
     def crossover(self, ind0, ind1, prob=0.6):
         """Cross over operation in EA algorithm.
@@ -133,3 +131,20 @@ class GeneticAlgorithm(object):
         ind1 = self.search_space.sample()
         ind = self.crossover(ind0, ind1, prob=prob)
         return ind
+
+
+def _config_key(config):
+    """Get a hashable key of a config, the equal configs have the same key."""
+    return repr(_normalize(config))
+
+
+def _normalize(value):
+    if isinstance(value, dict):
+        return sorted(((str(key), _normalize(item)) for key, item in value.items()), key=lambda x: x[0])
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [_normalize(item) for item in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return value
@@ -15,6 +15,7 @@ import logging
 import numpy as np
 from vega.core.search_algs import SearchAlgorithm
 from vega.common import ClassFactory, ClassType
+from vega.common.pareto_front import ParetoArchive
 from .evolution_conf import EvolutionConfig
 from vega.report import ReportServer
 
@@ -29,6 +30,8 @@ class EvolutionAlgorithm(SearchAlgorithm):
         """Init for EvolutionAlgorithm."""
         super(EvolutionAlgorithm, self).__init__(search_space, **kwargs)
         self._code_cache = OrderedDict()
+        self._code_sizes = None
+        self.archive = ParetoArchive()
         self.sample_count = 0
         self.num_individual = self.config.policy.num_individual
         self.num_generation = self.config.policy.num_generation
@@ -46,26 +49,17 @@ class EvolutionAlgorithm(SearchAlgorithm):
             sample = dict(worker_id=self.sample_count, encoded_desc=desc)
             self._code_cache[self.sample_count] = desc
             return sample
-        records = ReportServer().get_pareto_front_records(self.step_name, self.num_individual)
-        if not records:
+        if len(self.archive) > 0:
+            worker_ids = self.archive.sample(2)
+        else:
+            records = ReportServer().get_pareto_front_records(self.step_name, self.num_individual)
+            worker_ids = random.sample([record.worker_id for record in records], min(len(records), 2))
+        if not worker_ids:
             return None
-        codes = []
-        each_codes_cache = {}
-        # Merge codes
-        for record in records:
-            each_code = []
-            for key, item in self._code_cache.get(record.worker_id).items():
-                if isinstance(item, int):
-                    item = [item]
-                each_codes_cache[key] = len(item)
-                each_code.extend(item)
-            codes.append(each_code)
+        codes = [self._encode(self._code_cache.get(worker_id)) for worker_id in worker_ids]
         self.length = len(codes[0])
         logging.info("codes sum={}, code length={}".format(sum(codes[0]), self.length))
-        if len(codes) < 2:
-            encoding1, encoding2 = codes[0], codes[0]
-        else:
-            encoding1, encoding2 = random.sample(codes, 2)
+        encoding1, encoding2 = codes[0], codes[-1]
         choice = random.randint(0, 1)
         # mutate
         if choice == 0:
@@ -75,7 +69,7 @@ class EvolutionAlgorithm(SearchAlgorithm):
             encoding_new, _ = self.crossover(encoding1, encoding2)
         # split codes
         desc = {}
-        for _name, _size in each_codes_cache.items():
+        for _name, _size in self._code_sizes.items():
             desc[_name] = encoding_new[:_size]
             encoding_new = encoding_new[_size:]
         self.sample_count += 1
@@ -83,6 +77,27 @@ class EvolutionAlgorithm(SearchAlgorithm):
         self._code_cache[self.sample_count] = desc
         return sample
 
+    def update(self, record):
+        """Add the rewards of a finished worker to the archive.
+
+        :param record: record dict.
+        """
+        rewards = record.get("rewards")
+        rewards = rewards if isinstance(rewards, list) else [rewards]
+        if rewards and None not in rewards and record.get("worker_id") in self._code_cache:
+            self.archive.add(record.get("worker_id"), rewards)
+
+    def _encode(self, desc):
+        """Merge the codes of a desc, and keep the size of each code to split the new code."""
+        code, sizes = [], OrderedDict()
+        for key, item in desc.items():
+            if isinstance(item, int):
+                item = [item]
+            sizes[key] = len(item)
+            code.extend(item)
+        self._code_sizes = sizes
+        return code
+
     @property
     def is_completed(self):
         """Whether to complete algorithm."""
@@ -11,7 +11,8 @@
 """Defined PBTHpo class."""
 import os
 import copy
-import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from vega.algorithms.hpo.sha_base.pbt import PBT
 from vega.common import ClassFactory, ClassType
 from vega.common import FileOps
@@ -23,7 +24,12 @@ import logging
 
 @ClassFactory.register(ClassType.SEARCH_ALGORITHM)
 class PBTHpo(HPOBase):
-    """An Hpo of PBT."""
+    """An Hpo of PBT.
+
+    The checkpoint folders are linked on a background thread, so the update of a record and the exploit
+    step do not block the generator. The links run in order, and a config is proposed only after the
+    links to its checkpoint folder are done.
+    """
 
     config = PBTConfig()
 
@@ -32,9 +38,43 @@ class PBTHpo(HPOBase):
         self.search_space = search_space
         super(PBTHpo, self).__init__(search_space, **kwargs)
         self.hyperparameter_list = self.get_hyperparameters(self.config.policy.config_count)
+        self._link_executor = ThreadPoolExecutor(max_workers=1)
+        self._link_futures = {}
+        self._link_lock = threading.Lock()
         self.hpo = PBT(self.config.policy.config_count, self.config.policy.each_epochs,
                        self.config.policy.total_rungs, self.local_base_path,
-                       paras_list=self.hyperparameter_list)
+                       paras_list=self.hyperparameter_list, link_fn=self._link_folder)
+
+    def __getstate__(self):
+        """Wait for the pending links, and drop the thread objects to pickle the generator."""
+        with self._link_lock:
+            futures = list(self._link_futures.values())
+            self._link_futures = {}
+        for future in futures:
+            future.result()
+        state = self.__dict__.copy()
+        for key in ["_link_executor", "_link_futures", "_link_lock"]:
+            state.pop(key)
+        return state
+
+    def __setstate__(self, state):
+        """Restore the thread objects."""
+        self.__dict__.update(state)
+        self._link_executor = ThreadPoolExecutor(max_workers=1)
+        self._link_futures = {}
+        self._link_lock = threading.Lock()
+
+    def _link_folder(self, src, dst):
+        """Link the folder on the background thread, after the links submitted before."""
+        with self._link_lock:
+            self._link_futures[os.path.normpath(dst)] = self._link_executor.submit(FileOps.link_folder, src, dst)
+
+    def _wait_link(self, dst):
+        """Wait for the links to the folder, and raise the error of the last one."""
+        with self._link_lock:
+            future = self._link_futures.pop(os.path.normpath(dst), None)
+        if future is not None:
+            future.result()
 
     def get_hyperparameters(self, num):
         """Use the trained model to propose a set of params from SearchSpace.
@@ -68,6 +108,7 @@ class PBTHpo(HPOBase):
         rung_id = sample.get('rung_id')
 
         checkpoint_path = FileOps.join_path(self.local_base_path, 'cache', str(sample_id), 'checkpoint')
+        self._wait_link(checkpoint_path)
         FileOps.make_dir(checkpoint_path)
         if os.path.exists(checkpoint_path):
             re_hps['trainer.checkpoint_path'] = checkpoint_path
@@ -90,7 +131,4 @@ class PBTHpo(HPOBase):
         worker_result_path = self.get_local_worker_path(step_name, config_id)
         new_worker_result_path = FileOps.join_path(self.local_base_path, 'cache', config_id, 'checkpoint')
         FileOps.make_dir(worker_result_path)
-        FileOps.make_dir(new_worker_result_path)
-        if os.path.exists(new_worker_result_path):
-            shutil.rmtree(new_worker_result_path)
-        shutil.copytree(worker_result_path, new_worker_result_path)
+        self._link_folder(worker_result_path, new_worker_result_path)
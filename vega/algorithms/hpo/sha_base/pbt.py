@@ -27,7 +27,6 @@ https://arxiv.org/abs/1905.05393
              or perturb the original value.
 """
 import operator
-import shutil
 import numpy as np
 import pandas as pd
 from vega.common import FileOps
@@ -52,10 +51,14 @@ class PBT(object):
     :type each_epochs: int.
     :param total_rungs: number of rungs for PBA search.
     :type total_rungs: int.
+    :param link_fn: function to link the checkpoint folder of a better config to a worse one in the
+        exploit step, which takes the source and destination path, `FileOps.link_folder` by default.
+    :type link_fn: function.
     """
 
-    def __init__(self, config_count, each_epochs, total_rungs, local_base_path, paras_list):
+    def __init__(self, config_count, each_epochs, total_rungs, local_base_path, paras_list, link_fn=None):
         """Init PBA."""
+        self.link_fn = link_fn or FileOps.link_folder
         self.total_rungs = total_rungs
         self.each_epochs = each_epochs
         self.config_count = config_count
@@ -167,9 +170,7 @@ class PBT(object):
             FileOps.make_dir(better_worker_result_path)
             worse_worker_result_path = FileOps.join_path(self.local_base_path, 'cache',
                                                          str(worse_id), 'checkpoint')
-            FileOps.make_dir(worse_worker_result_path)
-            shutil.rmtree(worse_worker_result_path)
-            shutil.copytree(better_worker_result_path, worse_worker_result_path)
+            self.link_fn(better_worker_result_path, worse_worker_result_path)
             self.all_config_dict[worse_id] = self.all_config_dict[better_id]
             policy_unchange = self.all_config_dict[worse_id][next_rung_id]
             policy_changed = self.explore(policy_unchange)
@@ -9,6 +9,7 @@
 # MIT License for more details.
 
 """Torch utils."""
+import itertools
 import numpy as np
 import torch
 from modnas.utils import format_value, format_dict
@@ -79,19 +80,45 @@ def clear_bn_running_statistics(model):
             m.reset_running_stats()
 
 
-def recompute_bn_running_statistics(model, trainer, num_batch=100, clear=True):
-    """Recompute BatchNorm running statistics."""
+def get_bn_calibration_batches(trainer, num_batch=100):
+    """Return a fixed set of train inputs on the device for BatchNorm recalibration."""
+    batches = []
+    for trn_X in itertools.islice(_iter_train_inputs(trainer), num_batch):
+        batches.append(trn_X)
+    return batches
+
+
+def _iter_train_inputs(trainer):
+    while True:
+        try:
+            trn_X, _ = trainer.get_next_train_batch()
+        except StopIteration:
+            return
+        yield trn_X
+
+
+def recompute_bn_running_statistics(model, trainer, num_batch=100, clear=True, batches=None, cumulative=False):
+    """Recompute BatchNorm running statistics.
+
+    The inputs are taken from batches if given, otherwise from the train batches of the trainer.
+    If cumulative, the statistics are the average over all inputs instead of the moving average,
+    which needs fewer inputs and should be used with clear.
+    """
     if clear:
         clear_bn_running_statistics(model)
+    bn_modules = [m for m in model.modules() if isinstance(m, torch.nn.BatchNorm2d)]
+    momentums = [m.momentum for m in bn_modules]
+    if cumulative:
+        for m in bn_modules:
+            m.momentum = None
     is_training = model.training
     model.train()
+    inputs = _iter_train_inputs(trainer) if batches is None else batches
     with torch.no_grad():
-        for _ in range(num_batch):
-            try:
-                trn_X, _ = trainer.get_next_train_batch()
-            except StopIteration:
-                break
+        for trn_X in itertools.islice(inputs, num_batch):
             model(trn_X)
             del trn_X
+    for m, momentum in zip(bn_modules, momentums):
+        m.momentum = momentum
     if not is_training:
         model.eval()
@@ -34,6 +34,7 @@ class ProgressiveShrinkingEstim(EstimBase):
                  save_stage=False,
                  reset_stage_training=True,
                  subnet_valid_freq=25,
+                 eval_cache=False,
                  **kwargs):
         super().__init__(*args, **kwargs)
         self.stages = stages
@@ -49,6 +50,8 @@ class ProgressiveShrinkingEstim(EstimBase):
         self.num_bn_batch = num_bn_batch
         self.clear_subnet_bn = clear_subnet_bn
         self.subnet_valid_freq = subnet_valid_freq
+        if eval_cache:
+            self.enable_eval_cache()
 
     def set_stage(self, stage):
         """Set PS training stage from config."""
@@ -214,6 +217,7 @@ class ProgressiveShrinkingEstim(EstimBase):
         """Reorder channel dimensions in all spatial groups."""
         for g in ElasticSpatial.groups():
             g.set_spatial_rank()
+        self.update_weights_version()
 
     def valid_subnet(self, *args, configs=None, **kwargs):
         """Sample and validate subnets from current candidates."""
@@ -238,8 +242,15 @@ class ProgressiveShrinkingEstim(EstimBase):
                 configs[name] = conf
         results = dict()
         for name, conf in configs.items():
+            if self.eval_cache is not None:
+                score = self.eval_cache.get(conf, self.weights_version)
+                if score is not None:
+                    results[name] = score
+                    continue
             self.apply_subnet_config(conf)
             backend.recompute_bn_running_statistics(self.model, self.trainer, self.num_bn_batch, self.clear_subnet_bn)
             score = self.get_score(self.compute_metrics())
             results[name] = score
+            if self.eval_cache is not None:
+                self.eval_cache.put(conf, self.weights_version, score)
         return results
@@ -10,6 +10,8 @@
 
 """Event managing and triggering."""
 import inspect
+import itertools
+from bisect import insort
 from functools import wraps
 from . import singleton, make_decorator
 from modnas.utils.logging import get_logger
@@ -22,37 +24,43 @@ logger = get_logger(__name__)
 
 @singleton
 class EventManager():
-    """Event manager class."""
+    """Event manager class.
+
+    The handlers of an event are kept sorted by descending priority, and in binding order for the same
+    priority. Only the events with handlers are in `handlers`, so emitting other events returns at once.
+    """
 
     def __init__(self):
         self.handlers = {}
         self.event_queue = []
+        self._seq = itertools.count()
 
     def reset(self):
         """Reset event states."""
         self.handlers.clear()
         self.event_queue.clear()
 
+    def has_handlers(self, ev):
+        """Return True if any handler is bound on event."""
+        return ev in self.handlers
+
     def get_handlers(self, ev):
         """Return generator over handlers of event."""
         ev_handlers = self.handlers.get(ev, [])
-        for p, h in ev_handlers:
+        for _, _, h in ev_handlers:
             yield h
 
     def on(self, ev, handler, priority=0):
         """Bind handler on event with priority."""
-        logger.debug('on: %s %s %s' % (ev, handler, priority))
-        ev_handlers = self.handlers.get(ev, [])
-        ev_handlers.append((priority, handler))
-        ev_handlers.sort(key=lambda s: -s[0])
-        self.handlers[ev] = ev_handlers
+        logger.debug('on: %s %s %s', ev, handler, priority)
+        insort(self.handlers.setdefault(ev, []), (-priority, next(self._seq), handler))
 
     def emit(self, ev, *args, e_cb=None, e_delayed=False, e_merge_ret=False,
              e_chain_ret=True, e_fret=None, e_is_ret=False, **kwargs):
         """Trigger event with arguments."""
-        logger.debug('emit: %s a: %s kw: %s d: %s' % (ev, len(args), len(kwargs), e_delayed))
         if ev not in self.handlers:
             return
+        logger.debug('emit: %s a: %s kw: %s d: %s', ev, len(args), len(kwargs), e_delayed)
         self.event_queue.append((ev, args, kwargs, e_cb))
         if e_delayed:
             return
@@ -60,14 +68,14 @@ class EventManager():
 
     def off(self, ev, handler=None):
         """Un-bind handler on event."""
-        logger.debug('off: %s %s' % (ev, handler))
+        logger.debug('off: %s %s', ev, handler)
         ev_handlers = self.handlers.get(ev, None)
         if ev_handlers is None:
             return
         if handler is None:
             del self.handlers[ev]
             return
-        for i, (p, h) in enumerate(ev_handlers):
+        for i, (_, _, h) in enumerate(ev_handlers):
             if h == handler:
                 ev_handlers.pop(i)
                 break
@@ -83,7 +91,7 @@ class EventManager():
             ret = None
             for handler in self.get_handlers(ev):
                 hret = handler(*args, **kwargs)
-                logger.debug('handler: %s %s' % (handler, hret))
+                logger.debug('handler: %s %s', handler, hret)
                 if chain_ret and is_ret:
                     args = (fret if hret is None else hret, ) + args[1:]
                 ret = merge_config(ret, hret) if merge_ret and hret is not None else hret
@@ -108,16 +116,19 @@ def event_hooked(
     ev_before = None if before is False else '{}:{}'.format('before' if before is True else before, ev)
     ev_after = None if after is False else '{}:{}'.format('after' if after is True else after, ev)
 
+    handlers = EventManager().handlers
+
     @wraps(func)
     def wrapped(*args, **kwargs):
         ev_before = wrapped.ev_before
         ev_after = wrapped.ev_after
-        if ev_before:
+        # skip the events without handlers, the common case for most hooked methods
+        if ev_before in handlers:
             hret = EventManager().emit(ev_before, *args, **kwargs, **emit_args)
             if hret is not None:
                 args, kwargs = args if hret[0] is None else hret[0], kwargs if hret[1] is None else hret[1]
         fret = func(*args, **kwargs)
-        if ev_after:
+        if ev_after in handlers:
             if wrapped.pass_ret:
                 args = (fret,) + args
             hret = EventManager().emit(ev_after, *args, **kwargs, e_fret=fret, e_is_ret=True, **emit_args)
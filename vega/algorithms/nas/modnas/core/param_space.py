@@ -9,6 +9,8 @@
 # MIT License for more details.
 
 """Architecture Parameter Space."""
+import random
+import numpy as np
 from collections import OrderedDict
 from . import singleton
 from modnas.utils.logging import get_logger
@@ -88,6 +90,10 @@ class ParamSpace():
             self._categorical_length = prod
         return self._categorical_length
 
+    def categorical_dims(self, ):
+        """Return sizes of categorical parameters."""
+        return [len(p) for p in self.categorical_params()]
+
     def categorical_params(self, ):
         """Return an iterator over categorical parameters."""
         for p in self.params():
@@ -132,6 +138,52 @@ class ParamSpace():
             base *= p_dim
         return idx
 
+    def _categorical_index_dtype(self):
+        # space indices may exceed int64 in large spaces
+        return np.int64 if self.categorical_size() < 2 ** 62 else object
+
+    def get_categorical_array(self, params):
+        """Return a matrix of value indices of categorical parameters from sets of parameter values."""
+        cat_params = list(self.categorical_params())
+        return np.array([[p.get_index(pmap[p.name]) for p in cat_params] for pmap in params],
+                        dtype=np.int64).reshape(len(params), len(cat_params))
+
+    def categorical_index_to_array(self, indices):
+        """Return a matrix of value indices of categorical parameters from categorical space indices."""
+        indices = np.array(indices, dtype=self._categorical_index_dtype())
+        dims = self.categorical_dims()
+        arr = np.empty((len(indices), len(dims)), dtype=np.int64)
+        for col, dim in enumerate(dims):
+            arr[:, col] = indices % dim
+            indices //= dim
+        return arr
+
+    def get_random_categorical_array(self, size, excludes=None):
+        """Return a matrix of value indices of random categorical parameter sets, not in the excluded indices."""
+        dims = self.categorical_dims()
+        arr = np.empty((size, len(dims)), dtype=np.int64)
+        for col, dim in enumerate(dims):
+            arr[:, col] = np.random.randint(0, dim, size)
+        if not excludes:
+            return arr
+        excludes = set(excludes)
+        for i in np.flatnonzero(np.isin(self.categorical_array_to_index(arr), list(excludes))):
+            index = random.randint(0, self.categorical_size() - 1)
+            while index in excludes:
+                index = random.randint(0, self.categorical_size() - 1)
+            arr[i] = self.categorical_index_to_array([index])[0]
+        return arr
+
+    def categorical_array_to_index(self, arr):
+        """Return categorical space indices from a matrix of value indices of categorical parameters."""
+        dtype = self._categorical_index_dtype()
+        indices = np.zeros(len(arr), dtype=dtype)
+        base = 1
+        for col, dim in enumerate(self.categorical_dims()):
+            indices += arr[:, col].astype(dtype) * base
+            base *= dim
+        return indices
+
     def update_params(self, pmap):
         """Update parameter values from a dict."""
         for k, v in pmap.items():
@@ -18,6 +18,7 @@ from modnas.registry.export import build as build_exporter
 from modnas.core.event import event_hooked_subclass
 from modnas.utils.logging import get_logger
 from modnas.registry import streamline_spec
+from .eval_cache import EvalCache
 
 
 def build_criterions_all(crit_configs, device_ids=None):
@@ -76,6 +77,8 @@ class EstimBase():
         self._n_step_waiting = 0
         self._cur_trn_batch = None
         self._cur_val_batch = None
+        self.weights_version = 0
+        self.eval_cache = None
 
     def set_trainer(self, trainer):
         """Set current trainer."""
@@ -199,9 +202,22 @@ class EstimBase():
             score = 0 if len(res) == 0 else list(res.values())[0]
         return score
 
+    def update_weights_version(self):
+        """Mark the model weights as updated, which invalidates the cached evaluation results."""
+        self.weights_version += 1
+
+    def enable_eval_cache(self, max_size=0):
+        """Cache evaluation results by archdesc until the model weights are updated."""
+        self.eval_cache = EvalCache(max_size)
+
+    def get_eval_cache_stats(self):
+        """Return hit and miss counters of the evaluation cache."""
+        return {} if self.eval_cache is None else self.eval_cache.stats()
+
     def train_epoch(self, epoch, tot_epochs, model=None):
         """Train model for one epoch."""
         model = self.model if model is None else model
+        self.update_weights_version()
         ret = self.trainer.train_epoch(estim=self,
                                        model=model,
                                        tot_steps=self.get_num_train_batch(epoch),
@@ -212,6 +228,7 @@ class EstimBase():
     def train_step(self, epoch, tot_epochs, step, tot_steps, model=None):
         """Train model for one step."""
         model = self.model if model is None else model
+        self.update_weights_version()
         return self.trainer.train_step(estim=self,
                                        model=model,
                                        epoch=epoch,
@@ -345,3 +362,4 @@ class EstimBase():
         with open(chkpt_path, 'rb') as f:
             chkpt = pickle.load(f)
         self.load_state_dict(chkpt)
+        self.update_weights_version()
@@ -0,0 +1,242 @@
+# -*- coding:utf-8 -*-
+
+# Copyright (C) 2020. Huawei Technologies Co., Ltd. All rights reserved.
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# MIT License for more details.
+
+"""Pooled remote server and client with batched calls."""
+import queue
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.connection import Client, Listener
+from .base import RemoteBase, WorkerBase
+from modnas.registry.dist_remote import register as register_remote
+from modnas.registry.dist_worker import register as register_worker
+from modnas.utils.logging import get_logger
+
+
+logger = get_logger('estim')
+
+
+def _parse_address(address, port):
+    if isinstance(address, (list, tuple)):
+        return address[0], int(address[1])
+    host, _, addr_port = str(address).partition(':')
+    return host, int(addr_port or port)
+
+
+@register_remote
+class PooledRemote(RemoteBase):
+    """Pooled remote client class.
+
+    Keeps persistent connections to one or more workers, and runs the calls on a bounded executor with one
+    thread per connection. The calls waiting at the same time are sent in batches of at most `batch_size`
+    calls per round-trip, such as several `step` of different parameters.
+    """
+
+    def __init__(self, address='localhost', port=18862, conn_per_worker=2, batch_size=8, batch_wait=0.005,
+                 authkey=None):
+        super().__init__()
+        addresses = address if isinstance(address, list) else [address]
+        self.addresses = [_parse_address(addr, port) for addr in addresses]
+        self.authkey = None if authkey is None else str(authkey).encode()
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.conns = queue.Queue()
+        for addr in self.addresses:
+            for _ in range(conn_per_worker):
+                self.conns.put((addr, Client(addr, authkey=self.authkey)))
+        self.num_conns = len(self.addresses) * conn_per_worker
+        self.executor = ThreadPoolExecutor(max_workers=self.num_conns)
+        self.slots = threading.Semaphore(self.num_conns)
+        self.pending = queue.Queue()
+        self.cb_lock = threading.Lock()
+        self.th_dispatch = None
+        self.closed = False
+
+    def call(self, func, *args, on_done=None, on_failed=None, **kwargs):
+        """Call function on remote client with callbacks."""
+        if self.closed:
+            self._fail([(func, args, kwargs, on_done, on_failed)], 'Remote client is closed')
+            return
+        if self.th_dispatch is None:
+            self.th_dispatch = threading.Thread(target=self._dispatch, daemon=True)
+            self.th_dispatch.start()
+        self.pending.put((func, args, kwargs, on_done, on_failed))
+
+    def step_many(self, params_list):
+        """Return results of evaluating parameter sets on remote Estimators."""
+        results = [None] * len(params_list)
+        done = threading.Semaphore(0)
+
+        def callback(idx):
+            def wrapped(ret):
+                results[idx] = ret
+                done.release()
+            return wrapped
+
+        for idx, params in enumerate(params_list):
+            self.call('step', params, on_done=callback(idx), on_failed=callback(idx))
+        for _ in params_list:
+            done.acquire()
+        return results
+
+    def rpc(self, func, *args, **kwargs):
+        """Call function on remote client and return the result."""
+        ok, ret = self._rpc_batch([(func, args, kwargs, None, None)])[0]
+        if not ok:
+            raise RuntimeError(ret)
+        return ret
+
+    def _dispatch(self):
+        while True:
+            batch = [self.pending.get()]
+            if batch[0] is None:
+                return
+            while len(batch) < self.batch_size:
+                try:
+                    item = self.pending.get(timeout=self.batch_wait)
+                except queue.Empty:
+                    break
+                if item is None:
+                    self.pending.put(None)
+                    break
+                batch.append(item)
+            self.slots.acquire()
+            self.executor.submit(self._run_batch, batch)
+
+    def _rpc_batch(self, batch):
+        addr, conn = self.conns.get()
+        try:
+            conn.send(('call', [(func, args, kwargs) for func, args, kwargs, _, _ in batch]))
+            return conn.recv()
+        except (EOFError, OSError):
+            conn.close()
+            try:
+                conn = Client(addr, authkey=self.authkey)
+            except OSError:
+                logger.error('Remote {} is not reachable'.format(addr))
+            raise
+        finally:
+            self.conns.put((addr, conn))
+
+    def _fail(self, batch, msg):
+        for _, _, _, _, on_failed in batch:
+            logger.error('Remote call failed: {}'.format(msg))
+            if on_failed is not None:
+                with self.cb_lock:
+                    on_failed(msg)
+
+    def _run_batch(self, batch):
+        try:
+            try:
+                rets = self._rpc_batch(batch)
+            except Exception:
+                rets = [(False, traceback.format_exc())] * len(batch)
+            for (_, _, _, on_done, on_failed), (ok, ret) in zip(batch, rets):
+                callback = on_done if ok else on_failed
+                if not ok:
+                    logger.error('Remote call failed: {}'.format(ret))
+                if callback is not None:
+                    with self.cb_lock:
+                        callback(ret)
+        finally:
+            self.slots.release()
+
+    def close(self):
+        """Close the remote client."""
+        self.closed = True
+        self.pending.put(None)
+        # the dispatcher submits the batches queued before the sentinel, then exits
+        if self.th_dispatch is not None:
+            self.th_dispatch.join()
+        leftover = []
+        while not self.pending.empty():
+            item = self.pending.get_nowait()
+            if item is not None:
+                leftover.append(item)
+        self._fail(leftover, 'Remote client is closed')
+        self.executor.shutdown(wait=True)
+        conns = [self.conns.get() for _ in range(self.num_conns)]
+        closed = set()
+        for addr, conn in conns:
+            try:
+                if addr not in closed:
+                    conn.send(('close', None))
+                    closed.add(addr)
+            except (EOFError, OSError):
+                pass
+            conn.close()
+
+
+@register_worker
+class PooledWorker(WorkerBase):
+    """Pooled remote worker (server) class.
+
+    Serves the persistent connections of the clients, each on a thread. The calls of a batch are run one by
+    one on the Estimator, and their results are sent back together. The calls are unpickled, so an `authkey`
+    is required to listen on an address other than the loopback.
+    """
+
+    def __init__(self, address='localhost', port=18862, authkey=None):
+        if authkey is None and address not in ('localhost', '127.0.0.1', '::1'):
+            raise ValueError('Pooled worker requires an authkey to listen on {}'.format(address))
+        self.address = (address, port)
+        self.authkey = None if authkey is None else str(authkey).encode()
+        self.listener = None
+        self.estim_lock = threading.Lock()
+        self.closed = threading.Event()
+
+    def run(self, estim):
+        """Run worker."""
+        self.listener = Listener(self.address, authkey=self.authkey)
+        logger.info('Pooled worker: listening on {}'.format(self.address))
+        while True:
+            try:
+                conn = self.listener.accept()
+            except (EOFError, OSError):
+                break
+            if self.closed.is_set():
+                conn.close()
+                break
+            threading.Thread(target=self._serve, args=(conn, estim), daemon=True).start()
+        self.listener.close()
+
+    def _serve(self, conn, estim):
+        with conn:
+            while True:
+                try:
+                    op, calls = conn.recv()
+                except (EOFError, OSError):
+                    return
+                if op == 'close':
+                    self.close()
+                    return
+                conn.send(self._call_many(estim, calls))
+
+    def _call_many(self, estim, calls):
+        rets = []
+        with self.estim_lock:
+            for func, args, kwargs in calls:
+                try:
+                    rets.append((True, getattr(estim, func)(*args, **kwargs)))
+                except Exception:
+                    rets.append((False, traceback.format_exc()))
+        return rets
+
+    def close(self):
+        """Close worker."""
+        if self.closed.is_set():
+            return
+        self.closed.set()
+        # wake up the listener waiting for connections
+        host, port = self.address
+        try:
+            Client(('localhost' if host == '0.0.0.0' else host, port), authkey=self.authkey).close()
+        except OSError:
+            pass
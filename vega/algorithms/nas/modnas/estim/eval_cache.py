@@ -0,0 +1,74 @@
+# -*- coding:utf-8 -*-
+
+# Copyright (C) 2020. Huawei Technologies Co., Ltd. All rights reserved.
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# MIT License for more details.
+
+"""Evaluation cache of subnets of a weight-sharing supernet."""
+import copy
+import json
+import hashlib
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class EvalCache():
+    """Evaluation cache keyed by archdesc and supernet weights version.
+
+    The results of a subnet are valid until the supernet weights are updated, the entries of older
+    weights versions are dropped when a newer version is seen.
+    """
+
+    def __init__(self, max_size: int = 0) -> None:
+        self.max_size = max_size
+        self.version = None
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def key(arch_desc: Any) -> str:
+        """Return hash of an archdesc."""
+        desc = json.dumps(arch_desc, sort_keys=True, default=str)
+        return hashlib.sha1(desc.encode()).hexdigest()
+
+    def _check_version(self, version: int) -> None:
+        if version == self.version:
+            return
+        if self.entries:
+            self.invalidations += 1
+        self.entries.clear()
+        self.version = version
+
+    def get(self, arch_desc: Any, version: int) -> Optional[Any]:
+        """Return cached results of an archdesc with the weights version, or None if not cached."""
+        self._check_version(version)
+        ret = self.entries.get(self.key(arch_desc), None)
+        if ret is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return copy.deepcopy(ret)
+
+    def put(self, arch_desc: Any, version: int, results: Any) -> None:
+        """Cache results of an archdesc with the weights version."""
+        self._check_version(version)
+        self.entries[self.key(arch_desc)] = copy.deepcopy(results)
+        if self.max_size > 0 and len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache hit and miss counters."""
+        n_total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / n_total if n_total else 0.,
+            'invalidations': self.invalidations,
+            'size': len(self.entries),
+        }
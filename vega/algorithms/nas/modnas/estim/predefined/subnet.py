@@ -9,29 +9,55 @@
 # MIT License for more details.
 
 """Subnet-based Estimator."""
+import time
 import itertools
 import traceback
 from ..base import EstimBase
 from modnas import backend
 from modnas.core.param_space import ParamSpace
+from modnas.metrics.predefined.estim import EvalCacheMetrics
 from modnas.registry.estim import register
+from modnas.utils import AverageMeter, kendall_tau
 
 
 @register
 class SubNetEstim(EstimBase):
-    """Subnet-based Estimator class."""
+    """Subnet-based Estimator class.
 
-    def __init__(self, rebuild_subnet=False, num_bn_batch=100, clear_subnet_bn=True, *args, **kwargs):
+    If `eval_cache` is True, the results of a subnet evaluated on shared weights are reused until the
+    supernet weights are updated.
+    """
+
+    def __init__(self, rebuild_subnet=False, num_bn_batch=100, clear_subnet_bn=True, cache_bn_batch=False,
+                 cumulative_bn=False, num_bn_check=0, eval_cache=False, eval_cache_size=0, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.rebuild_subnet = rebuild_subnet
         self.num_bn_batch = num_bn_batch
         self.clear_subnet_bn = clear_subnet_bn
+        self.cache_bn_batch = cache_bn_batch
+        self.cumulative_bn = cumulative_bn
+        self.num_bn_check = num_bn_check
+        self.bn_batches = None
+        self.bn_time = AverageMeter()
+        self.bn_check_results = []
+        if eval_cache:
+            self.enable_eval_cache(eval_cache_size)
 
     def step(self, params):
         """Return evaluation results of a parameter set."""
         ParamSpace().update_params(params)
         arch_desc = self.get_arch_desc()
         config = self.config
+        cacheable = (self.eval_cache is not None and arch_desc is not None and not self.rebuild_subnet
+                     and config.subnet_epochs <= 0)
+        if cacheable:
+            ret = self.eval_cache.get(arch_desc, self.weights_version)
+            if ret is not None:
+                for name, mt in self.metrics.items():
+                    if isinstance(mt, EvalCacheMetrics):
+                        ret.update(self.compute_metrics(name=name))
+                self.logger.info('Evaluate (cached): {} -> {}'.format(arch_desc, ret))
+                return ret
         try:
             self.construct_subnet(arch_desc)
         except RuntimeError:
@@ -48,6 +74,10 @@ class SubNetEstim(EstimBase):
                 self.train_epoch(epoch=epoch, tot_epochs=tot_epochs)
         ret = self.compute_metrics()
         self.logger.info('Evaluate: {} -> {}'.format(arch_desc, ret))
+        if cacheable:
+            self.eval_cache.put(arch_desc, self.weights_version, ret)
+        if tot_epochs <= 0 and len(self.bn_check_results) < self.num_bn_check:
+            self.check_bn_recalibration(ret)
         return ret
 
     def construct_subnet(self, arch_desc):
@@ -55,7 +85,31 @@ class SubNetEstim(EstimBase):
         if self.rebuild_subnet:
             self.model = self.constructor(arch_desc=arch_desc)
         else:
-            backend.recompute_bn_running_statistics(self.model, self.trainer, self.num_bn_batch, self.clear_subnet_bn)
+            self.recalibrate_bn()
+
+    def recalibrate_bn(self):
+        """Recompute BatchNorm running statistics of the subnet, with the cached batches if enabled."""
+        start = time.perf_counter()
+        if self.cache_bn_batch and self.bn_batches is None:
+            self.bn_batches = backend.get_bn_calibration_batches(self.trainer, self.num_bn_batch)
+        backend.recompute_bn_running_statistics(self.model, self.trainer, self.num_bn_batch, self.clear_subnet_bn,
+                                                batches=self.bn_batches, cumulative=self.cumulative_bn)
+        self.bn_time.update(time.perf_counter() - start)
+
+    def check_bn_recalibration(self, ret):
+        """Compare the results with the ones of the default recalibration on fresh train batches."""
+        start = time.perf_counter()
+        backend.recompute_bn_running_statistics(self.model, self.trainer, self.num_bn_batch, self.clear_subnet_bn)
+        ref_time = time.perf_counter() - start
+        ref_ret = self.compute_metrics()
+        self.bn_check_results.append((self.get_score(ret), self.get_score(ref_ret), ref_time))
+        if len(self.bn_check_results) < self.num_bn_check:
+            return
+        scores, ref_scores, ref_times = zip(*self.bn_check_results)
+        ref_time = sum(ref_times) / len(ref_times)
+        self.logger.info('BN recalibration: kendall tau: {:.4f}, time per subnet: {:.3f}s, default: {:.3f}s, '
+                         'saved: {:.3f}s'.format(kendall_tau(scores, ref_scores), self.bn_time.avg, ref_time,
+                                                 ref_time - self.bn_time.avg))
 
     def run_epoch(self, optim, epoch, tot_epochs):
         """Run Estimator routine for one epoch."""
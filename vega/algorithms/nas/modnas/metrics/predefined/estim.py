@@ -36,3 +36,12 @@ class ValidateMetrics(MetricsBase):
                 self.logger.error('field \"{}\" not exists, using default'.format(field))
                 val_res = default_res
         return val_res
+
+
+@register
+class EvalCacheMetrics(MetricsBase):
+    """Estimator evaluation cache hit and miss counters metrics class."""
+
+    def __call__(self, model):
+        """Return metrics output."""
+        return self.estim.get_eval_cache_stats()
@@ -1 +1 @@
-from . import rasp, traversal
+from . import rasp, traversal, latency_lut
@@ -0,0 +1,74 @@
+# -*- coding:utf-8 -*-
+
+# Copyright (C) 2020. Huawei Technologies Co., Ltd. All rights reserved.
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# MIT License for more details.
+
+"""Latency metrics using per-operator look-up table (LUT)."""
+from ..base import MetricsBase
+from modnas.registry.metrics import register
+from modnas.arch_space.mixed_ops import MixedOp
+from typing import List, Optional, Any
+
+try:
+    from vega.metrics.latency_lut import LatencyLUT, collect_ops, prediction_accuracy
+except ImportError:
+    LatencyLUT = None
+
+
+@register
+class LatencyLUTMetrics(MetricsBase):
+    """Latency metrics predicted by the latency LUT of operators.
+
+    The operators are the candidates of the mixed operators weighted by their probabilities, and the
+    other leaf modules. Each operator is profiled once and saved in the LUT file. The predicted latency
+    of the first `num_check` evaluations are compared with the measured end-to-end latency.
+    """
+
+    def __init__(self,
+                 lut_path: str,
+                 input_shape: List[int],
+                 device: str = 'cpu',
+                 threads: Optional[int] = None,
+                 num_check: int = 0) -> None:
+        super().__init__()
+        if LatencyLUT is None:
+            raise ValueError('package vega is not found')
+        self.lut = LatencyLUT(lut_path, device=device, threads=threads)
+        self.input_shape = input_shape
+        self.num_check = num_check
+        self.ops = None
+        self.checks = []
+
+    def __call__(self, estim: Any) -> Any:
+        """Return metrics output."""
+        model = estim.model
+        if self.ops is None:
+            self.ops = collect_ops(model, self.input_shape, is_op=self._is_mixed_op, skip=self._is_mixed_op)
+        lat = 0.
+        for m, shape in self.ops:
+            if not isinstance(m, MixedOp):
+                lat = lat + self.lut.latency(m, shape)
+                continue
+            for p, op in zip(m.prob(), m.candidates()):
+                lat = lat + self.lut.latency(op, shape) * p
+        self.lut.save()
+        if len(self.checks) < self.num_check:
+            self._check(model, float(lat))
+        return lat
+
+    @staticmethod
+    def _is_mixed_op(module: Any) -> bool:
+        return isinstance(module, MixedOp)
+
+    def _check(self, model: Any, lat: float) -> None:
+        self.checks.append((lat, self.lut.measure(model, self.input_shape)))
+        self.logger.info('LatencyLUT: predicted: {:.3f}ms, measured: {:.3f}ms'.format(*self.checks[-1]))
+        if len(self.checks) == self.num_check:
+            acc = prediction_accuracy(*zip(*self.checks))
+            self.logger.info('LatencyLUT: mean absolute percentage error: {:.2%}, kendall tau: {:.4f}'.format(
+                acc['mape'], acc['kendall_tau']))
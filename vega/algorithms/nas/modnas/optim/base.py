@@ -10,12 +10,14 @@
 
 """Basic Optimizer classes."""
 import random
+import numpy as np
 from modnas import backend
 from modnas.core.param_space import ParamSpace
 from modnas.core.event import event_hooked_subclass
 from modnas.utils.logging import get_logger
 from collections import OrderedDict
 from modnas.estim.base import EstimBase
+from numpy import ndarray
 from typing import Any, Dict, List, Optional
 
 
@@ -131,6 +133,16 @@ class CategoricalSpaceOptim(OptimBase):
         """Return a random parameter set from categorical space."""
         return self.space.get_categorical_params(self.get_random_index())
 
+    def get_random_array(self, size: int) -> ndarray:
+        """Return a matrix of categorical value indices of random unvisited parameter sets."""
+        return self.space.get_random_categorical_array(size, self.visited)
+
+    def is_visited_array(self, arr: ndarray) -> ndarray:
+        """Return whether each row of a matrix of categorical value indices is already visited."""
+        if not self.visited:
+            return np.zeros(len(arr), dtype=bool)
+        return np.isin(self.space.categorical_array_to_index(arr), list(self.visited))
+
     def is_visited_params(self, params: OrderedDict) -> bool:
         """Return True if a parameter set is already visited."""
         return self.is_visited(self.space.get_categorical_index(params))
@@ -9,14 +9,12 @@
 # MIT License for more details.
 
 """Simulated annealing model optimum finder."""
-import heapq
-import random
 import numpy as np
 from .base import ModelOptim
 from modnas.registry.model_optim import register
 from modnas.utils.logging import get_logger
-from collections import OrderedDict
-from typing import Any, List, Set, Union
+from numpy import ndarray
+from typing import Any, List, Set, Tuple
 
 
 logger = get_logger('model_optim')
@@ -24,7 +22,11 @@ logger = get_logger('model_optim')
 
 @register
 class SimulatedAnnealingModelOptim(ModelOptim):
-    """Simulated annealing model optimum finder class."""
+    """Simulated annealing model optimum finder class.
+
+    The batch of parameters is kept as a matrix of categorical value indices, which is disturbed,
+    scored and accepted at once in each step.
+    """
 
     def __init__(self,
                  space,
@@ -45,61 +47,62 @@ class SimulatedAnnealingModelOptim(ModelOptim):
         self.keep_history = keep_history
         self.history = None
 
-    def disturb(self, params: OrderedDict) -> OrderedDict:
-        """Return randomly disturbed parameter."""
-        pname = list(params)[random.randint(0, len(params) - 1)]
-        p = self.space.get_param(pname)
-        nidx = idx = p.get_index(params[pname])
-        while nidx == idx:
-            nidx = random.randint(0, len(p) - 1)
+    def disturb(self, params: ndarray) -> ndarray:
+        """Return randomly disturbed parameters, one value changed in each row."""
+        dims = np.array(self.space.categorical_dims(), dtype=np.int64)
+        cols = np.flatnonzero(dims > 1)
         new_params = params.copy()
-        new_params[pname] = p.get_value(nidx)
+        if not len(cols):
+            return new_params
+        rows = np.arange(len(params))
+        cols = cols[np.random.randint(0, len(cols), len(params))]
+        new_params[rows, cols] = (params[rows, cols] + np.random.randint(1, dims[cols])) % dims[cols]
         return new_params
 
     def get_optimums(self, model: Any, size: int, excludes: Set[int]) -> List[int]:
         """Return optimums in score model."""
-        topq = []
+        exc = np.array(list(excludes))
+        topq = (np.empty(0), np.empty(0, dtype=np.int64))
         for _ in range(self.n_iter):
-            self.run_sa(model, size, excludes, topq)
-        return [item[-1] for item in topq[::1]]
-
-    def run_sa(self, model: Any, size: int, excludes: Set[int], topq: List[Any]) -> None:
-        """Run SA algorithm."""
+            topq = self.run_sa(model, size, exc, topq)
+        return [int(idx) for idx in topq[1]]
+
+    def _update_topq(self, topq: Tuple[ndarray, ndarray], size: int, excludes: ndarray, results: ndarray,
+                     params: ndarray) -> Tuple[ndarray, ndarray]:
+        indices = self.space.categorical_array_to_index(params)
+        if len(excludes):
+            keep = ~np.isin(indices, excludes)
+            results, indices = results[keep], indices[keep]
+        scores = np.concatenate([topq[0], results])
+        indices = np.concatenate([topq[1].astype(indices.dtype), indices])
+        order = np.argsort(-scores, kind='stable')
+        _, first = np.unique(indices[order], return_index=True)
+        best = order[np.sort(first)][:size]
+        return scores[best], indices[best]
+
+    def run_sa(self, model: Any, size: int, excludes: ndarray,
+               topq: Tuple[ndarray, ndarray]) -> Tuple[ndarray, ndarray]:
+        """Run SA algorithm, return the updated scores and indices of the top results."""
         if self.history is None:
-            params = [self.get_random_params(excludes) for _ in range(self.batch_size)]
+            params = self.space.get_random_categorical_array(self.batch_size, excludes.tolist())
         else:
             params = self.history
-        results = model.predict(params)
-
-        for r, p in zip(results, params):
-            pi = self.space.get_categorical_index(p)
-            if len(topq) < size:
-                heapq.heappush(topq, (r, pi))
-            elif r > topq[0][0]:
-                heapq.heapreplace(topq, (r, pi))
+        results = np.asarray(model.predict(params), dtype=np.float64)
+        topq = self._update_topq(topq, size, excludes, results, params)
 
         temp = self.temp_init
         temp_end = self.temp_end
         cool = self.cool
         cool_type = self.cool_type
         while (temp > temp_end):
-            next_params = [self.disturb(p) for p in params]
-            next_results = model.predict(next_params)
-
-            for r, p in zip(next_results, next_params):
-                pi = self.space.get_categorical_index(p)
-                if pi in excludes:
-                    continue
-                if len(topq) < size:
-                    heapq.heappush(topq, (r, pi))
-                elif r > topq[0][0]:
-                    heapq.heapreplace(topq, (r, pi))
-
-            ac_prob = np.minimum(np.exp((next_results - results) / (temp + 1e-7)), 1.)
-            for i in range(self.batch_size):
-                if random.random() < ac_prob[i]:
-                    params[i] = next_params[i]
-                    results[i] = next_results[i]
+            next_params = self.disturb(params)
+            next_results = np.asarray(model.predict(next_params), dtype=np.float64)
+            topq = self._update_topq(topq, size, excludes, next_results, next_params)
+
+            ac_prob = np.exp(np.minimum((next_results - results) / (temp + 1e-7), 0.))
+            accept = np.random.random(len(params)) < ac_prob
+            params[accept] = next_params[accept]
+            results[accept] = next_results[accept]
 
             if cool_type == 'exp':
                 temp *= cool
@@ -109,3 +112,4 @@ class SimulatedAnnealingModelOptim(ModelOptim):
 
         if self.keep_history:
             self.history = params
+        return topq
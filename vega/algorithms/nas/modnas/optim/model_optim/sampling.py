@@ -9,6 +9,7 @@
 # MIT License for more details.
 
 """Random sampling model optimum finder."""
+import numpy as np
 from .base import ModelOptim
 from modnas.registry.model_optim import register
 
@@ -23,7 +24,9 @@ class RandomSamplingModelOptim(ModelOptim):
 
     def get_optimums(self, model, size, excludes):
         """Return optimums in score model."""
-        smpl_pts = [self.get_random_index(excludes) for _ in range(self.n_iter)]
-        smpl_val = model.predict([self.space.get_categorical_params(i) for i in smpl_pts])
-        topk_idx = smpl_val.argsort()[::-1][:size]
-        return [smpl_pts[i] for i in topk_idx]
+        smpl_pts = self.space.get_random_categorical_array(self.n_iter, excludes)
+        smpl_idx = self.space.categorical_array_to_index(smpl_pts)
+        smpl_val = np.asarray(model.predict(smpl_pts), dtype=np.float64)
+        _, first = np.unique(smpl_idx, return_index=True)
+        topk_idx = first[np.argsort(-smpl_val[first], kind='stable')][:size]
+        return [int(smpl_idx[i]) for i in topk_idx]
@@ -10,17 +10,21 @@
 
 """Genetic search algorithms."""
 import numpy as np
-import random
 from ..base import CategoricalSpaceOptim
 from modnas.registry.optim import register
 from modnas.core.param_space import ParamSpace
 from modnas.estim.base import EstimBase
 from collections import OrderedDict
-from typing import Callable, Dict, List, Union, Optional
+from numpy import ndarray
+from typing import Callable, Dict, Union, Optional
 
 
 class GeneticOptim(CategoricalSpaceOptim):
-    """Optimizer with genetic operators on a population."""
+    """Optimizer with genetic operators on a population.
+
+    The population is a matrix of categorical value indices with one row per parameter set, which is
+    converted to parameter values only when proposed to the Estimator.
+    """
 
     def __init__(self, pop_size: int, max_it: int = 1000, space: Optional[ParamSpace] = None) -> None:
         super().__init__(space)
@@ -33,16 +37,24 @@ class GeneticOptim(CategoricalSpaceOptim):
     def _initialize(self):
         raise NotImplementedError
 
-    def _mating(self, pop: List[OrderedDict]) -> List[OrderedDict]:
+    def _mating(self, pop: ndarray) -> ndarray:
         cur_pop = pop
         for op in self.operators:
             cur_pop = op(cur_pop)
         return cur_pop
 
     def _next(self) -> OrderedDict:
-        params = self.population[len(self.metrics)]
-        self.set_visited_params(params)
-        return params
+        index = int(self.space.categorical_array_to_index(self.population[len(self.metrics)][None])[0])
+        self.set_visited(index)
+        return self.space.get_categorical_params(index)
+
+    def _unique_unvisited(self, pop: ndarray) -> ndarray:
+        """Return the unvisited rows of a population without duplicates, in their order."""
+        indices = self.space.categorical_array_to_index(pop)
+        _, first = np.unique(indices, return_index=True)
+        keep = np.zeros(len(pop), dtype=bool)
+        keep[first] = True
+        return pop[keep & ~self.is_visited_array(pop)]
 
     def add_operator(self, operator: Callable) -> None:
         """Add a genetic operator."""
@@ -91,63 +103,60 @@ class EvolutionOptim(GeneticOptim):
         self.n_crossover = pop_size if n_crossover is None else n_crossover
         self.mutation_prob = mutation_prob
 
-    def _initialize(self) -> List[OrderedDict]:
-        return [self.get_random_params() for _ in range(self.pop_size)]
+    def _initialize(self) -> ndarray:
+        return self.get_random_array(self.pop_size)
 
-    def _survival(self, pop):
+    def _survival(self, pop: ndarray) -> ndarray:
         n_survival = len(pop) - self.n_eliminate
         if n_survival >= len(pop):
             return pop
         metrics = np.array(self.metrics)
         idx = np.argpartition(metrics, -n_survival)[-n_survival:]
-        self.metrics = [metrics[i] for i in idx]
-        return [pop[i] for i in idx]
+        self.metrics = list(metrics[idx])
+        return pop[idx]
 
-    def _selection(self, pop: List[OrderedDict]) -> List[OrderedDict]:
+    def _selection(self, pop: ndarray) -> ndarray:
         n_select = self.n_select
         if n_select >= len(pop):
             return pop
         metrics = np.array(self.metrics)
         idx = np.argpartition(metrics, -n_select)[-n_select:]
-        self.metrics = [metrics[i] for i in idx]
-        return [pop[i] for i in idx]
+        self.metrics = list(metrics[idx])
+        return pop[idx]
 
-    def _crossover(self, pop: List[OrderedDict]) -> List[OrderedDict]:
-        next_pop = []
+    def _crossover(self, pop: ndarray) -> ndarray:
+        n_genes = pop.shape[1]
+        next_pop = np.empty((0, n_genes), dtype=pop.dtype)
         it = 0
         while len(next_pop) < self.n_crossover and it < self.max_it:
-            parents = [random.choice(pop) for _ in range(self.n_parents)]
-            for _ in range(self.n_offsprings):
-                n_gene = parents[0].copy()
-                for name in parents[0]:
-                    values = [p[name] for p in parents]
-                    n_gene[name] = random.choice(values)
-                if self.is_visited_params(n_gene):
-                    continue
-                next_pop.append(n_gene)
-            it += 1
-        while len(next_pop) < self.n_crossover:
-            next_pop.append(self.get_random_params())
+            n_mating = min(-(-(self.n_crossover - len(next_pop)) // self.n_offsprings), self.max_it - it)
+            parents = np.random.randint(0, len(pop), (n_mating, 1, self.n_parents))
+            # each gene of each offspring is inherited from a random parent
+            choice = np.random.randint(0, self.n_parents, (n_mating, self.n_offsprings, n_genes))
+            parent_rows = np.take_along_axis(np.broadcast_to(parents, (n_mating, self.n_offsprings, self.n_parents)),
+                                             choice, axis=2)
+            offsprings = pop[parent_rows, np.arange(n_genes)].reshape(-1, n_genes)
+            next_pop = self._unique_unvisited(np.concatenate([next_pop, offsprings]))
+            it += n_mating
+        next_pop = next_pop[:self.n_crossover]
+        if len(next_pop) < self.n_crossover:
+            next_pop = np.concatenate([next_pop, self.get_random_array(self.n_crossover - len(next_pop))])
         return next_pop
 
-    def _mutation(self, pop: List[OrderedDict]) -> List[OrderedDict]:
-        next_pop = []
-        for gene in pop:
-            it = 0
-            while it < self.max_it:
-                m_gene = gene.copy()
-                for name, value in gene.items():
-                    p = self.space.get_param(name)
-                    if random.random() < self.mutation_prob:
-                        nidx = idx = p.get_index(value)
-                        while nidx == idx:
-                            nidx = random.randint(0, len(p) - 1)
-                        m_gene[name] = p.get_value(nidx)
-                if not self.is_visited_params(m_gene):
-                    break
-            if it == self.max_it:
-                m_gene = self.get_random_params()
-            next_pop.append(m_gene)
+    def _mutation(self, pop: ndarray) -> ndarray:
+        dims = np.array(self.space.categorical_dims(), dtype=np.int64)
+        next_pop = pop.copy()
+        rows = np.arange(len(pop))
+        for _ in range(self.max_it):
+            if not len(rows):
+                break
+            # each gene changes to a different value with the mutation probability
+            mask = (np.random.random((len(rows), len(dims))) < self.mutation_prob) & (dims > 1)
+            shift = np.random.randint(1, np.maximum(dims, 2), (len(rows), len(dims)))
+            next_pop[rows] = np.where(mask, (pop[rows] + shift) % dims, pop[rows])
+            rows = rows[self.is_visited_array(next_pop[rows])]
+        if len(rows):
+            next_pop[rows] = self.get_random_array(len(rows))
         return next_pop
 
 
@@ -155,7 +164,7 @@ class EvolutionOptim(GeneticOptim):
 class RegularizedEvolutionOptim(EvolutionOptim):
     """Optimizer with Regularized Evolution algorithm."""
 
-    def _survival(self, pop: List[OrderedDict]) -> List[OrderedDict]:
+    def _survival(self, pop: ndarray) -> ndarray:
         s_idx = self.n_eliminate
         if s_idx <= 0:
             return pop
@@ -9,6 +9,8 @@
 # MIT License for more details.
 
 """Model-based Optimizer."""
+import time
+from concurrent.futures import ThreadPoolExecutor
 from ..base import CategoricalSpaceOptim
 from modnas.registry.score_model import build as build_score_model
 from modnas.registry.model_optim import build as build_model_optim
@@ -17,16 +19,21 @@ from modnas.registry import SPEC_TYPE
 from collections import OrderedDict
 from modnas.core.param_space import ParamSpace
 from modnas.estim.base import EstimBase
-from typing import Optional
+from typing import List, Optional, Set
 
 
 @register
 class ModelBasedOptim(CategoricalSpaceOptim):
-    """Model-based Optimizer class."""
+    """Model-based Optimizer class.
+
+    If `incremental` is True, only the new results are passed to the score model, which updates itself
+    incrementally. If `async_fit` is True, the score model is fit on a background thread while the
+    Optimizer keeps proposing from the previous model.
+    """
 
     def __init__(
         self, model_config: SPEC_TYPE, model_optim_config: SPEC_TYPE, greedy_e: float = 0.05, n_next_pts: int = 32,
-        space: Optional[ParamSpace] = None
+        incremental: bool = False, async_fit: bool = False, space: Optional[ParamSpace] = None
     ) -> None:
         super().__init__(space)
         self.model = build_score_model(model_config, space=self.space)
@@ -38,8 +45,13 @@ class ModelBasedOptim(CategoricalSpaceOptim):
         self.next_xs = []
         self.next_pt = 0
         self.train_ct = 0
+        self.incremental = incremental
+        self.n_fit_pts = 0
+        self.fit_future = None
+        self.executor = ThreadPoolExecutor(max_workers=1) if async_fit else None
 
     def _next(self) -> OrderedDict:
+        self._collect_fit()
         while self.next_pt < len(self.next_xs):
             index = self.next_xs[self.next_pt]
             if not self.is_visited(index):
@@ -56,9 +68,37 @@ class ModelBasedOptim(CategoricalSpaceOptim):
         for inp, res in zip(inputs, results):
             self.train_x.append(inp)
             self.train_y.append(res)
-        if len(self.train_x) < self.n_next_pts * (self.train_ct + 1):
+        self._collect_fit()
+        if len(self.train_x) < self.n_next_pts * (self.train_ct + 1) or self.fit_future is not None:
             return
-        self.model.fit(self.train_x, self.train_y)
-        self.next_xs = self.model_optim.get_optimums(self.model, self.n_next_pts, self.visited)
+        n_pts = len(self.train_x)
+        start = self.n_fit_pts if self.incremental else 0
+        args = (self.train_x[start:n_pts], self.train_y[start:n_pts], n_pts, set(self.visited))
+        self.n_fit_pts = n_pts
+        if self.executor is None:
+            self._set_next(self._fit(*args))
+        else:
+            self.fit_future = self.executor.submit(self._fit, *args)
+
+    def _fit(self, inputs: List[OrderedDict], results: List, n_pts: int, visited: Set[int]) -> List[int]:
+        fit_start = time.perf_counter()
+        if self.incremental:
+            self.model.update(inputs, results)
+        else:
+            self.model.fit(inputs, results)
+        optim_start = time.perf_counter()
+        next_xs = self.model_optim.get_optimums(self.model, self.n_next_pts, visited)
+        self.logger.debug('Model-based: {} results, fit time: {:.4f}s, optimum time: {:.4f}s'.format(
+            n_pts, optim_start - fit_start, time.perf_counter() - optim_start))
+        return next_xs
+
+    def _collect_fit(self) -> None:
+        if self.fit_future is None or not self.fit_future.done():
+            return
+        future, self.fit_future = self.fit_future, None
+        self._set_next(future.result())
+
+    def _set_next(self, next_xs: List[int]) -> None:
+        self.next_xs = next_xs
         self.next_pt = 0
         self.train_ct += 1
@@ -20,29 +20,49 @@ class ScoreModel():
 
     def __init__(self, space):
         self.space = space
+        self.train_feats = None
+        self.train_targets = None
 
     def fit(self, inputs, results):
         """Fit model with evaluation results."""
+        self.train_feats, self.train_targets = self.to_feature(inputs), self.to_target(results)
+        self._fit(self.train_feats, self.train_targets)
+
+    def update(self, inputs, results):
+        """Update model with new evaluation results, only the new results are converted to features."""
+        feats, targets = self.to_feature(inputs), self.to_target(results)
+        if self.train_feats is None:
+            self.train_feats, self.train_targets = feats, targets
+        else:
+            self.train_feats = np.concatenate([self.train_feats, feats])
+            self.train_targets = np.concatenate([self.train_targets, targets])
+        self._update(self.train_feats, self.train_targets, len(feats))
+
+    def _fit(self, feats, targets):
         raise NotImplementedError
 
+    def _update(self, feats, targets, n_new):
+        self._fit(feats, targets)
+
     def predict(self, inputs):
         """Return predicted evaluation score from model."""
         raise NotImplementedError
 
-    def _process_input(self, inp: OrderedDict) -> List[int]:
-        ret = []
-        for n, v in inp.items():
-            p = self.space.get_param(n)
-            one_hot = [0] * len(p)
-            one_hot[p.get_index(v)] = 1
-            ret.extend(one_hot)
-        return ret
-
-    def to_feature(self, inputs: Union[OrderedDict, List[OrderedDict]]) -> ndarray:
-        """Return feature variables from inputs."""
-        if not isinstance(inputs, list):
-            inputs = [inputs]
-        return np.array([self._process_input(inp) for inp in inputs])
+    def to_feature(self, inputs: Union[ndarray, OrderedDict, List[OrderedDict]]) -> ndarray:
+        """Return one-hot feature variables from inputs.
+
+        Inputs are sets of parameter values, or a matrix of categorical value indices in rows.
+        """
+        if isinstance(inputs, ndarray):
+            arr = inputs.reshape(1, -1) if inputs.ndim == 1 else inputs
+        else:
+            arr = self.space.get_categorical_array(inputs if isinstance(inputs, list) else [inputs])
+        dims = self.space.categorical_dims()
+        offsets = np.cumsum([0] + dims[:-1]).astype(np.int64)
+        feats = np.zeros((len(arr), sum(dims)), dtype=np.int64)
+        if len(dims):
+            feats[np.arange(len(arr))[:, None], arr + offsets] = 1
+        return feats
 
     def to_target(self, results: List[float]) -> ndarray:
         """Return target variables from results."""
@@ -19,30 +19,51 @@ from .base import ScoreModel
 from modnas.registry.score_model import register
 from collections import OrderedDict
 from numpy import ndarray
-from typing import List
+from typing import List, Union
 
 
 @register
 class SKLearnScoreModel(ScoreModel):
     """Scikit-learn score prediction model class."""
 
-    def __init__(self, space, model_cls, module, model_kwargs={}):
+    def __init__(self, space, model_cls, module, model_kwargs={}, warm_start_estimators=0, refit_interval=10):
         super().__init__(space)
         if sklearn is None:
             raise RuntimeError('scikit-learn is not installed')
         module = importlib.import_module(module)
         model_cls = getattr(module, model_cls)
         self.model = model_cls(**model_kwargs)
+        self.warm_start_estimators = warm_start_estimators
+        self.refit_interval = refit_interval
+        self.n_estimators = getattr(self.model, 'n_estimators', None)
+        self.n_updates = 0
+        self.fitted = False
 
-    def fit(self, inputs: List[OrderedDict], results: List[float]) -> None:
-        """Fit model with evaluation results."""
-        x_train = self.to_feature(inputs)
-        y_train = self.to_target(results)
-        index = np.random.permutation(len(x_train))
-        trn_x, trn_y = x_train[index], y_train[index]
-        self.model.fit(trn_x, trn_y)
+    def _fit(self, feats: ndarray, targets: ndarray) -> None:
+        if self.n_estimators is not None and hasattr(self.model, 'warm_start'):
+            self.model.set_params(warm_start=False, n_estimators=self.n_estimators)
+        self._fit_model(feats, targets)
+        self.n_updates = 0
 
-    def predict(self, inputs: List[OrderedDict]) -> ndarray:
+    def _update(self, feats: ndarray, targets: ndarray, n_new: int) -> None:
+        """Add `warm_start_estimators` estimators fit on all results to warm-startable ensembles.
+
+        Refit every `refit_interval` updates, or on every update if the model is not a warm-startable ensemble.
+        """
+        if (not self.fitted or self.warm_start_estimators <= 0 or self.n_estimators is None
+                or not hasattr(self.model, 'warm_start') or self.n_updates + 1 >= self.refit_interval):
+            self._fit(feats, targets)
+            return
+        self.model.set_params(warm_start=True, n_estimators=self.model.n_estimators + self.warm_start_estimators)
+        self._fit_model(feats, targets)
+        self.n_updates += 1
+
+    def _fit_model(self, feats: ndarray, targets: ndarray) -> None:
+        index = np.random.permutation(len(feats))
+        self.model.fit(feats[index], targets[index])
+        self.fitted = True
+
+    def predict(self, inputs: Union[ndarray, List[OrderedDict]]) -> ndarray:
         """Return predicted evaluation score from model."""
         feats = self.to_feature(inputs)
         return self.model.predict(feats)
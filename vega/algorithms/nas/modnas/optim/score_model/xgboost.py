@@ -18,7 +18,7 @@ from .base import ScoreModel
 from modnas.registry.score_model import register
 from collections import OrderedDict
 from numpy import ndarray
-from typing import List
+from typing import List, Union
 
 
 xgb_params_reg = {
@@ -48,28 +48,39 @@ xgb_params_rank = {
 class XGBoostScoreModel(ScoreModel):
     """XGBoost score prediction model class."""
 
-    def __init__(self, space, loss_type='reg', xgb_kwargs={}):
+    def __init__(self, space, loss_type='reg', xgb_kwargs={}, num_boost_round=400, update_rounds=0,
+                 refit_interval=10):
         super().__init__(space)
         if xgb is None:
             raise RuntimeError('xgboost is not installed')
         xgb_params = xgb_params_rank if loss_type == 'rank' else xgb_params_reg
         xgb_params.update(xgb_kwargs)
         self.xgb_params = xgb_params
+        self.num_boost_round = num_boost_round
+        self.update_rounds = update_rounds
+        self.refit_interval = refit_interval
+        self.n_updates = 0
         self.model = None
 
-    def fit(self, inputs: List[OrderedDict], results: List[float]) -> None:
-        """Fit model with evaluation results."""
-        x_train = self.to_feature(inputs)
-        y_train = self.to_target(results)
-        index = np.random.permutation(len(x_train))
-        dtrain = xgb.DMatrix(x_train[index], y_train[index])
-        self.model = xgb.train(
-            self.xgb_params,
-            dtrain,
-            num_boost_round=400,
-        )
+    def _fit(self, feats: ndarray, targets: ndarray) -> None:
+        self.model = xgb.train(self.xgb_params, self._to_dmatrix(feats, targets),
+                               num_boost_round=self.num_boost_round)
+        self.n_updates = 0
 
-    def predict(self, inputs: List[OrderedDict]) -> ndarray:
+    def _update(self, feats: ndarray, targets: ndarray, n_new: int) -> None:
+        """Continue boosting on all results for `update_rounds` rounds, refit every `refit_interval` updates."""
+        if self.model is None or self.update_rounds <= 0 or self.n_updates + 1 >= self.refit_interval:
+            self._fit(feats, targets)
+            return
+        self.model = xgb.train(self.xgb_params, self._to_dmatrix(feats, targets), num_boost_round=self.update_rounds,
+                               xgb_model=self.model)
+        self.n_updates += 1
+
+    def _to_dmatrix(self, feats: ndarray, targets: ndarray):
+        index = np.random.permutation(len(feats))
+        return xgb.DMatrix(feats[index], targets[index])
+
+    def predict(self, inputs: Union[ndarray, List[OrderedDict]]) -> ndarray:
         """Return predicted evaluation score from model."""
         feats = self.to_feature(inputs)
         dtest = xgb.DMatrix(feats)
@@ -211,6 +211,17 @@ class AverageMeter():
         self.avg = self.sum / self.count
 
 
+def kendall_tau(x: List[float], y: List[float]) -> float:
+    """Return Kendall rank correlation coefficient of two sequences."""
+    x, y = np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)
+    if len(x) < 2:
+        return 1.
+    dx = np.sign(x[:, None] - x[None, :])
+    dy = np.sign(y[:, None] - y[None, :])
+    pairs = len(x) * (len(x) - 1)
+    return float((dx * dy).sum() / pairs)
+
+
 def format_time(sec: float) -> str:
     """Return formatted time in seconds."""
     m, s = divmod(sec, 60)
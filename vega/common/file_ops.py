@@ -132,6 +132,39 @@ class FileOps(object):
         except Exception as ex:
             logger.error("failed to copy folder, src={}, dst={}, msg={}".format(src, dst, str(ex)))
 
+    @classmethod
+    def link_folder(cls, src, dst):
+        """Mirror a folder from source to destination with hard links.
+
+        The destination is replaced. Files are shared with the source instead of
+        being copied, so the cost does not depend on the file size. Writers must
+        replace files (write and rename) rather than rewrite them in place.
+        Fall back to copying when hard links are not supported, e.g. across devices.
+
+        :param str src: source path.
+        :param str dst: destination path.
+
+        """
+        if dst is None or dst == "":
+            return
+        if not os.path.isdir(src):
+            logger.error("failed to link folder, folder is not existed, folder={}.".format(src))
+            return
+        if os.path.exists(dst):
+            if os.path.samefile(src, dst):
+                return
+            cls.remove(dst)
+        for root, _, files in os.walk(src):
+            dst_root = os.path.join(dst, os.path.relpath(root, src))
+            os.makedirs(dst_root, exist_ok=True)
+            for name in files:
+                src_file = os.path.join(root, name)
+                dst_file = os.path.join(dst_root, name)
+                try:
+                    os.link(src_file, dst_file)
+                except OSError:
+                    shutil.copy2(src_file, dst_file)
+
     @classmethod
     def copy_file(cls, src, dst):
         """Copy a file from source to destination.
@@ -111,6 +111,7 @@ class General(ConfigSerializable):
     dft = False
     workers_num = 1
     quota = None
+    latency_lut_file = None  # predict the host_latency of quota by the latency look-up table of operators
     data_format = "channels_first"
     # parallel
     parallel_search = False
@@ -10,6 +10,8 @@
 
 """Pareto front."""
 
+import random
+from collections import OrderedDict
 import numpy as np
 
 
@@ -39,6 +41,72 @@ def get_pareto_index(scores):
     return pareto_indexes
 
 
+class ParetoArchive(object):
+    """Archive of scores which maintains the pareto front incrementally.
+
+    A new score is only compared with the scores on the front, so adding a score costs O(front)
+    instead of recomputing the front of all scores. The bigger score is better in each dimension.
+    """
+
+    def __init__(self):
+        self._scores = OrderedDict()
+        self._front = OrderedDict()
+
+    def __len__(self):
+        """Get the number of scores."""
+        return len(self._scores)
+
+    def __contains__(self, id):
+        """Check whether the id has a score."""
+        return id in self._scores
+
+    @property
+    def front(self):
+        """Get the ids on the pareto front, in the order of adding."""
+        return list(self._front)
+
+    def add(self, id, score):
+        """Add or update the score of an id.
+
+        :param id: id of the score
+        :param score: a number or a list of numbers
+        """
+        score = np.atleast_1d(np.asarray(score, dtype=np.float64)).ravel()
+        old_score = self._scores.get(id)
+        self._scores[id] = score
+        if old_score is None or np.all(score >= old_score):
+            # the points dominated by the old score are dominated by a better score too
+            self._front.pop(id, None)
+            self._insert(id, score)
+        elif not np.array_equal(score, old_score):
+            self._rebuild()
+
+    def sample(self, num):
+        """Sample at most num ids from the pareto front."""
+        front = self.front
+        return random.sample(front, min(num, len(front)))
+
+    def _insert(self, id, score):
+        if self._front:
+            ids = list(self._front)
+            scores = np.stack(list(self._front.values()))
+            if np.any(_dominates(scores, score)):
+                return
+            for index in np.flatnonzero(_dominates(score, scores)):
+                del self._front[ids[index]]
+        self._front[id] = score
+
+    def _rebuild(self):
+        self._front.clear()
+        for id, score in self._scores.items():
+            self._insert(id, score)
+
+
+def _dominates(scores, other):
+    """Check whether scores dominate other along the last axis."""
+    return np.all(scores >= other, axis=-1) & np.any(scores > other, axis=-1)
+
+
 def normal_selection(outs, max_nums, choice_column=0, seed=None):
     """Select one record."""
     if seed:
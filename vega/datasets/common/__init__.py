@@ -30,4 +30,5 @@ ClassFactory.lazy_register("vega.datasets.common", {
     "spatiotemporal": ["SpatiotemporalDataset"],
     "reds": ["REDS"],
     "nasbench": ["Nasbench"],
+    "packed": ["PackedDataset"],
 })
@@ -10,6 +10,7 @@
 
 """This is a class for Cifar100 dataset."""
 from .dataset import Dataset
+from .dataset_cache import load_cached
 from vega.common import ClassFactory, ClassType
 from vega.common import FileOps
 from vega.datasets.conf.cifar100 import Cifar100Config
@@ -43,22 +44,27 @@ class Cifar100(Dataset):
         else:
             files_list = ['test']
 
-        self.data = []
-        self.targets = []
+        source_files = [os.path.join(self.args.data_path, self.base_folder, name) for name in files_list]
+        arrays = load_cached(self, lambda: self._load_data(files_list), source_files, files_list=files_list)
+        self.data = arrays["data"]
+        self.targets = arrays["targets"].tolist()
 
-        # now load the picked numpy arrays
+    def _load_data(self, files_list):
+        """Decode the picked files into numpy arrays."""
+        data = []
+        targets = []
         for file_name in files_list:
             file_path = os.path.join(self.args.data_path, self.base_folder, file_name)
             with open(file_path, 'rb') as f:
                 entry = pickle.load(f, encoding='latin1')
-                self.data.append(entry['data'])
+                data.append(entry['data'])
                 if 'labels' in entry:
-                    self.targets.extend(entry['labels'])
+                    targets.extend(entry['labels'])
                 else:
-                    self.targets.extend(entry['fine_labels'])
-
-        self.data = np.vstack(self.data).reshape(-1, 3, 32, 32)
-        self.data = self.data.transpose((0, 2, 3, 1))  # convert to HWC
+                    targets.extend(entry['fine_labels'])
+        data = np.vstack(data).reshape(-1, 3, 32, 32)
+        data = data.transpose((0, 2, 3, 1))  # convert to HWC
+        return {"data": data, "targets": np.array(targets)}
 
     def __getitem__(self, index):
         """Get an item of the dataset according to the index.
@@ -13,11 +13,13 @@
 import random
 import os
 import PIL
+import numpy as np
 import vega
 from vega.common import ClassFactory, ClassType
 from vega.common import FileOps
 from vega.datasets.conf.cls_ds import ClassificationDatasetConfig
 from .dataset import Dataset
+from .dataset_cache import load_cached
 
 
 @ClassFactory.register(ClassType.DATASET)
@@ -84,6 +86,8 @@ class ClassificationDataset(Dataset):
         else:
             (label, _file) = self.file_indexes[index]
             image = self._load_image(_file)
+        if isinstance(image, np.ndarray):
+            image = PIL.Image.fromarray(image)
         image = self.transforms(image)
         n_label = self.classes.index(label)
         return image, n_label
@@ -91,9 +95,23 @@ class ClassificationDataset(Dataset):
     def _load_data(self):
         if not self.args.cached:
             return
+        if self.args.get("shared_cache"):
+            files = [_file for (_, _file) in self.file_indexes]
+            arrays = load_cached(self, lambda: self._decode_images(files), files)
+            images = [arrays["pixels"][start:end].reshape(shape) for start, end, shape in zip(
+                arrays["offsets"][:-1], arrays["offsets"][1:], arrays["shapes"])]
+            self.data = [(_cls, _file, image) for (_cls, _file), image in zip(self.file_indexes, images)]
+            return
         # TODO read file multi thread
         self.data = [(_cls, _file, self._load_image(_file)) for (_cls, _file) in self.file_indexes]
 
+    def _decode_images(self, files):
+        """Decode the images of variable sizes into one buffer with their offsets and shapes."""
+        images = [np.asarray(self._load_image(_file), dtype=np.uint8) for _file in files]
+        return {"pixels": np.concatenate([image.ravel() for image in images]),
+                "offsets": np.cumsum([0] + [image.size for image in images]),
+                "shapes": np.array([image.shape for image in images], dtype=np.int64)}
+
     def _load_image(self, image_file):
         img = PIL.Image.open(image_file)
         img = img.convert("RGB")
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020. Huawei Technologies Co., Ltd. All rights reserved.
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# MIT License for more details.
+
+"""Node level cache of decoded datasets shared by all trials."""
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import logging
+import fcntl
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# keys of the dataset config which do not change the decoded data
+_TRANSFORM_KEYS = ["transforms", "batch_size", "num_workers", "shuffle", "distributed", "pin_memory", "drop_last",
+                   "buffer_size", "imgs_per_gpu", "num_parallel_batches", "shared_cache", "shared_cache_path",
+                   "shared_cache_size"]
+
+
+class DatasetCache(object):
+    """Cache decoded datasets as numpy arrays in shared memory.
+
+    The first trial on a node decodes the dataset and writes its arrays into `cache_path`,
+    which is a tmpfs folder by default. The following trials memory-map the arrays read-only,
+    so the pages are shared by all processes of the node. The least recently used entries are
+    evicted when the total size exceeds `max_size`.
+
+    :param cache_path: root folder of the cache.
+    :type cache_path: str
+    :param max_size: max size of the cache, in GB.
+    :type max_size: float
+    """
+
+    _meta_file = "meta.json"
+
+    def __init__(self, cache_path="/dev/shm/vega_dataset_cache", max_size=16):
+        self.cache_path = cache_path
+        self.max_size = int(max_size * (1 << 30))
+        os.makedirs(self.cache_path, exist_ok=True)
+
+    @classmethod
+    def make_key(cls, dataset, source_files=None, **kwargs):
+        """Make the cache key of a dataset.
+
+        The mtime and size of the source files are part of the key, so a replaced dataset is decoded again.
+
+        :param dataset: dataset instance.
+        :param source_files: paths of the files which the data is decoded from.
+        :type source_files: list
+        :param kwargs: extra items which identify the decoded data, e.g. the files list.
+        :return: key of the dataset.
+        :rtype: str
+        """
+        args = {key: value for key, value in dict(dataset.args).items() if key not in _TRANSFORM_KEYS}
+        args.update(kwargs)
+        sources = []
+        for path in source_files or []:
+            stat = os.stat(path)
+            sources.append((os.path.abspath(path), stat.st_mtime_ns, stat.st_size))
+        desc = dict(type=dataset.__class__.__name__, data_path=os.path.abspath(str(dataset.args.data_path)),
+                    args=args, sources=sources)
+        desc = json.dumps(desc, sort_keys=True, default=str)
+        return "{}_{}".format(dataset.__class__.__name__, hashlib.md5(desc.encode()).hexdigest())
+
+    def load(self, key, load_fn):
+        """Attach a cached entry, decode it with `load_fn` first if it is not cached.
+
+        :param key: key of the entry, see `make_key`.
+        :param load_fn: function without argument which returns a dict of numpy arrays.
+        :return: dict of read-only memory-mapped arrays.
+        :rtype: dict
+        """
+        entry_path = os.path.join(self.cache_path, key)
+        with open(os.path.join(self.cache_path, ".{}.lock".format(key)), "w") as fp:
+            fcntl.flock(fp, fcntl.LOCK_EX)
+            try:
+                if not os.path.isfile(os.path.join(entry_path, self._meta_file)):
+                    logger.info("Dataset is not cached, decode and cache it, key={}.".format(key))
+                    self._save(entry_path, load_fn())
+                return self._attach(entry_path)
+            finally:
+                fcntl.flock(fp, fcntl.LOCK_UN)
+
+    def clear(self):
+        """Remove all entries of the cache."""
+        for key in os.listdir(self.cache_path):
+            self._remove(key)
+
+    def _save(self, entry_path, arrays):
+        arrays = {name: np.ascontiguousarray(value) for name, value in arrays.items()}
+        size = sum(value.nbytes for value in arrays.values())
+        self._evict(size)
+        tmp_path = "{}.{}.tmp".format(entry_path, os.getpid())
+        os.makedirs(tmp_path, exist_ok=True)
+        for name, value in arrays.items():
+            np.save(os.path.join(tmp_path, "{}.npy".format(name)), value)
+        with open(os.path.join(tmp_path, self._meta_file), "w") as f:
+            json.dump({"names": list(arrays.keys()), "size": size}, f)
+        os.replace(tmp_path, entry_path)
+
+    def _attach(self, entry_path):
+        meta_file = os.path.join(entry_path, self._meta_file)
+        os.utime(meta_file)
+        with open(meta_file) as f:
+            names = json.load(f)["names"]
+        return {name: np.load(os.path.join(entry_path, "{}.npy".format(name)), mmap_mode="r") for name in names}
+
+    def _entries(self):
+        entries = []
+        for key in os.listdir(self.cache_path):
+            meta_file = os.path.join(self.cache_path, key, self._meta_file)
+            if not os.path.isfile(meta_file):
+                continue
+            with open(meta_file) as f:
+                size = json.load(f)["size"]
+            entries.append((os.path.getmtime(meta_file), key, size))
+        return sorted(entries)
+
+    def _evict(self, size):
+        entries = self._entries()
+        total = sum(entry[2] for entry in entries) + size
+        for _, key, entry_size in entries:
+            if total <= self.max_size:
+                break
+            # skip the entries which are being saved or attached by other processes.
+            with open(os.path.join(self.cache_path, ".{}.lock".format(key)), "w") as fp:
+                try:
+                    fcntl.flock(fp, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    continue
+                try:
+                    logger.info("Evict dataset cache, key={}.".format(key))
+                    self._remove(key)
+                    total -= entry_size
+                finally:
+                    fcntl.flock(fp, fcntl.LOCK_UN)
+
+    def _remove(self, key):
+        # processes which attached the entry keep their mapping, the pages are freed when they exit.
+        path = os.path.join(self.cache_path, key)
+        if os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+        elif os.path.isfile(path):
+            os.remove(path)
+
+
+def load_cached(dataset, load_fn, source_files=None, **kwargs):
+    """Load the arrays of a dataset through the node level cache if it is enabled.
+
+    :param dataset: dataset instance, `args.shared_cache` enables the cache.
+    :param load_fn: function without argument which returns a dict of numpy arrays.
+    :param source_files: paths of the files which the data is decoded from.
+    :type source_files: list
+    :param kwargs: extra items which identify the decoded data.
+    :return: dict of arrays.
+    :rtype: dict
+    """
+    if not dataset.args.get("shared_cache"):
+        return load_fn()
+    cache = DatasetCache(dataset.args.get("shared_cache_path") or "/dev/shm/vega_dataset_cache",
+                         dataset.args.get("shared_cache_size") or 16)
+    return cache.load(DatasetCache.make_key(dataset, source_files, **kwargs), load_fn)
+
+
+def benchmark_setup(dataset_cls, trials=5, **kwargs):
+    """Measure the setup time of a dataset without and with the shared cache.
+
+    :param dataset_cls: dataset class.
+    :param trials: number of constructions of the dataset.
+    :param kwargs: arguments of the dataset.
+    :return: mean setup time in seconds, dict of `uncached`, `cold` and `warm`.
+    :rtype: dict
+    """
+    result = {}
+    start = time.perf_counter()
+    for _ in range(trials):
+        dataset_cls(shared_cache=False, **kwargs)
+    result["uncached"] = (time.perf_counter() - start) / trials
+    cache_path = kwargs.pop("shared_cache_path", "/dev/shm/vega_dataset_cache_benchmark")
+    DatasetCache(cache_path).clear()
+    start = time.perf_counter()
+    dataset_cls(shared_cache=True, shared_cache_path=cache_path, **kwargs)
+    result["cold"] = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(trials):
+        dataset_cls(shared_cache=True, shared_cache_path=cache_path, **kwargs)
+    result["warm"] = (time.perf_counter() - start) / trials
+    DatasetCache(cache_path).clear()
+    logger.info("Dataset setup time, {}".format(result))
+    return result
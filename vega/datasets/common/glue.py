@@ -9,6 +9,8 @@
 # MIT License for more details.
 
 """This is a class for Glue dataset."""
+import os
+import glob
 import logging
 import json
 import numpy as np
@@ -19,6 +21,7 @@ from pytorch_pretrained_bert import BertTokenizer
 from vega.common.class_factory import ClassType, ClassFactory
 from pathlib import Path
 from .utils.data_processor import processors, output_modes
+from .utils.feature_cache import load_features, map_in_processes
 from ..conf.glue import GlueConfig
 
 InputFeatures = namedtuple("InputFeatures", "input_ids input_mask segment_ids label_id seq_length is_next")
@@ -32,31 +35,40 @@ class GlueDataset(Dataset):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        tokenizer = BertTokenizer.from_pretrained(self.args.vocab_file, do_lower_case=self.args.do_lower_case)
         if self.args.pregenerated:
-            self.features = read_features_from_file(tokenizer, self.args.data_path)
+            data_files = [os.path.join(self.args.data_path, "epoch_0.json"),
+                          os.path.join(self.args.data_path, "epoch_0_metrics.json")]
         else:
-            processor = processors[self.args.task_name]()
-            train_examples = processor.get_examples(self.mode, self.args.data_path)
-            label_list = processor.get_labels()
-            output_mode = output_modes[self.args.task_name]
-            self.features = convert_examples_to_features(train_examples, label_list, self.args.max_seq_length,
-                                                         tokenizer, output_mode)
+            data_files = glob.glob(os.path.join(self.args.data_path, "*.tsv"))
+        self.features = load_features(self.args, data_files, self.mode, self._convert_features,
+                                      InputFeatures._fields)
+
+    def _convert_features(self):
+        """Tokenize the examples, it is only called if the features are not cached."""
+        tokenizer = BertTokenizer.from_pretrained(self.args.vocab_file, do_lower_case=self.args.do_lower_case)
+        if self.args.pregenerated:
+            return read_features_from_file(tokenizer, self.args.data_path, self.args.num_tokenize_workers)
+        processor = processors[self.args.task_name]()
+        train_examples = processor.get_examples(self.mode, self.args.data_path)
+        label_list = processor.get_labels()
+        output_mode = output_modes[self.args.task_name]
+        return map_in_processes(convert_examples_to_features, train_examples, self.args.num_tokenize_workers,
+                                label_list, self.args.max_seq_length, tokenizer, output_mode)
 
     def __len__(self):
         """Get the length of the dataset."""
-        return len(self.features)
+        return len(self.features["input_ids"])
 
     def __getitem__(self, item):
         """Get an item of the dataset according to the index."""
-        feature = self.features[item]
-        data = dict(input_ids=feature.input_ids, attention_mask=feature.input_mask, token_type_ids=feature.segment_ids)
-        labels = feature.label_id
+        data = dict(input_ids=self.features["input_ids"][item], attention_mask=self.features["input_mask"][item],
+                    token_type_ids=self.features["segment_ids"][item])
+        labels = self.features["label_id"][item]
         # next_sentence_label=int(self.is_nexts[item]))
         return data, labels
 
 
-def read_features_from_file(tokenizer, data_path):
+def read_features_from_file(tokenizer, data_path, num_workers=0):
     """Read features from file."""
     logging.info('data_path: {}'.format(data_path))
     data_path = Path(data_path)
@@ -68,17 +80,18 @@ def read_features_from_file(tokenizer, data_path):
     metrics = json.loads(metrics_file.read_text())
     num_samples = metrics['num_training_examples']
     seq_len = metrics['max_seq_len']
-    features = []
     with data_file.open() as f:
-        for i, line in enumerate(tqdm(f, total=num_samples, desc="Training examples")):
-            line = line.strip()
-            example = json.loads(line)
-            feature = convert_example_to_features(example, tokenizer, seq_len)
-            features.append(feature)
+        lines = [line.strip() for line in tqdm(f, total=num_samples, desc="Training examples")]
+    features = map_in_processes(_convert_lines_to_features, lines, num_workers, tokenizer, seq_len)
     logging.info("Loading complete!")
     return features
 
 
+def _convert_lines_to_features(lines, tokenizer, max_seq_length):
+    """Convert json lines of pregenerated examples."""
+    return [convert_example_to_features(json.loads(line), tokenizer, max_seq_length) for line in lines]
+
+
 def convert_examples_to_features(examples, label_list, max_seq_length, tokenizer, output_mode):
     """Load a data file into a list of `InputBatch`s."""
     label_map = {label: i for i, label in enumerate(label_list)}
@@ -125,16 +138,16 @@ def convert_examples_to_features(examples, label_list, max_seq_length, tokenizer
             raise KeyError(output_mode)
 
         if ex_index < 1:
-            logging.info("*** Example ***")
-            logging.info("guid: %s" % (example.guid))
-            logging.info("tokens: %s" % " ".join(
+            logging.debug("*** Example ***")
+            logging.debug("guid: %s" % (example.guid))
+            logging.debug("tokens: %s" % " ".join(
                 [str(x) for x in tokens]))
-            logging.info("input_ids: %s" % " ".join([str(x) for x in input_ids]))
-            logging.info("input_mask: %s" % " ".join([str(x) for x in input_mask]))
-            logging.info(
+            logging.debug("input_ids: %s" % " ".join([str(x) for x in input_ids]))
+            logging.debug("input_mask: %s" % " ".join([str(x) for x in input_mask]))
+            logging.debug(
                 "segment_ids: %s" % " ".join([str(x) for x in segment_ids]))
-            logging.info("label: {}".format(example.label))
-            logging.info("label_id: {}".format(label_id))
+            logging.debug("label: {}".format(example.label))
+            logging.debug("label_id: {}".format(label_id))
 
         features.append(
             InputFeatures(input_ids=np.array(input_ids),
@@ -167,12 +180,12 @@ def convert_example_to_features(example, tokenizer, max_seq_length):
     masked_lm_labels = example["masked_lm_labels"]
 
     if len(tokens) > max_seq_length:
-        logging.info('len(tokens): {}'.format(len(tokens)))
-        logging.info('tokens: {}'.format(tokens))
+        logging.debug('len(tokens): {}'.format(len(tokens)))
+        logging.debug('tokens: {}'.format(tokens))
         tokens = tokens[:max_seq_length]
 
     if len(tokens) != len(segment_ids):
-        logging.info('tokens: {}\nsegment_ids: {}'.format(tokens, segment_ids))
+        logging.debug('tokens: {}\nsegment_ids: {}'.format(tokens, segment_ids))
         segment_ids = [0] * len(tokens)
 
     assert len(tokens) == len(segment_ids) <= max_seq_length  # The preprocessed data should be already truncated
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020. Huawei Technologies Co., Ltd. All rights reserved.
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# MIT License for more details.
+
+"""This is a class for packed and pre-decoded dataset.
+
+A packed dataset folder has one sub folder for each mode (`train`, `val` and `test`).
+Each field of the items is stored as length-prefixed records:
+
+.. code-block:: text
+    meta.json       fields, dtypes and structure of the items
+    <field>.bin     raw bytes of all records, concatenated
+    <field>.idx     int64 array (count, 2 + ndim): offset, nbytes, shape of each record
+
+The records are read with `np.memmap`, so no image is decoded in `__getitem__`.
+"""
+
+import os
+import json
+import logging
+import numpy as np
+from PIL import Image
+from .dataset import Dataset
+from vega.common import ClassFactory, ClassType
+from vega.common import FileOps
+from vega.datasets.conf.packed import PackedDatasetConfig
+
+logger = logging.getLogger(__name__)
+
+
+class PackedWriter(object):
+    """Write items of a dataset into a packed folder.
+
+    :param path: folder of the packed mode, e.g. `/cache/datasets/imagenet_packed/train`.
+    :type path: str
+    """
+
+    def __init__(self, path):
+        self.path = path
+        FileOps.make_dir(path)
+        self.structure = None
+        self.fields = None
+        self.dtypes = {}
+        self._files = {}
+        self._indexes = {}
+
+    def add(self, item):
+        """Append an item, which is a tuple, list or dict of arrays, images or scalars."""
+        if isinstance(item, dict):
+            structure, fields = "dict", item
+        else:
+            structure, fields = "tuple", {str(i): value for i, value in enumerate(item)}
+        if self.structure is None:
+            self._open(structure, fields)
+        for name, value in fields.items():
+            value = np.ascontiguousarray(np.asarray(value), dtype=self.dtypes[name])
+            f = self._files[name]
+            self._indexes[name].append([f.tell(), value.nbytes] + list(value.shape))
+            f.write(value.tobytes())
+
+    def close(self):
+        """Write the indexes and meta data."""
+        if self.structure is None:
+            raise ValueError("Failed to pack an empty dataset, path={}".format(self.path))
+        for name, f in self._files.items():
+            f.close()
+            with open(os.path.join(self.path, "{}.idx".format(name)), "wb") as idx_file:
+                np.save(idx_file, np.array(self._indexes[name], dtype=np.int64))
+        meta = {"structure": self.structure, "fields": self.fields, "dtypes": self.dtypes,
+                "count": len(self._indexes[self.fields[0]])}
+        with open(os.path.join(self.path, "meta.json"), "w") as f:
+            json.dump(meta, f)
+
+    def _open(self, structure, fields):
+        self.structure = structure
+        self.fields = list(fields.keys())
+        for name, value in fields.items():
+            self.dtypes[name] = np.asarray(value).dtype.str
+            self._files[name] = open(os.path.join(self.path, "{}.bin".format(name)), "wb")
+            self._indexes[name] = []
+
+
+def pack_dataset(dataset, path, num_workers=0):
+    """Pack the decoded items of a dataset.
+
+    :param dataset: dataset created without transforms.
+    :param path: folder of the packed mode.
+    :param num_workers: number of processes to decode the items, only for pytorch backend.
+    :return: number of packed items.
+    :rtype: int
+    """
+    writer = PackedWriter(path)
+    if num_workers > 0:
+        from torch.utils.data import DataLoader
+        items = DataLoader(dataset, batch_size=None, num_workers=num_workers, collate_fn=_identity)
+    else:
+        items = (dataset[index] for index in range(len(dataset)))
+    count = 0
+    for item in items:
+        writer.add(item)
+        count += 1
+        if count % 10000 == 0:
+            logger.info("Packed {} of {} items.".format(count, len(dataset)))
+    writer.close()
+    return count
+
+
+def _identity(item):
+    return item
+
+
+@ClassFactory.register(ClassType.DATASET)
+class PackedDataset(Dataset):
+    """This is a class for packed dataset created by `vega.tools.pack_dataset`.
+
+    :param mode: `train`,`val` or `test`, defaults to `train`
+    :type mode: str, optional
+    """
+
+    config = PackedDatasetConfig()
+
+    def __init__(self, **kwargs):
+        """Construct the PackedDataset class."""
+        Dataset.__init__(self, **kwargs)
+        self.args.data_path = FileOps.download_dataset(self.args.data_path)
+        sub_path = os.path.join(self.args.data_path, self.mode)
+        if self.args.train_portion != 1.0 and self.mode == "val":
+            sub_path = os.path.join(self.args.data_path, "train")
+        with open(os.path.join(sub_path, "meta.json")) as f:
+            self.meta = json.load(f)
+        self.sub_path = sub_path
+        self.indexes = {name: np.load(os.path.join(sub_path, "{}.idx".format(name)))
+                        for name in self.meta["fields"]}
+        # memmap is opened lazily, so that it is not shared by the forked workers of data loader.
+        self._data = None
+
+    def __len__(self):
+        """Get the length of the dataset."""
+        return self.meta["count"]
+
+    def __getitem__(self, index):
+        """Get an item of the dataset according to the index."""
+        if self._data is None:
+            self._data = {name: np.memmap(os.path.join(self.sub_path, "{}.bin".format(name)), dtype=np.uint8,
+                                          mode="r") for name in self.meta["fields"]}
+        fields = [self._read(name, index) for name in self.meta["fields"]]
+        if self.meta["structure"] == "dict":
+            return self.transforms(dict(zip(self.meta["fields"], fields)))
+        if self.args.pil_image and fields[0].dtype == np.uint8 and fields[0].ndim in (2, 3):
+            fields[0] = Image.fromarray(fields[0])
+        if len(fields) == 2:
+            return self.transforms(fields[0]), fields[1]
+        return self.transforms(*fields)
+
+    def _read(self, name, index):
+        offset, nbytes, *shape = self.indexes[name][index]
+        record = self._data[name][offset:offset + nbytes]
+        value = np.frombuffer(record, dtype=self.meta["dtypes"][name]).reshape(shape)
+        return value.item() if not shape else value
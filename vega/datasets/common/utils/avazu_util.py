@@ -15,6 +15,7 @@ import logging
 import os
 import numpy as np
 import torch
+from ..dataset_cache import load_cached
 
 
 class BaseDataset():
@@ -174,8 +175,9 @@ class BaseDataset():
         :param bool shuffle_block: shuffle file blocks at every round, defaults to False
         """
         for f_in, f_out, block_finished in self._iterate_npy_files_(gen_type, num_of_files, shuffle_block):
-            x_all = np.load(f_in)
-            y_all = np.load(f_out)
+            arrays = load_cached(self, lambda: {"x": np.load(f_in), "y": np.load(f_out)}, [f_in, f_out],
+                                 block=os.path.basename(f_in))
+            x_all, y_all = arrays["x"], arrays["y"]
             data_gen = self.generator(
                 x_all, y_all, batch_size, shuffle=random_sample)
             finished = False
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020. Huawei Technologies Co., Ltd. All rights reserved.
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# MIT License for more details.
+
+"""On-disk cache of tokenized features for NLP datasets."""
+
+import os
+import json
+import hashlib
+import logging
+import multiprocessing
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def file_digest(files):
+    """Get the md5 digest of the contents of files."""
+    md5 = hashlib.md5()
+    for _file in sorted(files):
+        md5.update(os.path.basename(_file).encode())
+        with open(_file, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                md5.update(block)
+    return md5.hexdigest()
+
+
+def vocab_digest(vocab_file):
+    """Get the digest of a vocab, which is a file, a folder of pretrained model or a model name."""
+    if os.path.isdir(vocab_file):
+        vocab_file = os.path.join(vocab_file, "vocab.txt")
+    if os.path.isfile(vocab_file):
+        return file_digest([vocab_file])
+    return str(vocab_file)
+
+
+def map_in_processes(fn, items, num_workers, *args):
+    """Call `fn(chunk, *args)` on chunks of items in worker processes, and concatenate the results.
+
+    :param fn: module level function which returns a list.
+    :param items: list of items.
+    :param num_workers: number of processes, run in the current process if it is less than 2.
+    :return: list of results.
+    :rtype: list
+    """
+    if num_workers < 2 or len(items) < num_workers:
+        return fn(items, *args)
+    chunk_size = (len(items) + num_workers - 1) // num_workers
+    chunks = [(items[i:i + chunk_size],) + args for i in range(0, len(items), chunk_size)]
+    with multiprocessing.get_context("fork").Pool(num_workers) as pool:
+        results = pool.starmap(fn, chunks)
+    return [result for chunk in results for result in chunk]
+
+
+class FeatureCache(object):
+    """Cache tokenized features as numpy arrays.
+
+    :param cache_path: folder of the cache files.
+    :type cache_path: str
+    """
+
+    def __init__(self, cache_path):
+        self.cache_path = cache_path
+
+    @classmethod
+    def make_key(cls, data_files, vocab_file, do_lower_case, max_seq_length, task_name, mode):
+        """Make the key of features."""
+        desc = dict(data=file_digest(data_files), vocab=vocab_digest(vocab_file), do_lower_case=do_lower_case,
+                    max_seq_length=max_seq_length, task_name=task_name, mode=mode)
+        return hashlib.md5(json.dumps(desc, sort_keys=True).encode()).hexdigest()
+
+    def load(self, key):
+        """Load features, return None if they are not cached."""
+        cache_file = os.path.join(self.cache_path, "{}.npz".format(key))
+        if not os.path.isfile(cache_file):
+            return None
+        logger.info("Load cached features, file={}".format(cache_file))
+        with np.load(cache_file) as data:
+            return {name: data[name] for name in data.files}
+
+    def save(self, key, arrays):
+        """Save features, the cache is skipped if the folder is not writable."""
+        cache_file = os.path.join(self.cache_path, "{}.npz".format(key))
+        tmp_file = "{}.{}.tmp.npz".format(cache_file[:-4], os.getpid())
+        try:
+            os.makedirs(self.cache_path, exist_ok=True)
+            np.savez(tmp_file, **arrays)
+            os.replace(tmp_file, cache_file)
+            logger.info("Save features to cache, file={}".format(cache_file))
+        except OSError as e:
+            logger.warning("Failed to cache features, file={}, msg={}".format(cache_file, str(e)))
+
+
+def features_to_arrays(features, fields):
+    """Stack the fields of features into numpy arrays, fields with None values are skipped."""
+    arrays = {}
+    for name in fields:
+        values = [_get(feature, name) for feature in features]
+        if values and values[0] is not None:
+            arrays[name] = np.stack([np.asarray(value) for value in values])
+    return arrays
+
+
+def _get(feature, name):
+    if isinstance(feature, dict):
+        return feature.get(name)
+    return getattr(feature, name)
+
+
+def load_features(args, data_files, mode, convert_fn, fields):
+    """Load features from cache, convert and cache them if they are not cached.
+
+    :param args: dataset args, which contains vocab_file, do_lower_case, max_seq_length, task_name,
+        feature_cache and feature_cache_path.
+    :param data_files: files read by `convert_fn`.
+    :param mode: mode of the dataset.
+    :param convert_fn: function without argument which returns a list of features.
+    :param fields: names of the fields of features.
+    :return: dict of numpy arrays.
+    :rtype: dict
+    """
+    if not args.get("feature_cache"):
+        return features_to_arrays(convert_fn(), fields)
+    cache = FeatureCache(args.get("feature_cache_path") or os.path.join(args.data_path, "cache_features"))
+    key = FeatureCache.make_key(data_files, args.vocab_file, args.do_lower_case, args.max_seq_length,
+                                args.get("task_name"), mode)
+    arrays = cache.load(key)
+    if arrays is None:
+        arrays = features_to_arrays(convert_fn(), fields)
+        cache.save(key, arrays)
+    return arrays
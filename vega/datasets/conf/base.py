@@ -25,6 +25,9 @@ class BaseConfig(ConfigSerializable):
     drop_last = True
     transforms = []
     buffer_size = 128
+    shared_cache = False
+    shared_cache_path = "/dev/shm/vega_dataset_cache"
+    shared_cache_size = 16
 
     @classmethod
     def rules(cls):
@@ -38,6 +41,9 @@ class BaseConfig(ConfigSerializable):
                       "pin_memory": {"type": bool},
                       "drop_last": {"type": bool},
                       "transforms": {"type": list},
+                      "shared_cache": {"type": bool},
+                      "shared_cache_path": {"type": str},
+                      "shared_cache_size": {"type": (int, float)},
                       }
         return rules_Base
 
@@ -19,6 +19,9 @@ class MrpcCommonConfig(BaseConfig):
     max_seq_length = 128
     vocab_file = None
     do_lower_case = True
+    feature_cache = False
+    feature_cache_path = None
+    num_tokenize_workers = 0
     transforms = dict(type='ToTensorAll')
 
 
@@ -0,0 +1,81 @@
+# -*- coding=utf-8 -*-
+
+# Copyright (C) 2020. Huawei Technologies Co., Ltd. All rights reserved.
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# MIT License for more details.
+"""Default configs."""
+
+from .base import BaseConfig
+from vega.common import ConfigSerializable
+
+
+class PackedDatasetCommonConfig(BaseConfig):
+    """Default Packed Dataset Config."""
+
+    batch_size = 64
+    num_workers = 4
+    train_portion = 1.0
+    pil_image = True
+    transforms = [dict(type='ToTensor')]
+
+    @classmethod
+    def rules(cls):
+        """Return rules for checking."""
+        rules_PackedDatasetCommon = {"data_path": {"type": str},
+                                     "batch_size": {"type": int},
+                                     "num_workers": {"type": int},
+                                     "train_portion": {"type": (int, float)},
+                                     "pil_image": {"type": bool},
+                                     "transforms": {"type": list}
+                                     }
+        return rules_PackedDatasetCommon
+
+
+class PackedDatasetTrainConfig(PackedDatasetCommonConfig):
+    """Default Packed Dataset config."""
+
+    shuffle = True
+
+
+class PackedDatasetValConfig(PackedDatasetCommonConfig):
+    """Default Packed Dataset config."""
+
+    shuffle = False
+
+
+class PackedDatasetTestConfig(PackedDatasetCommonConfig):
+    """Default Packed Dataset config."""
+
+    shuffle = False
+
+
+class PackedDatasetConfig(ConfigSerializable):
+    """Default Dataset config for Packed Dataset."""
+
+    common = PackedDatasetCommonConfig
+    train = PackedDatasetTrainConfig
+    val = PackedDatasetValConfig
+    test = PackedDatasetTestConfig
+
+    @classmethod
+    def rules(cls):
+        """Return rules for checking."""
+        rules_PackedDataset = {"common": {"type": dict},
+                               "train": {"type": dict},
+                               "val": {"type": dict},
+                               "test": {"type": dict}
+                               }
+        return rules_PackedDataset
+
+    @classmethod
+    def get_config(cls):
+        """Get sub config."""
+        return {'common': cls.common,
+                'train': cls.train,
+                'val': cls.val,
+                'test': cls.test
+                }
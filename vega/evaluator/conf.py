@@ -23,6 +23,8 @@ class HostEvaluatorConfig(ConfigSerializable):
     metric = {'type': 'accuracy'}
     report_freq = 10
     is_fusion = False
+    latency_benchmark = {}  # arguments of vega.metrics.benchmark_latency, such as threads and max_runs
+    compile_mode = None  # None, trace or script, evaluate the model as a frozen torch.jit graph
 
     @classmethod
     def rules(cls):
@@ -50,6 +52,7 @@ class DeviceEvaluatorConfig(ConfigSerializable):
     is_fusion = False
     reshape_batch_size = 1
     save_intermediate_file = False
+    bundle_size = 0  # number of batches uploaded in one request to calculate metric, 0 to upload each batch
 
 
 class EvaluatorConfig(ConfigSerializable):
@@ -76,6 +76,12 @@ class DeviceEvaluator(Evaluator):
         now_time = datetime.datetime.now().strftime('%Y%m%d%H%M%S%f')
         job_id = self.step_name + "_" + str(self.worker_id) + "_" + now_time
         logging.info("The job id of evaluate service is {}.".format(job_id))
+        if vega.is_torch_backend() and self.calculate_metric and self.config.bundle_size > 0:
+            latency_avg, pfms = self._valid_bundle(job_id)
+            if self.config.evaluate_latency:
+                pfms["latency"] = latency_avg
+            logging.info("valid performance: {}".format(pfms))
+            return pfms
         if vega.is_torch_backend():
             import torch
             from vega.metrics.pytorch import Metrics
@@ -269,6 +275,61 @@ class DeviceEvaluator(Evaluator):
         logging.info("valid performance: {}".format(pfms))
         return pfms
 
+    def _valid_bundle(self, job_id):
+        """Validate the metric with the bundles of `bundle_size` batches, each bundle is evaluated in one request."""
+        import torch
+        from vega.metrics.pytorch import Metrics
+        metrics = Metrics(self.config.metric)
+        test_data = os.path.join(self.get_local_worker_path(self.step_name, self.worker_id), "input.npz")
+        self.model.eval()
+        latencies = []
+        batches = []
+        output_shape = None
+        for step, batch in enumerate(self.valid_loader):
+            if not isinstance(batch, list) and not isinstance(batch, tuple):
+                raise ValueError("The dataset format must be tuple or list,"
+                                 "but get {}.".format(type(batch)))
+            data = batch[0].numpy() if torch.is_tensor(batch[0]) else batch[0]
+            if output_shape is None:
+                real_output = self.model(torch.Tensor(data))
+                real_output = real_output[0] if isinstance(real_output, tuple) else real_output
+                output_shape = real_output.shape[1:]
+            if batches and data.shape != batches[0][0].shape:
+                # the inputs of a bundle are reshaped by one input shape, send a shorter batch on its own
+                if not self._evaluate_bundle(job_id, test_data, batches, output_shape, metrics, latencies, step):
+                    break
+                batches = []
+            batches.append((data, batch[1]))
+            if len(batches) < self.config.bundle_size and step < len(self.valid_loader) - 1:
+                continue
+            if not self._evaluate_bundle(job_id, test_data, batches, output_shape, metrics, latencies, step + 1):
+                break
+            batches = []
+        latency_avg = np.mean(latencies) if latencies else float("nan")
+        logging.info("The latency in {} is {} ms.".format(self.hardware, latency_avg))
+        return latency_avg, metrics.results
+
+    def _evaluate_bundle(self, job_id, test_data, batches, output_shape, metrics, latencies, step):
+        """Evaluate the batches of the same shape in one request, return False if it fails."""
+        import torch
+        np.savez(test_data, **{"input_{}".format(index): data for index, (data, _) in enumerate(batches)})
+        results = evaluate(backend="pytorch", hardware=self.hardware, remote_host=self.remote_host,
+                           model=self.model, weight=None, test_data=test_data, input_shape=batches[0][0].shape,
+                           reuse_model=len(latencies) > 0, job_id=job_id, precision=self.precision,
+                           intermediate_format=self.intermediate_format, opset_version=self.opset_version,
+                           save_intermediate_file=self.config.save_intermediate_file)
+        if results.get("status") != "sucess":
+            logging.error("Failed to evaluate the bundle of step {}, the error message is {}.".format(
+                step, results.get("error_message")))
+            return False
+        for (data, target), out_data in zip(batches, results["out_data"]):
+            output = torch.Tensor(out_data.reshape((data.shape[0],) + tuple(output_shape)))
+            metrics(output, target)
+        latencies.extend(results["latency"])
+        logging.info("step [{}/{}], latency [{}], valid metric [{}]".format(
+            step, len(self.valid_loader), np.mean(results["latency"]), metrics.results))
+        return True
+
     @train_process_wrapper
     def train_process(self):
         """Validate process for the model validate worker."""
@@ -13,12 +13,12 @@
 import time
 import copy
 import logging
-from statistics import mean
 import traceback
 import vega
 from vega.common import ClassFactory, ClassType
 from vega.common.general import General
 from vega.common.wrappers import train_process_wrapper
+from vega.metrics.latency_benchmark import benchmark_latency, torch_sync
 from vega.report import ReportClient
 from vega.trainer.utils import WorkerTypes
 from .conf import HostEvaluatorConfig
@@ -53,20 +53,22 @@ class HostEvaluator(Evaluator):
         self.model = model
         self.model_desc = model_desc
         self.evaluate_result = None
+        self.latency_stats = None
         self.weights_file = weights_file
         self.saved_folder = saved_folder
         self.saved_step_name = saved_step_name
 
-    def _call_model_batch(self, batch):
+    def _call_model_batch(self, batch, model=None):
+        model = self.model if model is None else model
         input, target = None, None
         if isinstance(batch, dict):
-            logits = self.model(**batch)
+            logits = model(**batch)
         elif isinstance(batch, list) and isinstance(batch[0], dict):
             target = batch
-            logits = self.model(batch)
+            logits = model(batch)
         else:
             input, target = batch
-            logits = self.model(input) if not isinstance(input, dict) else self.model(**input)
+            logits = model(input) if not isinstance(input, dict) else model(**input)
         return logits, target
 
     def valid(self, valid_loader):
@@ -77,31 +79,30 @@ class HostEvaluator(Evaluator):
         if vega.is_torch_backend():
             import torch
             from vega.metrics.pytorch import Metrics
+            from vega.model_zoo.compiler import compile_model
             if vega.is_gpu_device():
                 self.model = self.model.cuda()
             elif vega.is_npu_device():
                 self.model = self.model.to(vega.get_devices())
             metrics = Metrics(self.config.metric)
             self.model.eval()
+            model = compile_model(self.model, self.config.compile_mode)
             latency_batch = None
-            cal_lantency_counts = 10
             with torch.no_grad():
                 for step, batch in enumerate(valid_loader):
                     batch = self._set_device(batch)
                     if not latency_batch:
                         latency_batch = copy.deepcopy(batch)
-                    logits, target = self._call_model_batch(batch)
+                    logits, target = self._call_model_batch(batch, model)
                     metrics_results = metrics(logits, target)
                     if step % self.config.report_freq == 0 and metrics_results:
                         logging.info(
                             "step [{}/{}], valid metric [{}]".format(step + 1, len(valid_loader), metrics_results))
-                latency_pre_batch = []
-                for i in range(cal_lantency_counts):
-                    time_init = time.perf_counter()
-                    self._call_model_batch(latency_batch)
-                    latency_pre_batch.append((time.perf_counter() - time_init) * 1000)
-                latency = mean(latency_pre_batch)
-            logging.info("evaluator latency [{}]".format(latency))
+                self.latency_stats = benchmark_latency(lambda: self._call_model_batch(latency_batch, model),
+                                                       sync=torch_sync(vega.get_devices()),
+                                                       **self.config.latency_benchmark)
+                latency = self.latency_stats["median"] * 1000
+            logging.info("evaluator latency [{}], statistics [{}]".format(latency, self.latency_stats))
         elif vega.is_tf_backend():
             from vega.metrics.tensorflow.metrics import Metrics
             metrics = Metrics(self.config.metric)
@@ -179,7 +180,8 @@ class HostEvaluator(Evaluator):
             self.load_model()
             self.valid_loader = self._init_dataloader(mode='test')
             performance = self.valid(self.valid_loader)
-            ReportClient().update(self.step_name, self.worker_id, performance=performance)
+            ReportClient().update(self.step_name, self.worker_id, performance=performance,
+                                  latency_stats=self.latency_stats)
             logging.info(f"finished host evaluation, id: {self.worker_id}, performance: {performance}")
         except Exception:
             logging.error(traceback.format_exc())
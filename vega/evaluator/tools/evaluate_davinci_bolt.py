@@ -24,7 +24,7 @@ def evaluate(backend, hardware, remote_host, model, weight, test_data, input_sha
 
     :param backend: the backend can be one of "tensorflow", "caffe" and "pytorch"
     :type backend: str
-    :param hardware: the backend can be one of "Davinci", "Bolt"
+    :param hardware: the backend can be one of "Davinci", "Bolt", "Kirin990_npu" and "cpu_onnx"
     :type hardware: str
     :param remote_host: the remote host ip and port of evaluate service
     :type remote_host: str
@@ -32,16 +32,16 @@ def evaluate(backend, hardware, remote_host, model, weight, test_data, input_sha
     :type model: str or Class
     :param weight: .caffemodel file for caffe
     :type weight: str
-    :param test_data: binary file, .data or .bin
+    :param test_data: binary file, .data or .bin, or a bundle of inputs `input_0`, `input_1`, ... in a .npz file
     :type test_data: str
-    :return: the latency in Davinci or Bolt
+    :return: the latency in Davinci or Bolt, the latencies and outputs of each input for a bundle
     :rtype: float
     """
     if backend not in ["tensorflow", "caffe", "pytorch", "mindspore"]:
         raise ValueError("The backend only support tensorflow, caffe, pytorch and mindspore.")
 
-    if hardware not in ["Davinci", "Bolt", "Kirin990_npu"]:
-        raise ValueError("The hardware only support Davinci and Bolt.")
+    if hardware not in ["Davinci", "Bolt", "Kirin990_npu", "cpu_onnx"]:
+        raise ValueError("The hardware only support Davinci, Bolt, Kirin990_npu and cpu_onnx.")
 
     if input_shape is None:
         raise ValueError("The input shape must be provided.")
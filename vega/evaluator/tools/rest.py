@@ -10,11 +10,32 @@
 
 """Rest post operation."""
 
+import io
+import threading
+import numpy as np
 import requests
 
+_local = threading.local()
+
+
+def _session():
+    """Get the session of the current thread, the connections to the evaluate service are kept alive."""
+    if not hasattr(_local, "session"):
+        _local.session = requests.Session()
+    return _local.session
+
 
 def post(host, files, data):
-    """Post a rest request."""
-    result = requests.post(host, files=files, data=data, proxies={"http": None})
+    """Post a rest request.
+
+    The result of a bundle of inputs is a npz file, which is returned as a dict with the list of
+    latencies and the list of output arrays.
+    """
+    result = _session().post(host, files=files, data=data, proxies={"http": None})
+    if result.headers.get("Content-Type", "").startswith("application/octet-stream"):
+        with np.load(io.BytesIO(result.content)) as bundle:
+            latency = bundle["latency"]
+            out_data = [bundle["output_{}".format(index)] for index in range(len(latency))]
+        return {"status": "sucess", "latency": latency.tolist(), "out_data": out_data}
     data = result.json()
     return data
@@ -11,7 +11,9 @@
 """Import and register metrics automatically."""
 
 from .flops_and_params import calc_model_flops_params
-from .forward_latency import calc_forward_latency, calc_forward_latency_on_host
+from .forward_latency import calc_forward_latency, calc_forward_latency_on_host, benchmark_forward_latency_on_host
+from .latency_benchmark import benchmark_latency, batch_sweep, latency_stats
+from .latency_lut import LatencyLUT
 
 
 def register_metrics(backend):
@@ -9,11 +9,11 @@
 # MIT License for more details.
 
 """Calculate model forward latency."""
-import time
 import vega
 import numpy as np
 import os
 from vega.evaluator.conf import DeviceEvaluatorConfig
+from .latency_benchmark import benchmark_latency, latency_stats, torch_sync
 import datetime
 import logging
 
@@ -35,28 +35,46 @@ def calc_forward_latency(model, input, sess_config=None, num=10):
     return calc_forward_latency_on_host(model, input, sess_config, num)
 
 
-def calc_forward_latency_on_host(model, input, sess_config=None, num=100):
+def calc_forward_latency_on_host(model, input, sess_config=None, num=100, **kwargs):
     """Model forward latency calculation.
 
     :param model: network model
     :type model: torch or tf module
     :param input: input tensor
     :type input: Tensor of torch or tf
-    :param num: forward number
+    :param num: max forward number
     :type num: int
-    :return: forward latency
+    :param kwargs: the arguments of `benchmark_latency`
+    :return: median forward latency
     :rtype: float
     """
-    prepare_num = int(0.05 * num)
+    return benchmark_forward_latency_on_host(model, input, sess_config, num, **kwargs)["median"]
+
+
+def benchmark_forward_latency_on_host(model, input, sess_config=None, num=100, **kwargs):
+    """Benchmark model forward latency with statistics.
+
+    :param model: network model
+    :type model: torch or tf module
+    :param input: input tensor
+    :type input: Tensor of torch or tf
+    :param num: max forward number, the warmup runs are scaled with it
+    :type num: int
+    :param kwargs: the arguments of `benchmark_latency`
+    :return: the statistics of latencies in seconds
+    :rtype: dict
+    """
+    kwargs.setdefault("max_runs", num)
+    kwargs.setdefault("min_runs", min(30, num))
+    kwargs.setdefault("warmup", max(1, num // 20))
+    kwargs.setdefault("window", max(2, min(10, num // 10)))
+    kwargs.setdefault("max_warmup", max(kwargs["warmup"], num // 2))
     if vega.is_torch_backend():
+        import torch
         pre_mode = model.training
         model.train(False)
-        for _ in range(prepare_num):
-            model(input)
-        start_time = time.time()
-        for _ in range(num):
-            model(input)
-        latency = (time.time() - start_time) / num
+        with torch.no_grad():
+            stats = benchmark_latency(lambda: model(input), sync=torch_sync(input.device), **kwargs)
         model.train(pre_mode)
     elif vega.is_tf_backend():
         import tensorflow.compat.v1 as tf
@@ -69,16 +87,11 @@ def calc_forward_latency_on_host(model, input, sess_config=None, num=100):
                 sess.run(tf.global_variables_initializer())
                 input = tf.random.uniform(input.shape.as_list(), dtype=input.dtype)
                 input_numpy = input.eval(session=sess)
-                for _ in range(prepare_num):
-                    sess.run(output, feed_dict={input_holder: input_numpy})
-                start_time = time.time()
-                for _ in range(num):
-                    sess.run(output, feed_dict={input_holder: input_numpy})
-                latency = (time.time() - start_time) / num
+                stats = benchmark_latency(lambda: sess.run(output, feed_dict={input_holder: input_numpy}), **kwargs)
             model.training = pre_mode
-    elif vega.is_ms_backend():
-        latency = 0.
-    return latency
+    else:
+        stats = latency_stats([0.])
+    return stats
 
 
 def _calc_forward_latency_davinci(model, input, sess_config=None, num=10, evaluate_config=None):
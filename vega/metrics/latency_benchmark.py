@@ -0,0 +1,172 @@
+# -*- coding:utf-8 -*-
+
+# Copyright (C) 2020. Huawei Technologies Co., Ltd. All rights reserved.
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# MIT License for more details.
+
+"""Benchmark the latency of a function with statistics."""
+import os
+import sys
+import math
+import time
+import logging
+import numpy as np
+
+
+def benchmark_latency(fn, sync=None, warmup=5, max_warmup=200, window=10, tolerance=0.05, min_runs=30,
+                      max_runs=1000, max_time=10., precision=0.02, threads=None, cpu_affinity=None):
+    """Benchmark the latency of a function.
+
+    The function is warmed up until the median latency of two successive windows differs less than
+    `tolerance`, or the `max_warmup` or `max_time` is reached, then it is timed run by run until the 95%
+    confidence interval of the median is narrower than `precision` of the median, or the `max_runs` or
+    `max_time` is reached.
+
+    :param fn: the function without arguments to benchmark
+    :type fn: function
+    :param sync: the function to wait for the device, called after each run, such as `torch.cuda.synchronize`
+    :type sync: function
+    :param warmup: the number of runs before checking stability
+    :type warmup: int
+    :param max_warmup: the max number of warmup runs
+    :type max_warmup: int
+    :param window: the number of runs of the window to check stability and precision
+    :type window: int
+    :param tolerance: the relative tolerance of the medians of two windows to stop warmup
+    :type tolerance: float
+    :param min_runs: the min number of timed runs
+    :type min_runs: int
+    :param max_runs: the max number of timed runs
+    :type max_runs: int
+    :param max_time: the max seconds of warmup runs, and of timed runs
+    :type max_time: float
+    :param precision: the relative half width of the confidence interval of the median to stop
+    :type precision: float
+    :param threads: the number of intra op threads of pytorch, None to keep the current setting
+    :type threads: int
+    :param cpu_affinity: the cpus to run on, None to keep the current setting
+    :type cpu_affinity: list
+    :return: the statistics of the latencies in seconds
+    :rtype: dict
+    """
+    restore = _set_threads(threads, cpu_affinity)
+    try:
+        warmup_runs = _warmup(fn, sync, warmup, max_warmup, window, tolerance, max_time)
+        latencies = []
+        start_time = time.perf_counter()
+        while len(latencies) < max_runs:
+            latencies.append(_time_run(fn, sync))
+            if len(latencies) >= min_runs and len(latencies) % window == 0:
+                stats = latency_stats(latencies)
+                if stats["ci_high"] - stats["ci_low"] <= 2 * precision * stats["median"]:
+                    break
+                if time.perf_counter() - start_time >= max_time:
+                    break
+    finally:
+        restore()
+    stats = latency_stats(latencies)
+    stats["warmup_runs"] = warmup_runs
+    return stats
+
+
+def batch_sweep(make_fn, batch_sizes, **kwargs):
+    """Benchmark the latency of a function with different batch sizes.
+
+    :param make_fn: the function which takes a batch size and returns the function to benchmark
+    :type make_fn: function
+    :param batch_sizes: the batch sizes
+    :type batch_sizes: list
+    :param kwargs: the arguments of `benchmark_latency`
+    :return: the statistics of each batch size, with the median latency per sample
+    :rtype: dict
+    """
+    results = {}
+    for batch_size in batch_sizes:
+        stats = benchmark_latency(make_fn(batch_size), **kwargs)
+        stats["per_sample"] = stats["median"] / batch_size
+        results[batch_size] = stats
+        logging.info("batch size: {}, latency: {}".format(batch_size, stats))
+    return results
+
+
+def latency_stats(latencies):
+    """Get the statistics of latencies.
+
+    The confidence interval of the median is the distribution free interval of order statistics.
+
+    :param latencies: the latencies
+    :type latencies: list
+    :return: the mean, std, min, median, p90, p99, and the 95% confidence interval of the median
+    :rtype: dict
+    """
+    values = np.sort(np.asarray(latencies, dtype=np.float64))
+    count = len(values)
+    half_width = 1.96 * math.sqrt(count) / 2
+    low = max(int(math.floor(count / 2 - half_width)), 0)
+    high = min(int(math.ceil(count / 2 + half_width)), count - 1)
+    return {"runs": count,
+            "mean": float(values.mean()),
+            "std": float(values.std()),
+            "min": float(values[0]),
+            "median": float(np.median(values)),
+            "p90": float(np.percentile(values, 90)),
+            "p99": float(np.percentile(values, 99)),
+            "ci_low": float(values[low]),
+            "ci_high": float(values[high])}
+
+
+def torch_sync(device=None):
+    """Get the function to wait for the pytorch device, return None for cpu."""
+    import torch
+    device_type = str(device).split(":")[0] if device is not None else "cpu"
+    if device_type == "cuda":
+        return torch.cuda.synchronize
+    if device_type == "npu" and hasattr(torch, "npu"):
+        return torch.npu.synchronize
+    return None
+
+
+def _time_run(fn, sync):
+    start = time.perf_counter()
+    fn()
+    if sync is not None:
+        sync()
+    return time.perf_counter() - start
+
+
+def _warmup(fn, sync, warmup, max_warmup, window, tolerance, max_time):
+    start_time = time.perf_counter()
+    for _ in range(warmup):
+        _time_run(fn, sync)
+    runs = warmup
+    last_median = None
+    while runs + window <= max_warmup and time.perf_counter() - start_time < max_time:
+        median = float(np.median([_time_run(fn, sync) for _ in range(window)]))
+        runs += window
+        if last_median is not None and abs(median - last_median) <= tolerance * last_median:
+            break
+        last_median = median
+    return runs
+
+
+def _set_threads(threads, cpu_affinity):
+    """Set the threads and cpu affinity, and return the function to restore them."""
+    restores = []
+    if threads and "torch" in sys.modules:
+        import torch
+        num_threads = torch.get_num_threads()
+        torch.set_num_threads(threads)
+        restores.append(lambda: torch.set_num_threads(num_threads))
+    if cpu_affinity and hasattr(os, "sched_setaffinity"):
+        affinity = os.sched_getaffinity(0)
+        os.sched_setaffinity(0, cpu_affinity)
+        restores.append(lambda: os.sched_setaffinity(0, affinity))
+
+    def restore():
+        for fn in restores:
+            fn()
+    return restore
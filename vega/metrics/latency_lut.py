@@ -0,0 +1,156 @@
+# -*- coding:utf-8 -*-
+
+# Copyright (C) 2020. Huawei Technologies Co., Ltd. All rights reserved.
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# MIT License for more details.
+
+"""Predict the latency of a pytorch model by the latency look-up table of its operators."""
+import os
+import copy
+import json
+import threading
+import logging
+import numpy as np
+from .latency_benchmark import benchmark_latency, torch_sync
+
+
+class LatencyLUT(object):
+    """Latency look-up table of operators.
+
+    The latency of an operator is profiled once for each input shape, device and number of threads,
+    and saved in the table file. The latency of a model is the sum of the latencies of its operators,
+    the leaf modules which take one tensor as input.
+
+    :param lut_file: the json file of the table, loaded if it exists
+    :type lut_file: str
+    :param device: the device to profile the operators, such as cpu or cuda
+    :type device: str
+    :param threads: the number of intra op threads of pytorch
+    :type threads: int
+    :param kwargs: the other arguments of `benchmark_latency`
+    """
+
+    def __init__(self, lut_file=None, device="cpu", threads=None, **kwargs):
+        self.lut_file = lut_file
+        self.device = device
+        self.threads = threads
+        self.benchmark_args = dict(warmup=3, min_runs=10, max_runs=100, max_time=1.)
+        self.benchmark_args.update(kwargs)
+        self.table = {}
+        self.changed = False
+        if lut_file and os.path.exists(lut_file):
+            with open(lut_file) as f:
+                self.table = json.load(f)
+
+    def key(self, module, input_shape):
+        """Get the key of an operator with the input shape on the device.
+
+        The scalar attributes of the operator are part of the key, so the operators which have no
+        `extra_repr`, such as Zero with different strides, do not share an entry.
+        """
+        return "{}#{}#{}#{}#{}".format(self.device, self.threads, list(input_shape), repr(module),
+                                       json.dumps(_attributes(module), sort_keys=True, default=str))
+
+    def latency(self, module, input_shape):
+        """Get the latency of an operator in ms, profile it if it is not in the table."""
+        key = self.key(module, input_shape)
+        if key not in self.table:
+            self.table[key] = self.profile(module, input_shape)
+            self.changed = True
+        return self.table[key]
+
+    def profile(self, module, input_shape):
+        """Profile the median latency of an operator in ms."""
+        import torch
+        module = copy.deepcopy(module).to(self.device).eval()
+        data = torch.randn(*input_shape, device=self.device)
+        with torch.no_grad():
+            stats = benchmark_latency(lambda: module(data), sync=torch_sync(self.device), threads=self.threads,
+                                      **self.benchmark_args)
+        return stats["median"] * 1000
+
+    def measure(self, model, input_shape):
+        """Measure the median end-to-end latency of a model in ms."""
+        return self.profile(model, input_shape)
+
+    def predict(self, model, input_shape):
+        """Predict the latency of a model in ms by the sum of the latencies of its operators."""
+        return sum(self.latency(module, shape) for module, shape in collect_ops(model, input_shape))
+
+    def save(self):
+        """Save the table if it is changed."""
+        if not self.lut_file or not self.changed:
+            return
+        tmp_file = "{}.{}.{}.tmp".format(self.lut_file, os.getpid(), threading.get_ident())
+        with open(tmp_file, "w") as f:
+            json.dump(self.table, f, indent=1)
+        os.replace(tmp_file, self.lut_file)
+        self.changed = False
+
+
+def _attributes(module):
+    """Get the constructor description and the public scalar attributes of a module."""
+    attrs = {k: v for k, v in vars(module).items() if not k.startswith("_") and k != "training" and
+             isinstance(v, (bool, int, float, str, tuple, list, type(None)))}
+    desc = getattr(module, "desc", None)
+    if isinstance(desc, dict) and desc:
+        attrs["desc"] = dict(desc)
+    return attrs
+
+
+def collect_ops(model, input_shape, is_op=None, skip=None):
+    """Get the operators and their input shapes by running the model once.
+
+    :param model: the model
+    :type model: torch.nn.Module
+    :param input_shape: the input shape of the model
+    :type input_shape: list
+    :param is_op: the function to check whether a module with children is an operator
+    :type is_op: function
+    :param skip: the function to check whether the children of a module are skipped
+    :type skip: function
+    :return: the list of operators and input shapes in the order of running
+    :rtype: list
+    """
+    import torch
+    ops = []
+    handles = []
+
+    def _hook(module, inputs):
+        if len(inputs) == 1 and isinstance(inputs[0], torch.Tensor):
+            ops.append((module, list(inputs[0].shape)))
+        else:
+            logging.debug("Skip the operator with inputs other than one tensor: {}".format(module.__class__.__name__))
+
+    def _register(module):
+        for child in module.children():
+            if next(child.children(), None) is None or (is_op is not None and is_op(child)):
+                handles.append(child.register_forward_pre_hook(_hook))
+            if skip is None or not skip(child):
+                _register(child)
+    _register(model)
+    device = next(model.parameters(), torch.zeros(0)).device
+    pre_mode = model.training
+    model.eval()
+    try:
+        with torch.no_grad():
+            model(torch.randn(*input_shape, device=device))
+    finally:
+        for handle in handles:
+            handle.remove()
+        model.train(pre_mode)
+    return ops
+
+
+def prediction_accuracy(predicted, measured):
+    """Get the mean absolute percentage error and the Kendall rank correlation of the predicted latencies."""
+    predicted, measured = np.asarray(predicted, dtype=np.float64), np.asarray(measured, dtype=np.float64)
+    mape = float(np.mean(np.abs(predicted - measured) / np.maximum(measured, 1e-12)))
+    if len(predicted) < 2:
+        return {"mape": mape, "kendall_tau": 1.}
+    sign = np.sign(predicted[:, None] - predicted[None, :]) * np.sign(measured[:, None] - measured[None, :])
+    return {"mape": mape, "kendall_tau": float(sign.sum() / (len(predicted) * (len(predicted) - 1)))}
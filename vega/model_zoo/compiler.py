@@ -0,0 +1,108 @@
+# -*- coding:utf-8 -*-
+
+# Copyright (C) 2020. Huawei Technologies Co., Ltd. All rights reserved.
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# MIT License for more details.
+
+"""Compile a model to a graph for evaluation."""
+import logging
+from collections import OrderedDict
+import vega
+from vega.model_zoo.fusion import outputs_relative_diff
+
+if vega.is_torch_backend():
+    import torch
+
+
+class CompiledModel(object):
+    """Run a pytorch model in eval mode as a frozen torch.jit graph, and fall back to eager mode.
+
+    The graph is built by `torch.jit.trace` or `torch.jit.script` at the first call of each input shape,
+    and checked against the eager outputs. Calls with keyword arguments or non tensor inputs, models
+    which fail to compile or do not match, and graphs which fail to run are run in eager mode.
+    The weights are captured at compile time, so create a new one after the weights are changed.
+
+    :param model: the model to compile
+    :type model: torch.nn.Module
+    :param mode: trace or script
+    :type mode: str
+    :param tolerance: the max relative difference of the outputs of the graph and the model
+    :type tolerance: float
+    :param max_graphs: the max number of graphs of different input shapes
+    :type max_graphs: int
+    """
+
+    def __init__(self, model, mode="trace", tolerance=1e-4, max_graphs=4):
+        if mode not in ("trace", "script"):
+            raise ValueError("Compile mode should be trace or script, but got {}.".format(mode))
+        self.model = model
+        self.mode = mode
+        self.tolerance = tolerance
+        self.max_graphs = max_graphs
+        self.graphs = OrderedDict()
+        self.failed = not vega.is_torch_backend()
+
+    def __call__(self, *args, **kwargs):
+        """Run the graph of the input shape, compile it if not exists."""
+        if self.failed or kwargs or len(args) != 1 or not isinstance(args[0], torch.Tensor):
+            return self.model(*args, **kwargs)
+        input = args[0]
+        key = (tuple(input.shape), input.dtype, str(input.device))
+        if key not in self.graphs:
+            return self._compile(key, input)
+        try:
+            return self.graphs[key](input)
+        except Exception as e:
+            self._fall_back("Failed to run the compiled model", e)
+            return self.model(input)
+
+    def _compile(self, key, input):
+        self.model.eval()
+        with torch.no_grad():
+            output = self.model(input)
+            try:
+                graph = self._build(input)
+                diff = outputs_relative_diff(output, graph(input))
+            except Exception as e:
+                self._fall_back("Failed to compile the model", e)
+                return output
+        if diff is None or diff > self.tolerance:
+            self._fall_back("The outputs of the compiled model do not match", "difference: {}".format(diff))
+            return output
+        if len(self.graphs) >= self.max_graphs:
+            self.graphs.popitem(last=False)
+        self.graphs[key] = graph
+        logging.info("Compiled the model by torch.jit.{} for input {}.".format(self.mode, key[0]))
+        return output
+
+    def _build(self, input):
+        if self.mode == "script":
+            graph = torch.jit.script(self.model)
+        else:
+            graph = torch.jit.trace(self.model, input, check_trace=False, strict=False)
+        if hasattr(torch.jit, "freeze"):
+            graph = torch.jit.freeze(graph.eval())
+        return graph
+
+    def _fall_back(self, reason, message):
+        logging.warning("{}, run it in eager mode, message: {}".format(reason, message))
+        self.failed = True
+        self.graphs.clear()
+
+
+def compile_model(model, mode="trace", **kwargs):
+    """Compile a model for evaluation, return the model itself if mode is None or the backend is not pytorch.
+
+    :param model: the model to compile
+    :param mode: None, trace or script
+    :type mode: str
+    :param kwargs: the other arguments of `CompiledModel`
+    :return: the compiled model, which is called as the model
+    """
+    if not mode or not vega.is_torch_backend():
+        return model
+    return CompiledModel(model, mode, **kwargs)
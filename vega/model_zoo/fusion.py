@@ -19,11 +19,93 @@ if vega.is_torch_backend():
     from torch.nn.utils.fusion import fuse_conv_bn_weights
 
 
-def fuse(model, weights_file=None):
-    """Fuse Conv and BN."""
-    if not vega.is_torch_backend() or model.__class__.__name__ != 'DagNetwork':
+def fuse(model, weights_file=None, check_input=None, tolerance=1e-4):
+    """Fuse the operators of a model for inference.
+
+    The BatchNorm following a Conv2d or Linear is folded into its weights, the Identity and Dropout
+    ops are removed from sequential modules, and the Zero branches of Add connections are removed.
+    The model should be in eval mode after fusion.
+
+    :param model: the model to fuse, fused in place if `check_input` is None
+    :param weights_file: the file to save the fused weights, optional
+    :param check_input: the input to check the outputs of a fused copy against the model, the model is
+        returned unfused if they differ
+    :type check_input: torch.Tensor
+    :param tolerance: the max relative difference of the outputs
+    :type tolerance: float
+    :return: the fused model
+    """
+    if not vega.is_torch_backend():
         return model
+    if check_input is not None:
+        fused_model = fuse(copy.deepcopy(model))
+        diff = max_relative_diff(model, fused_model, check_input)
+        if diff is None or diff > tolerance:
+            logging.warning("The outputs of the fused model do not match, keep the model unfused, "
+                            "difference: {}".format(diff))
+            return model
+        logging.info("The outputs of the fused model match, difference: {:.2e}.".format(diff))
+        if weights_file:
+            _save_model(fused_model, weights_file)
+        return fused_model
     logging.info("Start operator fusion.")
+    if model.__class__.__name__ == 'DagNetwork':
+        _fuse_dag(model)
+    else:
+        counts = {"bn": 0, "identity": 0, "zero": 0}
+        _fuse_module(model, counts)
+        logging.info("Fused {bn} BatchNorm, removed {identity} Identity and {zero} Zero ops.".format(**counts))
+    if weights_file:
+        _save_model(model, weights_file)
+    return model
+
+
+def max_relative_diff(model, fused_model, input):
+    """Get the max relative difference of the outputs of two models in eval mode.
+
+    :param model: the original model
+    :param fused_model: the fused model
+    :param input: the input of the models
+    :type input: torch.Tensor
+    :return: the difference, or None if the structures of the outputs differ
+    :rtype: float
+    """
+    model.eval()
+    fused_model.eval()
+    with torch.no_grad():
+        return outputs_relative_diff(model(input), fused_model(input))
+
+
+def outputs_relative_diff(output, other_output):
+    """Get the max relative difference of two outputs.
+
+    The outputs are tensors, or dicts, lists and tuples of them.
+
+    :param output: the reference output
+    :param other_output: the output to compare
+    :return: the difference, or None if the structures of the outputs differ
+    :rtype: float
+    """
+    if isinstance(output, torch.Tensor):
+        if not isinstance(other_output, torch.Tensor) or output.shape != other_output.shape:
+            return None
+        if output.numel() == 0 or not output.is_floating_point():
+            return 0. if torch.equal(output, other_output) else None
+        output, other_output = output.float(), other_output.float()
+        return ((output - other_output).abs().max() / output.abs().max().clamp(min=1e-12)).item()
+    if isinstance(output, dict):
+        if not isinstance(other_output, dict) or output.keys() != other_output.keys():
+            return None
+        output, other_output = list(output.values()), [other_output[key] for key in output]
+    if isinstance(output, (tuple, list)):
+        if not isinstance(other_output, (tuple, list)) or len(output) != len(other_output):
+            return None
+        diffs = [outputs_relative_diff(item, other_item) for item, other_item in zip(output, other_output)]
+        return None if None in diffs else max(diffs, default=0.)
+    return 0. if output == other_output else None
+
+
+def _fuse_dag(model):
     for name, node in model.module_map.items():
         module = node.module
         if isinstance(node.module, torch.nn.Conv2d):
@@ -31,9 +113,85 @@ def fuse(model, weights_file=None):
             if next_nodes and isinstance(next_nodes[0].module, torch.nn.BatchNorm2d):
                 node.module = _fuse_conv_bn(module, next_nodes[0].module)
                 next_nodes[0].module = Identity()
-    if weights_file:
-        _save_model(model, weights_file)
-    return model
+
+
+def _fuse_module(module, counts):
+    """Fuse the children first, then the module itself if it runs its children one by one."""
+    for child in module.children():
+        _fuse_module(child, counts)
+    if _is_sequential(module):
+        _fuse_sequential(module, counts)
+    elif _is_add(module):
+        _remove_zero_branches(module, counts)
+
+
+def _is_sequential(module):
+    """Check that the module runs its children one by one, other modules are opaque."""
+    from vega.modules.operators.functions.pytorch_fn import Module
+    from vega.modules.connections import Sequential
+    if isinstance(module, torch.nn.Sequential):
+        return type(module).forward is torch.nn.Sequential.forward
+    return isinstance(module, Module) and type(module).forward is Module.forward and \
+        type(module).call in [Module.call, Sequential.call]
+
+
+def _is_add(module):
+    """Check that the module sums the outputs of its children."""
+    from vega.modules.operators.functions.pytorch_fn import Module
+    from vega.modules.connections import Add
+    return isinstance(module, Add) and type(module).forward is Module.forward and type(module).call is Add.call
+
+
+def _fuse_sequential(module, counts):
+    names = list(module._modules.keys())
+    for name, next_name in zip(names[:-1], names[1:]):
+        layer, next_layer = module._modules[name], module._modules[next_name]
+        if _can_fold(layer, next_layer):
+            module._modules[name] = _fold_bn(layer, next_layer)
+            module._modules[next_name] = Identity()
+            counts["bn"] += 1
+    for name in names:
+        if len(module._modules) > 1 and isinstance(module._modules[name], (Identity, torch.nn.Identity,
+                                                                           torch.nn.Dropout)):
+            del module._modules[name]
+            counts["identity"] += 1
+
+
+def _can_fold(layer, bn):
+    if isinstance(layer, torch.nn.Conv2d) and isinstance(bn, torch.nn.BatchNorm2d):
+        pass
+    elif isinstance(layer, torch.nn.Linear) and isinstance(bn, torch.nn.BatchNorm1d):
+        pass
+    else:
+        return False
+    return bn.running_mean is not None and layer.weight.shape[0] == bn.num_features
+
+
+def _fold_bn(layer, bn):
+    """Fold the BatchNorm into the weights and bias of the Conv2d or Linear."""
+    fused = copy.deepcopy(layer)
+    with torch.no_grad():
+        scale = torch.rsqrt(bn.running_var + bn.eps)
+        if bn.weight is not None:
+            scale = scale * bn.weight
+        bias = layer.bias if layer.bias is not None else torch.zeros_like(bn.running_mean)
+        bias = (bias - bn.running_mean) * scale
+        if bn.bias is not None:
+            bias = bias + bn.bias
+        weight = layer.weight * scale.reshape([-1] + [1] * (layer.weight.dim() - 1))
+    fused.weight = torch.nn.Parameter(weight)
+    fused.bias = torch.nn.Parameter(bias)
+    return fused
+
+
+def _remove_zero_branches(module, counts):
+    from vega.modules.operators import Zero
+    names = [name for name, child in module._modules.items() if isinstance(child, Zero)]
+    if len(names) == len(module._modules):
+        return
+    for name in names:
+        del module._modules[name]
+        counts["zero"] += 1
 
 
 def _fuse_conv_bn(conv, bn):
@@ -67,7 +67,8 @@ class ModelZoo(object):
             model.exclude_weight_prefix = head
             model = cls._load_pretrained_model(model, pretrained_model_file, head)
         model = transform_architecture(model, pretrained_model_file)
-        if is_fusion:
+        if is_fusion and model.__class__.__name__ == 'DagNetwork':
+            # other networks are fused by the fusion callback, which checks the outputs on a batch
             model = fuse(model)
         if model is None:
             raise ValueError("Failed to get mode, model is None.")
@@ -72,7 +72,8 @@ class Add(ConnectionsDecorator):
                 if output is None:
                     output = model(x)
                 else:
-                    output += model(x)
+                    # not in place, the first output may be the input itself, such as of an Identity
+                    output = output + model(x)
         return output
 
     @property
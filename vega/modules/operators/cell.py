@@ -22,10 +22,12 @@ class Cell(ops.Module):
 
     concat_size = 0
 
-    def __init__(self, genotype, steps, concat, reduction, reduction_prev=None, C_prev_prev=None, C_prev=None, C=None):
+    def __init__(self, genotype, steps, concat, reduction, reduction_prev=None, C_prev_prev=None, C_prev=None, C=None,
+                 mixed_op=None):
         """Init Cell."""
         super(Cell, self).__init__()
         self.genotype = genotype
+        self.mixed_op = mixed_op or {}
         self.steps = steps
         self.concat = concat
         self.reduction = reduction
@@ -80,7 +82,7 @@ class Cell(ops.Module):
             else:
                 raise Exception("input index should not less than idx_cmp")
             stride = 2 if reduction and indices_inp[i] < 2 else 1
-            op = MixedOp(C=C, stride=stride, ops_cands=op_names[i])
+            op = MixedOp(C=C, stride=stride, ops_cands=op_names[i], **self.mixed_op)
             _op_list.append(op)
         self.op_list = Seq(*tuple(_op_list))
         self.oplist = list(self.op_list.children())
@@ -145,16 +147,20 @@ class Cell(ops.Module):
 class NormalCell(Cell):
     """Normal Cell structure according to desc."""
 
-    def __init__(self, genotype, steps, concat, reduction_prev=None, C_prev_prev=None, C_prev=None, C=None):
-        super(NormalCell, self).__init__(genotype, steps, concat, False, reduction_prev, C_prev_prev, C_prev, C)
+    def __init__(self, genotype, steps, concat, reduction_prev=None, C_prev_prev=None, C_prev=None, C=None,
+                 mixed_op=None):
+        super(NormalCell, self).__init__(genotype, steps, concat, False, reduction_prev, C_prev_prev, C_prev, C,
+                                         mixed_op)
 
 
 @ClassFactory.register(ClassType.NETWORK)
 class ReduceCell(Cell):
     """Reduce Cell structure according to desc."""
 
-    def __init__(self, genotype, steps, concat, reduction_prev=None, C_prev_prev=None, C_prev=None, C=None):
-        super(ReduceCell, self).__init__(genotype, steps, concat, True, reduction_prev, C_prev_prev, C_prev, C)
+    def __init__(self, genotype, steps, concat, reduction_prev=None, C_prev_prev=None, C_prev=None, C=None,
+                 mixed_op=None):
+        super(ReduceCell, self).__init__(genotype, steps, concat, True, reduction_prev, C_prev_prev, C_prev, C,
+                                         mixed_op)
 
 
 @ClassFactory.register(ClassType.NETWORK)
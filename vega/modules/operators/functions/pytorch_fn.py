@@ -801,6 +801,14 @@ def drop_path(x, prob):
     return x
 
 
+def channel_shuffle(x, groups):
+    """Shuffle the channels of x among groups."""
+    batch_size, channels, height, width = x.size()
+    x = x.view(batch_size, groups, channels // groups, height, width)
+    x = torch.transpose(x, 1, 2).contiguous()
+    return x.view(batch_size, channels, height, width)
+
+
 def zeros(shape):
     """Create zeros like shape."""
     return torch.zeros(shape)
@@ -72,36 +72,85 @@ OPS = {
 class MixedOp(ops.Module):
     """Mix operations between two nodes.
 
-    :param desc: description of MixedOp
-    :type desc: Config
+    In search mode the candidates can be evaluated sparsely, candidates with weights below `threshold`
+    or out of the `topk` weights are skipped, at least the candidate with the max weight is kept.
+    With `partial_channel` k, only 1/k of the channels go through the candidates, the others bypass
+    them and are shuffled back, as in PC-DARTS.
+
+    :param C: channels of input
+    :type C: int
+    :param stride: stride of candidates
+    :type stride: int
+    :param ops_cands: name of the operation in train mode, list of candidate names in search mode
+    :type ops_cands: str or list
+    :param threshold: skip candidates whose weights are less than it
+    :type threshold: float
+    :param topk: only run the k candidates with the max weights
+    :type topk: int
+    :param partial_channel: ratio of the channels bypassing the candidates, pytorch only
+    :type partial_channel: int
     """
 
-    def __init__(self, C, stride, ops_cands):
+    def __init__(self, C, stride, ops_cands, threshold=None, topk=None, partial_channel=1):
         """Init MixedOp."""
         super(MixedOp, self).__init__()
+        self.threshold = threshold
+        self.topk = topk
+        self.partial_channel = partial_channel if isinstance(ops_cands, list) else 1
+        self.stride = stride
         if not isinstance(ops_cands, list):
             # train
             self.add_module(ops_cands, OPS[ops_cands](C, stride, True))
         else:
             # search
+            C = C // self.partial_channel
             for primitive in ops_cands:
                 op = OPS[primitive](C, stride, False)
                 if 'pool' in primitive:
                     op = Seq(op, ops.BatchNorm2d(C, affine=False))
                 self.add_module(primitive, op)
+        self.cands = list(self.children())
+        if self.partial_channel > 1 and stride > 1:
+            self.bypass_pool = ops.MaxPool2d(stride, stride=stride)
 
     def call(self, x, weights=None, selected_idx=None, *args, **kwargs):
         """Call function of MixedOp."""
         if selected_idx is None:
             if weights is None:
-                for model in self.children():
+                for model in self.cands:
                     x = model(x)
                 return x
-            weight_sum = ()
-            for idx, op in enumerate(self.children()):
-                weight_sum += (weights[idx] * op(x),)
-
-            return ops.add_n(weight_sum)
+            if self.partial_channel > 1:
+                return self._partial_call(x, weights)
+            return self._weighted_sum(x, weights)
         else:
             # SGAS alg: unchosen operations are pruned
-            return list(self.children())[selected_idx](x)
+            return self.cands[selected_idx](x)
+
+    def _weighted_sum(self, x, weights):
+        weight_sum = ()
+        for idx in self._active_indexes(weights):
+            weight_sum += (weights[idx] * self.cands[idx](x),)
+        return ops.add_n(weight_sum)
+
+    def _partial_call(self, x, weights):
+        channels = ops.get_shape(x)[1] // self.partial_channel
+        x_bypass = x[:, channels:]
+        if self.stride > 1:
+            x_bypass = self.bypass_pool(x_bypass)
+        out = self._weighted_sum(x[:, :channels], weights)
+        return ops.channel_shuffle(ops.concat((out, x_bypass)), self.partial_channel)
+
+    def _active_indexes(self, weights):
+        """Get the indexes of candidates to run, the zero candidates contribute nothing and are skipped."""
+        indexes = [idx for idx, op in enumerate(self.cands) if not isinstance(op, ops.Zero)]
+        if self.threshold is not None or self.topk is not None:
+            values = ops.to_numpy(weights)
+            indexes = sorted(indexes, key=lambda idx: values[idx], reverse=True)
+            best = indexes[:1]
+            if self.topk is not None:
+                indexes = indexes[:self.topk]
+            if self.threshold is not None:
+                indexes = [idx for idx in indexes if values[idx] >= self.threshold]
+            indexes = indexes or best
+        return indexes or list(range(len(self.cands)))
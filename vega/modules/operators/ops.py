@@ -24,6 +24,7 @@ else:
     GroupNorm = fn.GroupNorm
     SyncBatchNorm = fn.SyncBatchNorm
     ConvTranspose2d = fn.ConvTranspose2d
+    channel_shuffle = fn.channel_shuffle
 
 Module = fn.Module
 Conv2d = fn.Conv2d
@@ -12,7 +12,7 @@
 
 import logging
 import vega
-from vega.metrics import calc_forward_latency_on_host
+from vega.metrics import calc_forward_latency_on_host, LatencyLUT
 from vega.model_zoo import ModelZoo
 from .quota_item_base import QuotaItemBase
 
@@ -20,16 +20,22 @@ from .quota_item_base import QuotaItemBase
 class LatencyVerification(QuotaItemBase):
     """Latency Filter class."""
 
-    def __init__(self, latency_range):
+    def __init__(self, latency_range, lut_file=None):
         self.latency_range = latency_range
+        self.lut_file = lut_file
 
     def verify_on_host(self, model_desc):
         """Filter function of latency."""
         model = ModelZoo.get_model(model_desc)
         count_input = self.get_input_data()
-        trainer = vega.trainer(model_desc=model_desc)
-        sess_config = trainer._init_session_config() if vega.is_tf_backend() else None
-        latency = calc_forward_latency_on_host(model, count_input, sess_config)
+        if self.lut_file and vega.is_torch_backend():
+            lut = LatencyLUT(self.lut_file)
+            latency = lut.predict(model, list(count_input.shape))
+            lut.save()
+        else:
+            trainer = vega.trainer(model_desc=model_desc)
+            sess_config = trainer._init_session_config() if vega.is_tf_backend() else None
+            latency = calc_forward_latency_on_host(model, count_input, sess_config)
         logging.info(f"Sampled model's latency: {latency}ms")
         if latency < self.latency_range[0] or latency > self.latency_range[1]:
             logging.info(f"The latency ({latency}) is out of range. Skip this network.")
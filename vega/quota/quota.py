@@ -90,7 +90,7 @@ class Quota(object):
             if not result:
                 return False
         if len(self.host_latency_range) == 2:
-            result = LatencyVerification(self.host_latency_range).verify_on_host(model_desc)
+            result = LatencyVerification(self.host_latency_range, General.latency_lut_file).verify_on_host(model_desc)
             if not result:
                 return False
         return True
@@ -37,6 +37,7 @@ class ReportRecord(object):
         self._objective_keys = None
         self._rewards = []
         self.runtime = None
+        self.latency_stats = None
         self._original_rewards = None
         self._start_time = datetime.now()
         self._end_time = None
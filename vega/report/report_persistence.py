@@ -57,18 +57,50 @@ class ReportPersistence(object):
         except Exception:
             logging.warning(traceback.format_exc())
 
+    def save_changes(self, report):
+        """Save the progress to `reports_progress.json`, and append the changed records to `reports_changes.json`.
+
+        Each line of `reports_changes.json` is the changed records of a version in ascending order, so the
+        records changed after a version are read from the end of the file.
+        """
+        try:
+            output_path = TaskOps().local_output_path
+            FileOps.make_dir(output_path)
+            records = {key: value for key, value in report.items() if key not in ["version", "_steps_"]}
+            if records:
+                with open(FileOps.join_path(output_path, "reports_changes.json"), "a") as f:
+                    f.write(json.dumps({"version": report["version"], "records": records}, cls=JsonEncoder) + "\n")
+            _file = FileOps.join_path(output_path, "reports_progress.json")
+            with open(_file + ".tmp", "w") as f:
+                json.dump({"version": report["version"], "_steps_": report["_steps_"]}, f, indent=4, cls=JsonEncoder)
+            os.replace(_file + ".tmp", _file)
+        except Exception:
+            logging.warning(traceback.format_exc())
+
+    def get_report_since(self, records, version, step_counters):
+        """Get the report of the changed records, with the version and the counters of steps."""
+        data = self.get_report(records) or {"_steps_": []}
+        data["version"] = version
+        for step in data["_steps_"]:
+            step.update(step_counters.get(step["step_name"], {}))
+        return data
+
+    def _get_steps(self):
+        steps = []
+        for step in self.step_names:
+            if step in self.steps:
+                steps.append(dict(self.steps[step]))
+            else:
+                steps.append({
+                    "step_name": step,
+                    "status": Status.unstarted
+                })
+        return steps
+
     def get_report(self, records):
         """Save report to `reports.json`."""
         try:
-            data = {"_steps_": []}
-            for step in self.step_names:
-                if step in self.steps:
-                    data["_steps_"].append(self.steps[step])
-                else:
-                    data["_steps_"].append({
-                        "step_name": step,
-                        "status": Status.unstarted
-                    })
+            data = {"_steps_": self._get_steps()}
             for record in records:
                 if record.step_name in data:
                     data[record.step_name].append(record.to_dict())
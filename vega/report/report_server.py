@@ -24,7 +24,7 @@ from collections import OrderedDict
 from threading import Thread
 
 import vega
-from vega.common import FileOps, TaskOps
+from vega.common import FileOps, TaskOps, Status
 from vega.common.general import General
 from .record import ReportRecord
 from .report_persistence import ReportPersistence
@@ -45,12 +45,18 @@ class ReportServer(object):
     def __init__(self):
         self._hist_records = OrderedDict()
         self.persistence = ReportPersistence()
+        self.version = 0
+        self._record_versions = {}
+        self._record_progress = {}
+        self._step_counters = {}
+        self._dumped_version = 0
         self._start_save_report_thread()
         self.old_not_finished_workers = []
 
     def run(self):
         """Run report server."""
         MessageServer().register_handler("query_report", query_report)
+        MessageServer().register_handler("query_report_since", query_report_since)
         MessageServer().register_handler("update_record", update_record)
         MessageServer().register_handler("get_record", get_record)
 
@@ -208,6 +214,7 @@ class ReportServer(object):
         global _records_lock, _modified
         with _records_lock:
             _modified = True
+            self.version += 1
             self.persistence.set_step_names(step_names)
 
     def update_step_info(self, **kwargs):
@@ -215,8 +222,41 @@ class ReportServer(object):
         global _records_lock, _modified
         with _records_lock:
             _modified = True
+            self.version += 1
             self.persistence.update_step_info(**kwargs)
 
+    def _record_changed(self, uid):
+        """Bump the change version of a record, and update the counters of its step, called with the lock."""
+        self.version += 1
+        self._record_versions[uid] = self.version
+        record = self._hist_records[uid]
+        finished = record.status == Status.finished
+        current_epoch = record.current_epoch or 0
+        progress = (record.step_name, int(finished), current_epoch if finished else max(current_epoch - 1, 0))
+        old_progress = self._record_progress.get(uid)
+        if old_progress is not None:
+            self._count_progress(old_progress, -1)
+        self._count_progress(progress, 1)
+        self._record_progress[uid] = progress
+
+    def _count_progress(self, progress, sign):
+        step_name, finished, finished_epochs = progress
+        if step_name not in self._step_counters:
+            self._step_counters[step_name] = {"num_records": 0, "finished_models": 0, "finished_epochs": 0}
+        counters = self._step_counters[step_name]
+        counters["num_records"] += sign
+        counters["finished_models"] += sign * finished
+        counters["finished_epochs"] += sign * finished_epochs
+
+    def changed_records(self, version):
+        """Get the records changed after the version, called with the lock."""
+        return [self._hist_records[uid] for uid, _version in self._record_versions.items() if _version > version]
+
+    def get_report_since(self, version):
+        """Get the steps, the step counters and the records changed after the version, called with the lock."""
+        records = deepcopy(self.changed_records(version))
+        return self.persistence.get_report_since(records, self.version, deepcopy(self._step_counters))
+
     def __repr__(self):
         """Override repr function."""
         return str(self.all_records)
@@ -300,6 +340,7 @@ def update_record(step_name=None, worker_id=None, **kwargs):
         else:
             records[uid] = ReportRecord().load_dict(kwargs)
             logging.debug("new record: {}".format(records[uid].to_dict()))
+        ReportServer()._record_changed(uid)
         return {"result": "success", "data": records[uid].to_dict()}
 
 
@@ -326,10 +367,15 @@ def _dump_report(report_server, persistence):
             if not _modified:
                 continue
             all_records = report_server.all_records
+            changed_records = deepcopy(report_server.changed_records(report_server._dumped_version))
+            report_since = persistence.get_report_since(
+                changed_records, report_server.version, deepcopy(report_server._step_counters))
+            report_server._dumped_version = report_server.version
             _modified = False
 
             try:
                 persistence.save_report(all_records)
+                persistence.save_changes(report_since)
                 # TODO
                 # persistence.pickle_report(report_server._hist_records, report_server.__instances__)
                 report_server.backup_output_path()
@@ -342,3 +388,10 @@ def query_report():
     with _records_lock:
         all_records = ReportServer().all_records
         return ReportServer().persistence.get_report(all_records)
+
+
+def query_report_since(version=0):
+    """Get the records changed after the version, with the current version and the counters of steps."""
+    global _records_lock
+    with _records_lock:
+        return ReportServer().get_report_since(version)
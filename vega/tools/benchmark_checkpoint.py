@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020. Huawei Technologies Co., Ltd. All rights reserved.
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# MIT License for more details.
+
+"""Compare the epoch wall time of saving checkpoints synchronously and in background."""
+
+import os
+import time
+import tempfile
+from vega.common import argment_parser
+from vega.trainer.checkpoint_writer import CheckpointWriter
+
+
+def _parse_args():
+    parser = argment_parser("Benchmark checkpoint writer.")
+    parser.add_argument("-s", "--size", default=512, type=int, help="size of the checkpoint in MB.")
+    parser.add_argument("-e", "--epochs", default=5, type=int, help="number of epochs.")
+    parser.add_argument("-t", "--train_time", default=2., type=float, help="seconds of training in each epoch.")
+    parser.add_argument("-p", "--path", default=None, type=str,
+                        help="folder to save the checkpoints, a temporary folder if it is not set.")
+    parser.add_argument("-d", "--device", default="cpu", type=str, help="device of the weights, eg. cuda.")
+    return parser.parse_args()
+
+
+def _train(weights, seconds):
+    """Update the weights in place for some seconds, as the optimizer does."""
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for weight in weights.values():
+            weight.mul_(0.999).add_(0.001)
+
+
+def _run_epochs(args, weights, writer, path):
+    file_name = os.path.join(path, "checkpoint.pth")
+    epoch_times = []
+    for epoch in range(args.epochs):
+        start = time.perf_counter()
+        _train(weights, args.train_time)
+        writer.save({"epoch": epoch, "weight": weights}, file_name)
+        epoch_times.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    writer.flush()
+    return epoch_times, time.perf_counter() - start
+
+
+def _benchmark():
+    args = _parse_args()
+    import torch
+    numel = args.size * 1024 * 1024 // 4 // 16
+    weights = {"layer{}".format(i): torch.randn(numel, device=args.device) for i in range(16)}
+    path = args.path or tempfile.mkdtemp()
+    for name, max_pending in [("sync", 0), ("async", 2)]:
+        epoch_times, flush_time = _run_epochs(args, weights, CheckpointWriter(max_pending), path)
+        print("{}: mean epoch time {:.3f}s, max epoch time {:.3f}s, flush at the end {:.3f}s, total {:.3f}s.".format(
+            name, sum(epoch_times) / len(epoch_times), max(epoch_times), flush_time, sum(epoch_times) + flush_time))
+
+
+if __name__ == "__main__":
+    _benchmark()
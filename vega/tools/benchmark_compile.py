@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020. Huawei Technologies Co., Ltd. All rights reserved.
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# MIT License for more details.
+
+"""Compare the CPU latency of a model in eager mode and as a compiled torch.jit graph."""
+
+import vega
+from vega.common import argment_parser
+from vega.common.config import Config
+
+
+def _parse_args():
+    parser = argment_parser("Benchmark compiled evaluation.")
+    parser.add_argument("-c", "--model_desc", default=None, type=str, required=True,
+                        help="model description file, eg. desc_0.json of a searched model.")
+    parser.add_argument("-m", "--model", default=None, type=str,
+                        help="model weight file, random weights are used if it is not set.")
+    parser.add_argument("-is", "--input_shape", default=[1, 3, 32, 32], type=int, nargs="+",
+                        help="input shape, eg. 1 3 32 32.")
+    parser.add_argument("-mode", "--mode", default="trace", type=str, choices=["trace", "script"],
+                        help="compile mode, torch.jit trace or script.")
+    parser.add_argument("-t", "--threads", default=None, type=int, help="number of intra op threads.")
+    return parser.parse_args()
+
+
+def _benchmark():
+    args = _parse_args()
+    vega.set_backend("pytorch", "CPU")
+    import torch
+    from vega.model_zoo import ModelZoo
+    from vega.model_zoo.compiler import CompiledModel
+    from vega.metrics import benchmark_latency
+    model = ModelZoo.get_model(Config(args.model_desc), args.model).eval()
+    compiled_model = CompiledModel(model, args.mode)
+    data = torch.randn(*args.input_shape)
+    with torch.no_grad():
+        compiled_model(data)
+        if compiled_model.failed:
+            print("Failed to compile the model by torch.jit.{}, see the warning above.".format(args.mode))
+            return
+        latency = benchmark_latency(lambda: model(data), threads=args.threads)
+        compiled_latency = benchmark_latency(lambda: compiled_model(data), threads=args.threads)
+    print("Median latency, eager: {:.3f}ms, compiled: {:.3f}ms, speedup: {:.2f}x.".format(
+        latency["median"] * 1000, compiled_latency["median"] * 1000, latency["median"] / compiled_latency["median"]))
+
+
+if __name__ == "__main__":
+    _benchmark()
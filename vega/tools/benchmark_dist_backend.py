@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020. Huawei Technologies Co., Ltd. All rights reserved.
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# MIT License for more details.
+
+"""Compare the throughput of the pooled remote backend of ModularNAS with and without batched calls."""
+
+import time
+import multiprocessing
+from vega.common import argment_parser
+
+
+def _parse_args():
+    parser = argment_parser("Benchmark the distributed backend of ModularNAS.")
+    parser.add_argument("-w", "--workers", default=4, type=int, help="number of local worker processes.")
+    parser.add_argument("-n", "--num_steps", default=1000, type=int, help="number of evaluated parameter sets.")
+    parser.add_argument("-st", "--step_time", default=0.5, type=float, help="milliseconds of each evaluation.")
+    parser.add_argument("-bs", "--batch_size", default=8, type=int, help="max calls per round-trip.")
+    parser.add_argument("-p", "--port", default=18862, type=int, help="port of the first worker.")
+    return parser.parse_args()
+
+
+class _Estim(object):
+    """Estimator whose step takes a fixed time."""
+
+    def __init__(self, step_time):
+        self.step_time = step_time
+
+    def step(self, params):
+        """Return evaluation results of a parameter set."""
+        end = time.perf_counter() + self.step_time / 1000
+        while time.perf_counter() < end:
+            pass
+        return {"default": params["x"]}
+
+
+def _run_worker(port, step_time):
+    import vega.algorithms.nas.modnas.compat  # noqa: F401
+    from modnas.estim.dist_backend.pool import PooledWorker
+    PooledWorker("localhost", port).run(_Estim(step_time))
+
+
+def _throughput(args, ports, conn_per_worker, batch_size):
+    from modnas.estim.dist_backend.pool import PooledRemote
+    remote = PooledRemote(["localhost:{}".format(port) for port in ports], conn_per_worker=conn_per_worker,
+                          batch_size=batch_size)
+    remote.step_many([{"x": i} for i in range(len(ports) * 4)])
+    start = time.perf_counter()
+    remote.step_many([{"x": i} for i in range(args.num_steps)])
+    elapsed = time.perf_counter() - start
+    remote.executor.shutdown()
+    while not remote.conns.empty():
+        remote.conns.get()[1].close()
+    return args.num_steps / elapsed
+
+
+def _benchmark():
+    args = _parse_args()
+    import vega.algorithms.nas.modnas.compat  # noqa: F401
+    from modnas.estim.dist_backend.pool import PooledRemote
+    ports = [args.port + i for i in range(args.workers)]
+    procs = [multiprocessing.Process(target=_run_worker, args=(port, args.step_time), daemon=True) for port in ports]
+    for proc in procs:
+        proc.start()
+    time.sleep(2)
+    single = _throughput(args, ports, 1, 1)
+    pooled = _throughput(args, ports, 2, args.batch_size)
+    print("Evaluations per second, one call per round-trip: {:.1f}, pooled and batched: {:.1f}, speedup: {:.2f}x."
+          .format(single, pooled, pooled / single))
+    PooledRemote(["localhost:{}".format(port) for port in ports], conn_per_worker=1).close()
+    for proc in procs:
+        proc.join(5)
+
+
+if __name__ == "__main__":
+    _benchmark()
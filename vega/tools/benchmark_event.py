@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020. Huawei Technologies Co., Ltd. All rights reserved.
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# MIT License for more details.
+
+"""Measure the call overhead of the event hooked methods of ModularNAS."""
+
+import timeit
+from vega.common import argment_parser
+
+
+def _parse_args():
+    parser = argment_parser("Benchmark the event hooks of ModularNAS.")
+    parser.add_argument("-n", "--number", default=1000000, type=int, help="number of calls.")
+    return parser.parse_args()
+
+
+class _Plain(object):
+    """Class without event hooks."""
+
+    def step(self, value):
+        """Return the value plus one."""
+        return value + 1
+
+
+class _Hooked(_Plain):
+    """Subclass whose methods are event hooked, the events are named by the class defining them."""
+
+    pass
+
+
+def _benchmark():
+    args = _parse_args()
+    import vega.algorithms.nas.modnas.compat  # noqa: F401
+    from modnas.core.event import event_hooked_class, event_on, event_off
+    event_hooked_class(_Hooked, methods=["step"])
+    plain, hooked = _Plain(), _Hooked()
+    results = [("plain", timeit.timeit(lambda: plain.step(1), number=args.number))]
+    results.append(("hooked, no handler", timeit.timeit(lambda: hooked.step(1), number=args.number)))
+    event_on("after:_Plain.step", lambda ret, *fn_args: None)
+    results.append(("hooked, one handler", timeit.timeit(lambda: hooked.step(1), number=args.number)))
+    event_off("after:_Plain.step")
+    print("Call time, {}.".format(", ".join(
+        "{}: {:.3f}us".format(name, elapsed / args.number * 1e6) for name, elapsed in results)))
+
+
+if __name__ == "__main__":
+    _benchmark()
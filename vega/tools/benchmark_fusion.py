@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020. Huawei Technologies Co., Ltd. All rights reserved.
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# MIT License for more details.
+
+"""Check the outputs and compare the CPU latency of a model before and after operator fusion."""
+
+import copy
+import vega
+from vega.common import argment_parser
+from vega.common.config import Config
+
+
+def _parse_args():
+    parser = argment_parser("Benchmark operator fusion.")
+    parser.add_argument("-c", "--model_desc", default=None, type=str, required=True,
+                        help="model description file, eg. desc_0.json of a searched model.")
+    parser.add_argument("-m", "--model", default=None, type=str,
+                        help="model weight file, random weights are used if it is not set.")
+    parser.add_argument("-is", "--input_shape", default=[1, 3, 32, 32], type=int, nargs="+",
+                        help="input shape, eg. 1 3 32 32.")
+    parser.add_argument("-t", "--threads", default=None, type=int, help="number of intra op threads.")
+    parser.add_argument("-tol", "--tolerance", default=1e-4, type=float,
+                        help="max relative difference of the outputs.")
+    return parser.parse_args()
+
+
+def _benchmark():
+    args = _parse_args()
+    vega.set_backend("pytorch", "CPU")
+    import torch
+    from vega.model_zoo import ModelZoo
+    from vega.model_zoo.fusion import fuse, max_relative_diff
+    from vega.metrics import benchmark_latency
+    model = ModelZoo.get_model(Config(args.model_desc), args.model).eval()
+    fused_model = fuse(copy.deepcopy(model)).eval()
+    data = torch.randn(*args.input_shape)
+    diff = max_relative_diff(model, fused_model, data)
+    with torch.no_grad():
+        latency = benchmark_latency(lambda: model(data), threads=args.threads)
+        fused_latency = benchmark_latency(lambda: fused_model(data), threads=args.threads)
+    if diff is None:
+        print("The outputs of the fused model differ in structure, NOT equivalent.")
+    else:
+        print("Max relative difference of outputs: {:.2e}, {}.".format(
+            diff, "equivalent" if diff <= args.tolerance else "NOT equivalent"))
+    print("Median latency, original: {:.3f}ms, fused: {:.3f}ms, speedup: {:.2f}x.".format(
+        latency["median"] * 1000, fused_latency["median"] * 1000, latency["median"] / fused_latency["median"]))
+
+
+if __name__ == "__main__":
+    _benchmark()
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020. Huawei Technologies Co., Ltd. All rights reserved.
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# MIT License for more details.
+
+"""Measure the generation time of the evolution Optimizers of ModularNAS for different population sizes."""
+
+import time
+import random
+from vega.common import argment_parser
+
+
+def _parse_args():
+    parser = argment_parser("Benchmark the genetic operators of ModularNAS.")
+    parser.add_argument("-o", "--optim", default="EvolutionOptim", type=str,
+                        choices=["EvolutionOptim", "RegularizedEvolutionOptim"], help="Optimizer type.")
+    parser.add_argument("-ps", "--pop_sizes", default=[100, 1000, 10000], type=int, nargs="+",
+                        help="population sizes.")
+    parser.add_argument("-np", "--num_params", default=50, type=int, help="number of categorical parameters.")
+    parser.add_argument("-nc", "--num_choices", default=7, type=int, help="number of choices of each parameter.")
+    parser.add_argument("-g", "--generations", default=5, type=int, help="number of timed generations.")
+    return parser.parse_args()
+
+
+class _Estim(object):
+    """Estimator which returns random results of the proposed parameter sets."""
+
+    def __init__(self, params_list):
+        self.results = [random.random() for _ in params_list]
+
+    def get_last_results(self):
+        """Return the last evaluated parameter sets and results."""
+        return [], self.results
+
+
+def _generation_time(args, pop_size):
+    from modnas.core.param_space import ParamSpace
+    from modnas.core.params import Categorical
+    from modnas.registry.optim import get_builder
+    ParamSpace().reset()
+    for i in range(args.num_params):
+        Categorical(list(range(args.num_choices)), name="p{}".format(i))
+    optim = get_builder(args.optim)(pop_size=pop_size, n_select=max(pop_size // 10, 2),
+                                    mutation_prob=1. / args.num_params)
+    propose_time = mating_time = 0.
+    for _ in range(args.generations):
+        start = time.perf_counter()
+        params_list = optim.next(len(optim.population))
+        propose_time += time.perf_counter() - start
+        estim = _Estim(params_list)
+        start = time.perf_counter()
+        optim.step(estim)
+        mating_time += time.perf_counter() - start
+    return propose_time / args.generations, mating_time / args.generations
+
+
+def _benchmark():
+    args = _parse_args()
+    import vega.algorithms.nas.modnas.compat  # noqa: F401
+    import modnas.optim.predefined.genetic  # noqa: F401
+    for pop_size in args.pop_sizes:
+        propose_time, mating_time = _generation_time(args, pop_size)
+        print("Population {}: genetic operators: {:.2f}ms, proposing parameter sets: {:.2f}ms per generation."
+              .format(pop_size, mating_time * 1000, propose_time * 1000))
+
+
+if __name__ == "__main__":
+    _benchmark()
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020. Huawei Technologies Co., Ltd. All rights reserved.
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# MIT License for more details.
+
+"""Compare the train step time of a model on random data without and with the prefetchers of the trainer."""
+
+import time
+from vega.common import argment_parser
+
+
+def _parse_args():
+    parser = argment_parser("Benchmark data prefetching.")
+    parser.add_argument("-is", "--input_shape", default=[3, 224, 224], type=int, nargs="+",
+                        help="input shape of a sample, eg. 3 224 224.")
+    parser.add_argument("-bs", "--batch_size", default=64, type=int, help="batch size.")
+    parser.add_argument("-n", "--num_steps", default=50, type=int, help="number of timed train steps.")
+    parser.add_argument("-w", "--num_workers", default=0, type=int, help="number of workers of the data loader.")
+    parser.add_argument("-pm", "--pin_memory", action="store_true", help="pin memory in the data loader.")
+    parser.add_argument("-d", "--depth", default=2, type=int, help="max number of batches prefetched.")
+    return parser.parse_args()
+
+
+def _step_time(args, model, mode):
+    import torch
+    from vega.trainer.prefetcher import prefetch
+    from torch.utils.data import DataLoader, TensorDataset
+    num_samples = (args.num_steps + 5) * args.batch_size
+    dataset = TensorDataset(torch.randn(num_samples, *args.input_shape), torch.randint(0, 10, (num_samples,)))
+    loader = DataLoader(dataset, batch_size=args.batch_size, num_workers=args.num_workers,
+                        pin_memory=args.pin_memory)
+    cuda = torch.cuda.is_available()
+    optimizer = torch.optim.SGD(model.parameters(), lr=0.01)
+    criterion = torch.nn.CrossEntropyLoss()
+
+    def to_device(batch):
+        return [t.cuda() for t in batch] if cuda else batch
+
+    start = None
+    for step, batch in enumerate(prefetch(loader, mode, to_device, args.depth)):
+        if step == 5:
+            if cuda:
+                torch.cuda.synchronize()
+            start = time.perf_counter()
+        input, target = to_device(batch)
+        optimizer.zero_grad()
+        criterion(model(input), target).backward()
+        optimizer.step()
+    if cuda:
+        torch.cuda.synchronize()
+    return (time.perf_counter() - start) / args.num_steps
+
+
+def _benchmark():
+    args = _parse_args()
+    import torch
+    model = torch.nn.Sequential(
+        torch.nn.Conv2d(args.input_shape[0], 16, 3, stride=2), torch.nn.ReLU(), torch.nn.AdaptiveAvgPool2d(1),
+        torch.nn.Flatten(), torch.nn.Linear(16, 10))
+    if torch.cuda.is_available():
+        model = model.cuda()
+    modes = [None, "thread"] + (["cuda"] if torch.cuda.is_available() else [])
+    times = {mode: _step_time(args, model, mode) for mode in modes}
+    print("Mean train step time, {}.".format(", ".join(
+        "{}: {:.2f}ms ({:.2f}x)".format(mode or "no prefetch", step_time * 1000, times[None] / step_time)
+        for mode, step_time in times.items())))
+
+
+if __name__ == "__main__":
+    _benchmark()
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020. Huawei Technologies Co., Ltd. All rights reserved.
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# MIT License for more details.
+
+"""Compare the step latency of the model-based Optimizer of ModularNAS with full, incremental and async fitting."""
+
+import time
+import random
+from vega.common import argment_parser
+
+
+def _parse_args():
+    parser = argment_parser("Benchmark the score models of ModularNAS.")
+    parser.add_argument("-m", "--model", default="xgboost", type=str, choices=["xgboost", "forest"],
+                        help="score model, XGBoost or scikit-learn random forest.")
+    parser.add_argument("-n", "--num_evals", default=1024, type=int, help="number of evaluated parameter sets.")
+    parser.add_argument("-np", "--num_params", default=20, type=int, help="number of categorical parameters.")
+    parser.add_argument("-nc", "--num_choices", default=5, type=int, help="number of choices of each parameter.")
+    parser.add_argument("-bs", "--batch_size", default=32, type=int, help="number of next points of each fit.")
+    parser.add_argument("-b", "--buckets", default=4, type=int, help="number of history size buckets to report.")
+    return parser.parse_args()
+
+
+class _Estim(object):
+    """Estimator which returns the last results of a synthetic score."""
+
+    def __init__(self, weights):
+        self.weights = weights
+        self.inputs = []
+        self.results = []
+
+    def evaluate(self, params_list):
+        """Evaluate parameter sets by the synthetic score."""
+        self.inputs = params_list
+        self.results = [sum(w[v] for w, v in zip(self.weights, params.values())) for params in params_list]
+
+    def get_last_results(self):
+        """Return the last evaluated parameter sets and results."""
+        return self.inputs, self.results
+
+
+def _model_config(args, incremental):
+    if args.model == "xgboost":
+        return {"type": "XGBoostScoreModel", "args": {"update_rounds": 40 if incremental else 0}}
+    return {"type": "SKLearnScoreModel", "args": {
+        "model_cls": "RandomForestRegressor", "module": "sklearn.ensemble", "model_kwargs": {"n_estimators": 100},
+        "warm_start_estimators": 10 if incremental else 0}}
+
+
+def _run(args, incremental, async_fit):
+    from modnas.core.param_space import ParamSpace
+    from modnas.core.params import Categorical
+    from modnas.optim.predefined.model_based import ModelBasedOptim
+    ParamSpace().reset()
+    for i in range(args.num_params):
+        Categorical(list(range(args.num_choices)), name="p{}".format(i))
+    random.seed(0)
+    estim = _Estim([[random.random() for _ in range(args.num_choices)] for _ in range(args.num_params)])
+    optim = ModelBasedOptim(_model_config(args, incremental), {"type": "SimulatedAnnealingModelOptim"},
+                            n_next_pts=args.batch_size, incremental=incremental, async_fit=async_fit)
+    latencies = []
+    best = None
+    for _ in range(args.num_evals // args.batch_size):
+        estim.evaluate(optim.next(args.batch_size))
+        best = max([best] + estim.results) if best is not None else max(estim.results)
+        start = time.perf_counter()
+        optim.step(estim)
+        latencies.append(time.perf_counter() - start)
+    if optim.fit_future is not None:
+        optim.fit_future.result()
+    return latencies, best
+
+
+def _benchmark():
+    args = _parse_args()
+    import vega.algorithms.nas.modnas.compat  # noqa: F401
+    import modnas.optim.score_model  # noqa: F401
+    import modnas.optim.model_optim  # noqa: F401
+    modes = [("full refit", False, False), ("incremental", True, False), ("incremental async", True, True)]
+    bucket_size = max(1, args.num_evals // args.batch_size // args.buckets)
+    for name, incremental, async_fit in modes:
+        latencies, best = _run(args, incremental, async_fit)
+        buckets = [latencies[i:i + bucket_size] for i in range(0, len(latencies), bucket_size)]
+        print("{}: best score {:.4f}, mean step latency by history size: {}.".format(name, best, ", ".join(
+            "{}: {:.1f}ms".format((i + 1) * bucket_size * args.batch_size, sum(b) / len(b) * 1000)
+            for i, b in enumerate(buckets))))
+
+
+if __name__ == "__main__":
+    _benchmark()
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020. Huawei Technologies Co., Ltd. All rights reserved.
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# MIT License for more details.
+
+"""Compare the step time of a DARTS supernet with dense and sparse MixedOp on CPU."""
+
+import time
+import copy
+import vega
+from vega.common import argment_parser
+from vega.common.config import Config
+
+
+def _parse_args():
+    parser = argment_parser("Benchmark supernet step time.")
+    parser.add_argument("-c", "--config_file", default=None, type=str, required=True,
+                        help="config file with nas.search_space.super_network, eg. examples/nas/darts_cnn/darts.yml")
+    parser.add_argument("-bs", "--batch_size", default=16, type=int, help="batch size.")
+    parser.add_argument("-is", "--image_size", default=32, type=int, help="image size.")
+    parser.add_argument("-s", "--steps", default=10, type=int, help="number of measured steps.")
+    parser.add_argument("-t", "--threshold", default=None, type=float, help="threshold of MixedOp weights.")
+    parser.add_argument("-k", "--topk", default=None, type=int, help="top k candidates of MixedOp.")
+    parser.add_argument("-pc", "--partial_channel", default=1, type=int, help="partial channel ratio of MixedOp.")
+    return parser.parse_args()
+
+
+def _build_network(desc, mixed_op):
+    from vega.common import ClassFactory, ClassType
+    desc = copy.deepcopy(desc)
+    for name in set(desc.cells.modules):
+        desc.cells[name]["mixed_op"] = mixed_op
+    return ClassFactory.get_instance(ClassType.NETWORK, desc)
+
+
+def _step_time(model, args):
+    import torch
+    data = torch.randn(args.batch_size, 3, args.image_size, args.image_size)
+    for step in range(args.steps + 1):
+        if step == 1:
+            start = time.perf_counter()
+        model.zero_grad()
+        logits = model(data)
+        logits = logits[0] if isinstance(logits, tuple) else logits
+        logits.sum().backward()
+    return (time.perf_counter() - start) / args.steps
+
+
+def _benchmark():
+    args = _parse_args()
+    vega.set_backend("pytorch", "CPU")
+    desc = Config(args.config_file).nas.search_space.super_network
+    mixed_op = dict(threshold=args.threshold, topk=args.topk, partial_channel=args.partial_channel)
+    dense_time = _step_time(_build_network(desc, {}), args)
+    sparse_time = _step_time(_build_network(desc, mixed_op), args)
+    print("Step time, dense: {:.3f}s, sparse {}: {:.3f}s, speedup: {:.2f}x.".format(
+        dense_time, mixed_op, sparse_time, dense_time / sparse_time))
+
+
+if __name__ == "__main__":
+    _benchmark()
@@ -12,6 +12,10 @@
 
 import pickle
 import os
+import time
+import tempfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import cv2
 import csv
@@ -39,13 +43,34 @@ def _load_image(image_file):
     return img.reshape(1, channel, height, width)
 
 
+def _load_batch(image_files):
+    """Load the images of a batch, the images in a batch must have the same size."""
+    return np.concatenate([_load_image(image_file) for image_file in image_files])
+
+
+def _iter_batches(loader, batch_size, workers):
+    """Decode the batches in a pool of threads, and keep `workers` batches decoding ahead."""
+    batches = [loader[i:i + batch_size] for i in range(0, len(loader), batch_size)]
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        pending = deque()
+        for batch in batches[:workers + 1]:
+            pending.append((batch, executor.submit(_load_batch, batch)))
+        next_index = len(pending)
+        while pending:
+            batch, future = pending.popleft()
+            if next_index < len(batches):
+                pending.append((batches[next_index], executor.submit(_load_batch, batches[next_index])))
+                next_index += 1
+            yield [os.path.basename(file_name) for file_name in batch], future.result()
+
+
 def _to_tensor(data):
     """Change data to tensor."""
     if vega.is_torch_backend():
         import torch
-        data = torch.tensor(data)
+        data = torch.from_numpy(data)
         if args.device == "GPU":
-            return data.cuda()
+            return data.cuda(non_blocking=True)
         else:
             return data
     elif vega.is_tf_backend():
@@ -65,32 +90,55 @@ def _get_model(args):
     return model
 
 
-def _infer(args, loader, model=None):
+def _infer(args, loader, writer, model=None):
     """Choose backend."""
     if vega.is_torch_backend():
-        return _infer_pytorch(model, loader)
+        return _infer_pytorch(args, model, loader, writer)
     elif vega.is_tf_backend():
-        return _infer_tf(args, model, loader)
+        return _infer_tf(args, model, loader, writer)
     elif vega.is_ms_backend():
-        return _infer_ms(args, model, loader)
+        return _infer_ms(args, model, loader, writer)
+
+
+def _compile_pytorch(args, model, data):
+    """Compile the model with torch.jit or onnxruntime, return a function of numpy array to numpy array."""
+    import torch
+    if args.engine in ("jit", "script"):
+        from vega.model_zoo.compiler import compile_model
+        model = compile_model(model, "trace" if args.engine == "jit" else "script")
+    elif args.engine == "onnx":
+        import onnxruntime
+        onnx_file = os.path.join(tempfile.mkdtemp(), "model.onnx")
+        torch.onnx.export(model.cpu(), torch.from_numpy(data), onnx_file, input_names=["input"],
+                          output_names=["output"], dynamic_axes={"input": {0: "batch"}, "output": {0: "batch"}})
+        options = onnxruntime.SessionOptions()
+        if args.threads > 0:
+            options.intra_op_num_threads = args.threads
+        session = onnxruntime.InferenceSession(onnx_file, options, providers=["CPUExecutionProvider"])
+        return lambda data: session.run(None, {"input": data})[0]
+
+    def _run(data):
+        logits = model(_to_tensor(data))
+        logits = logits[0] if isinstance(logits, (tuple, list)) else logits
+        return logits.cpu().numpy()
+    return _run
 
 
-def _infer_pytorch(model, loader):
+def _infer_pytorch(args, model, loader, writer):
     """Infer with pytorch."""
-    infer_result = []
     import torch
+    if args.threads > 0:
+        torch.set_num_threads(args.threads)
+    run = None
     with torch.no_grad():
-        for file_name in loader:
-            data = _to_tensor(_load_image(file_name))
-            logits = model(data)
-            logits = logits[0].tolist()
-            infer_result.append((os.path.basename(file_name), logits))
-        return infer_result
+        for names, data in _iter_batches(loader, args.batch_size, args.workers):
+            if run is None:
+                run = _compile_pytorch(args, model, data)
+            writer.write(names, run(data))
 
 
-def _infer_tf(args, model, loader):
+def _infer_tf(args, model, loader, writer):
     """Infer with tf."""
-    infer_result = []
     import tensorflow as tf
     meta_file = None
     model_file = os.listdir(args.model)
@@ -98,7 +146,7 @@ def _infer_tf(args, model, loader):
         if '.meta' in file:
             meta_file = file
     _, channel, height, width = _load_image(loader[0]).shape
-    input = tf.placeholder(tf.float32, shape=(1, channel, height, width), name='input')
+    input = tf.placeholder(tf.float32, shape=(None, channel, height, width), name='input')
     output = model(input, training=False)
     with tf.compat.v1.Session() as sess:
         sess.run(tf.global_variables_initializer())
@@ -108,35 +156,52 @@ def _infer_tf(args, model, loader):
         else:
             print('Meta file cant find')
             raise
-        for filename in loader:
-            data = _load_image(filename)
-            infer_result.append(sess.run(output, feed_dict={input: data}))
-    return infer_result
+        for names, data in _iter_batches(loader, args.batch_size, args.workers):
+            writer.write(names, sess.run(output, feed_dict={input: data}))
 
 
-def _infer_ms():
+def _infer_ms(args, model, loader, writer):
     """Infer with ms."""
-    # TODO
-    pass
-
-
-def _save_result(args, result):
-    """Save results."""
-    _output_file = args.output_file
-    if args.data_format in ["classification", "c"]:
-        if not _output_file:
-            _output_file = "./result.csv"
-        result = [(_file, _data.index(max(_data))) for (_file, _data) in result]
-        with open(_output_file, 'w') as f:
-            writer = csv.writer(f)
-            writer.writerows(result)
-        print('Results of Inference is saved in {}.'.format(_output_file))
-    else:
-        if not _output_file:
-            _output_file = "./result.pkl"
-        with open(_output_file, 'wb') as f:
-            pickle.dump(result, f)
-        print('Results of Inference is saved in {}.'.format(_output_file))
+    from mindspore import Tensor
+    model.set_train(False)
+    for names, data in _iter_batches(loader, args.batch_size, args.workers):
+        logits = model(Tensor(data))
+        logits = logits[0] if isinstance(logits, (tuple, list)) else logits
+        writer.write(names, logits.asnumpy())
+
+
+class _ResultWriter(object):
+    """Write the results, the results of classification are written to the csv file batch by batch."""
+
+    def __init__(self, args):
+        self.classification = args.data_format in ["classification", "c"]
+        self.output_file = args.output_file or ("./result.csv" if self.classification else "./result.pkl")
+        self.result = []
+        self.count = 0
+        self.start_time = time.perf_counter()
+        if self.classification:
+            self._file = open(self.output_file, 'w')
+            self._writer = csv.writer(self._file)
+
+    def write(self, names, logits):
+        """Write the results of a batch."""
+        self.count += len(names)
+        if self.classification:
+            self._writer.writerows(zip(names, np.argmax(logits.reshape(len(names), -1), axis=1).tolist()))
+        else:
+            self.result.extend(zip(names, logits.tolist()))
+
+    def close(self):
+        """Close the output file, and print the throughput."""
+        if self.classification:
+            self._file.close()
+        else:
+            with open(self.output_file, 'wb') as f:
+                pickle.dump(self.result, f)
+        print('Results of Inference is saved in {}.'.format(self.output_file))
+        elapsed = time.perf_counter() - self.start_time
+        print('Inferred {} images in {:.2f}s, throughput: {:.2f} images/s.'.format(
+            self.count, elapsed, self.count / max(elapsed, 1e-9)))
 
 
 def parse_args_parser():
@@ -173,6 +238,14 @@ def parse_args_parser():
                         "segmentation: ./result.pkl, "
                         "detection: ./result.pkl "
                         )
+    parser.add_argument("-bs", "--batch_size", default=1, type=int,
+                        help="batch size, the images in a batch must have the same size.")
+    parser.add_argument("-w", "--workers", default=2, type=int,
+                        help="number of threads to decode the images ahead of the inference.")
+    parser.add_argument("-e", "--engine", default="eager", type=str, choices=["eager", "jit", "script", "onnx"],
+                        help="engine of pytorch model, eager, torch.jit trace or script, or onnxruntime on cpu.")
+    parser.add_argument("-t", "--threads", default=0, type=int,
+                        help="number of intra op threads on cpu, 0 to keep the default.")
     args = parser.parse_args()
     return args
 
@@ -185,6 +258,7 @@ if __name__ == '__main__':
     print("Start loading data.")
     loader = _load_data(args)
     print("Start inferencing.")
-    result = _infer(args, loader, model)
-    _save_result(args, result)
+    writer = _ResultWriter(args)
+    _infer(args, loader, writer, model)
+    writer.close()
     print("Completed successfully.")
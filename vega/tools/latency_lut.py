@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020. Huawei Technologies Co., Ltd. All rights reserved.
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# MIT License for more details.
+
+"""Build the latency look-up table of the operators of models, and check the predicted latencies."""
+
+import vega
+from vega.common import argment_parser
+from vega.common.config import Config
+
+
+def _parse_args():
+    parser = argment_parser("Build and check latency look-up table.")
+    parser.add_argument("-c", "--model_desc", default=None, type=str, nargs="+", required=True,
+                        help="model description files, eg. the desc_*.json of searched models.")
+    parser.add_argument("-l", "--lut_file", default="latency_lut.json", type=str,
+                        help="latency look-up table file, updated with the new operators.")
+    parser.add_argument("-is", "--input_shape", default=[1, 3, 32, 32], type=int, nargs="+",
+                        help="input shape, eg. 1 3 32 32.")
+    parser.add_argument("-d", "--device", default="cpu", type=str, help="device, eg. cpu or cuda.")
+    parser.add_argument("-t", "--threads", default=None, type=int, help="number of intra op threads.")
+    return parser.parse_args()
+
+
+def _check():
+    args = _parse_args()
+    vega.set_backend("pytorch", "GPU" if args.device.startswith("cuda") else "CPU")
+    from vega.model_zoo import ModelZoo
+    from vega.metrics.latency_lut import LatencyLUT, prediction_accuracy
+    lut = LatencyLUT(args.lut_file, device=args.device, threads=args.threads)
+    predicted, measured = [], []
+    for desc_file in args.model_desc:
+        model = ModelZoo.get_model(Config(desc_file))
+        predicted.append(lut.predict(model, args.input_shape))
+        lut.save()
+        measured.append(lut.measure(model, args.input_shape))
+        print("{}: predicted {:.3f}ms, measured {:.3f}ms.".format(desc_file, predicted[-1], measured[-1]))
+    accuracy = prediction_accuracy(predicted, measured)
+    print("Mean absolute percentage error: {:.2%}, kendall tau: {:.4f}, operators in table: {}.".format(
+        accuracy["mape"], accuracy["kendall_tau"], len(lut.table)))
+
+
+if __name__ == "__main__":
+    _check()
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020. Huawei Technologies Co., Ltd. All rights reserved.
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# MIT License for more details.
+
+"""Pack a vega dataset into the pre-decoded format of PackedDataset."""
+
+import os
+import time
+import vega
+from vega.common import argment_parser
+from vega.common import ClassFactory, ClassType
+
+
+def _parse_args():
+    parser = argment_parser("Pack dataset.")
+    parser.add_argument("-b", "--backend", default="pytorch", type=str,
+                        choices=["pytorch", "tensorflow", "mindspore"],
+                        help="set training platform")
+    parser.add_argument("-ds", "--dataset", default=None, type=str, required=True,
+                        help="dataset type, eg. Imagenet, ClassificationDataset.")
+    parser.add_argument("-dp", "--data_path", default=None, type=str, required=True,
+                        help="dataset path.")
+    parser.add_argument("-o", "--output_path", default=None, type=str, required=True,
+                        help="folder of the packed dataset.")
+    parser.add_argument("-m", "--modes", default=["train", "test"], type=str, nargs='*',
+                        help="modes to pack, eg. train val test.")
+    parser.add_argument("-w", "--num_workers", default=0, type=int,
+                        help="number of decode processes.")
+    parser.add_argument("-bm", "--benchmark", default=0, type=int,
+                        help="number of items to read for the throughput comparison, 0 to skip it.")
+    return parser.parse_args()
+
+
+def _create_dataset(args, mode):
+    dataset_cls = ClassFactory.get_cls(ClassType.DATASET, args.dataset)
+    return dataset_cls(mode=mode, data_path=args.data_path, transforms=[])
+
+
+def _throughput(dataset, count):
+    count = min(count, len(dataset))
+    start = time.perf_counter()
+    for index in range(count):
+        dataset[index]
+    return count / (time.perf_counter() - start)
+
+
+def _pack_dataset():
+    args = _parse_args()
+    vega.set_backend(args.backend, "CPU")
+    from vega.datasets.common.packed import pack_dataset, PackedDataset
+    for mode in args.modes:
+        dataset = _create_dataset(args, mode)
+        start = time.time()
+        count = pack_dataset(dataset, os.path.join(args.output_path, mode), args.num_workers)
+        print("Packed {} items of {} in {:.1f}s.".format(count, mode, time.time() - start))
+        if args.benchmark:
+            packed = PackedDataset(mode=mode, data_path=args.output_path, transforms=[])
+            print("Throughput of {} items/s: {}: {:.1f}, PackedDataset: {:.1f}.".format(
+                mode, args.dataset, _throughput(dataset, args.benchmark), _throughput(packed, args.benchmark)))
+
+
+if __name__ == "__main__":
+    _pack_dataset()
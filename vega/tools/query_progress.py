@@ -28,6 +28,8 @@ def _parse_args(desc):
                         help="vega application task id")
     parser.add_argument("-r", "--root_path", type=str, required=True,
                         help="root path where vega application is running")
+    parser.add_argument("-v", "--version", type=int, required=False, default=None,
+                        help="only query the models changed after the version returned by the last query")
     args = parser.parse_args()
     return args
 
@@ -46,6 +48,67 @@ def _load_report(report_path):
         return None
 
 
+def _load_report_since(report_path, version):
+    """Load the steps and the models changed after the version from `reports_progress.json`."""
+    output_path = os.path.dirname(report_path)
+    report = _load_report(os.path.join(output_path, "reports_progress.json"))
+    if not report:
+        return None
+    if report["version"] <= version:
+        return report
+    changes_file = os.path.join(output_path, "reports_changes.json")
+    models = {}
+    for change in _read_changes_since(changes_file, version):
+        for step_name, records in change["records"].items():
+            step_models = models.setdefault(step_name, {})
+            for record in records:
+                step_models[record["worker_id"]] = record
+    for step_name, step_models in models.items():
+        report[step_name] = list(step_models.values())
+    return report
+
+
+def _read_changes_since(changes_file, version):
+    """Read the changes after the version, the lines are found by binary search of the versions."""
+    if not os.path.exists(changes_file):
+        return []
+    with open(changes_file, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+
+        def _line_start(pos):
+            if pos == 0:
+                return 0
+            f.seek(pos - 1)
+            f.readline()
+            return f.tell()
+
+        def _after(start):
+            if start >= size:
+                return True
+            f.seek(start)
+            try:
+                return json.loads(f.readline())["version"] > version
+            except ValueError:
+                return True
+
+        low, high = 0, size
+        while low < high:
+            mid = (low + high) // 2
+            if _after(_line_start(mid)):
+                high = mid
+            else:
+                low = mid + 1
+        f.seek(_line_start(low))
+        changes = []
+        for line in f:
+            try:
+                changes.append(json.loads(line))
+            except ValueError:
+                # the last line may be being written
+                break
+        return changes
+
+
 def _parse_report(report):
     if "_steps_" not in report:
         return {
@@ -80,7 +143,8 @@ def _statistic_progress(progress):
     for step in progress["steps"]:
         finished_models = 0
         finished_epochs = 0
-        if "models" not in step:
+        if "models" not in step or "finished_models" in step:
+            # the counters are aggregated by the report server
             continue
         for model in step["models"]:
             if model["status"] in [Status.finished.value, Status.finished]:
@@ -129,10 +193,21 @@ def _query_report(task_info):
         return None
 
 
+def _query_report_since(task_info, version):
+    """Get the models changed after the version."""
+    try:
+        client = MessageClient(ip=task_info["ip"], port=task_info["port"], timeout=1)
+        return client.send(action="query_report_since", data={"version": version})
+    except Exception:
+        return None
+
+
 def query_progress(times=0):
     """Query vega progress."""
     args = _parse_args("Query Vega progress.")
     task_info = query_task_info(args.task_id)
+    if args.version is not None:
+        return _query_progress_since(args, task_info)
 
     if not task_info:
         report_path = _get_report_path(args.root_path, args.task_id)
@@ -163,6 +238,25 @@ def query_progress(times=0):
     return json.dumps(progress, cls=JsonEncoder, indent=4)
 
 
+def _query_progress_since(args, task_info):
+    """Query the progress, with the models changed after the version."""
+    if task_info:
+        report = _query_report_since(task_info, args.version)
+    else:
+        report = _load_report_since(_get_report_path(args.root_path, args.task_id), args.version)
+    if not report or "_steps_" not in report:
+        return json.dumps({
+            "status": Status.error,
+            "message": "Failed to query progress."
+        }, cls=JsonEncoder, indent=4)
+    progress = _parse_report(report)
+    progress = _statistic_progress(progress)
+    progress["version"] = report["version"]
+    if progress["status"] == Status.running and not task_info:
+        progress["status"] = Status.stopped
+    return json.dumps(progress, cls=JsonEncoder, indent=4)
+
+
 def print_progress():
     """Print progress."""
     print(query_progress())
@@ -9,16 +9,12 @@
 # MIT License for more details.
 
 """Callbacks called at certain points of trainer."""
+import os
 import logging
-import copy
 import vega
 from vega.common.class_factory import ClassFactory, ClassType
 from vega.trainer.callbacks.callback import Callback
-from vega.modules.operators import Identity
-
-if vega.is_torch_backend():
-    import torch
-    from torch.nn.utils.fusion import fuse_conv_bn_weights
+from vega.model_zoo.fusion import fuse
 
 
 @ClassFactory.register(ClassType.CALLBACK)
@@ -30,25 +26,24 @@ class OperatorFusionCallback(Callback):
         super(OperatorFusionCallback, self).__init__()
 
     def after_train(self, logs=None):
-        """Be called before the validation."""
-        if not vega.is_torch_backend() or self.trainer.model.__class__.__name__ != 'DagNetwork':
+        """Be called before the validation.
+
+        The model is fused if the outputs of the fused model match on a valid batch, and the fused
+        weights are saved to `model_<id>_fused.pth`, since they only load into the fused model.
+        """
+        if not vega.is_torch_backend():
             return
-        logging.info("Start operator fusion.")
-        for name, node in self.trainer.model.module_map.items():
-            module = node.module
-            if isinstance(node.module, torch.nn.Conv2d):
-                next_nodes = node.child_nodes
-                if next_nodes and isinstance(next_nodes[0].module, torch.nn.BatchNorm2d):
-                    node.module = self._fuse_conv_bn(module, next_nodes[0].module)
-                    next_nodes[0].module = Identity()
-        self._save_model()
-
-    def _fuse_conv_bn(self, conv, bn):
-        fused_conv = copy.deepcopy(conv)
-        fused_conv.weight, fused_conv.bias = fuse_conv_bn_weights(
-            fused_conv.weight, fused_conv.bias, bn.running_mean, bn.running_var, bn.eps, bn.weight, bn.bias)
-        return fused_conv
-
-    def _save_model(self):
-        if vega.is_torch_backend():
-            torch.save(self.trainer.model.state_dict(), self.trainer.weights_file)
+        self.trainer.model.eval()
+        fused_file = "{}_fused{}".format(*os.path.splitext(self.trainer.weights_file))
+        self.trainer.model = fuse(self.trainer.model, fused_file, check_input=self._sample_input())
+
+    def _sample_input(self):
+        """Get the input of the first valid batch, or None if it is not a tensor."""
+        import torch
+        if self.trainer.valid_loader is None:
+            return None
+        batch = self.trainer.make_batch(next(iter(self.trainer.valid_loader)))
+        if isinstance(batch, (list, tuple)) and torch.is_tensor(batch[0]):
+            return batch[0]
+        logging.warning("The valid batches are not (input, target) tensors, fuse operators without checking.")
+        return None
@@ -18,6 +18,7 @@ import vega
 from .callback import Callback
 from vega.common import FileOps
 from vega.common import ClassFactory, ClassType
+from vega.trainer.checkpoint_writer import CheckpointWriter
 
 if vega.is_torch_backend():
     import torch
@@ -33,9 +34,13 @@ class ModelCheckpoint(Callback):
         """Initialize ModelCheckpoint callback."""
         super(ModelCheckpoint, self).__init__()
         self.priority = 240
+        self.writer = None
 
     def before_train(self, logs=None):
         """Be called before the training process."""
+        if self.writer is None:
+            config = self.trainer.config
+            self.writer = CheckpointWriter(config.checkpoint_max_pending, config.checkpoint_keep_last)
         if self.trainer.load_checkpoint:
             self._load_checkpoint()
 
@@ -43,19 +48,29 @@ class ModelCheckpoint(Callback):
         """Be called after each epoch."""
         if not self.trainer.config.save_checkpoint:
             return
+        last_epoch = epoch + 1 >= self.trainer.epochs
         if not self.trainer.do_validation:
             self._save_best_model()
-            return
-        self._save_checkpoint(epoch)
-        if self.trainer.multi_task:
-            self._saved_multi_checkpoint(epoch)
-        if self.trainer.is_chief and logs.get('summary_perfs').get('best_changed', False):
-            self._save_best_model()
+        else:
+            if last_epoch or (epoch + 1) % self.trainer.config.checkpoint_interval == 0:
+                self._save_checkpoint(epoch)
+                if self.trainer.multi_task:
+                    self._saved_multi_checkpoint(epoch)
+            if self.trainer.is_chief and logs.get('summary_perfs').get('best_changed', False):
+                self._save_best_model()
+        if last_epoch:
+            # the files are used by the callbacks after training
+            self.writer.flush()
+
+    def after_train(self, logs=None):
+        """Be called after the training process, wait for the checkpoints to be written."""
+        if self.writer is not None:
+            self.writer.flush()
 
     def _save_best_model(self):
         """Save best model."""
         if vega.is_torch_backend():
-            torch.save(self.trainer.model.state_dict(), self.trainer.weights_file)
+            self._torch_save(self.trainer.model.state_dict(), self.trainer.weights_file)
         elif vega.is_tf_backend():
             worker_path = self.trainer.get_local_worker_path()
             model_id = "model_{}".format(self.trainer.worker_id)
@@ -95,9 +110,20 @@ class ModelCheckpoint(Callback):
                 'optimizer': self.trainer.optimizer.state_dict(),
                 'lr_scheduler': self.trainer.lr_scheduler.state_dict(),
             }
-            torch.save(ckpt, checkpoint_file)
+            self._torch_save(ckpt, checkpoint_file, epoch)
         self.trainer.checkpoint_file = checkpoint_file
 
+    def _torch_save(self, obj, file_name, epoch=None):
+        """Save to a temporary file and rename it, files shared by hard links are never rewritten.
+
+        The file is written on a background thread, and a copy of the epoch is kept if `epoch` is set.
+        """
+        copy_name = None
+        if epoch is not None:
+            name, ext = os.path.splitext(file_name)
+            copy_name = "{}_{}{}".format(name, epoch, ext)
+        self.writer.save(obj, file_name, copy_name)
+
     def _load_checkpoint(self):
         """Load checkpoint."""
         if vega.is_torch_backend():
@@ -142,7 +168,7 @@ class ModelCheckpoint(Callback):
                 'optimizer': self.trainer.optimizer.state_dict(),
                 'lr_scheduler': self.trainer.lr_scheduler.state_dict(),
             }
-            torch.save(ckpt, checkpoint_file)
+            self._torch_save(ckpt, checkpoint_file, epoch)
         self.trainer.checkpoint_file = checkpoint_file
 
     def _save_pb_model(self, weight_file, model_id):
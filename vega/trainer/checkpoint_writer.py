@@ -0,0 +1,127 @@
+# -*- coding:utf-8 -*-
+
+# Copyright (C) 2020. Huawei Technologies Co., Ltd. All rights reserved.
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# MIT License for more details.
+
+"""Write pytorch checkpoints on a background thread."""
+
+import os
+import shutil
+import logging
+import threading
+from queue import Queue
+from collections import OrderedDict, deque
+
+
+class CheckpointWriter(object):
+    """Save pytorch objects to files on a background thread.
+
+    The tensors are copied to cpu memory when saving, then serialized, synced to disk and renamed to the
+    file on the thread, so the file is either the old one or the complete new one. At most `max_pending`
+    saves are waiting, a new save blocks until one is written. Saves are written synchronously if
+    `max_pending` is 0.
+
+    :param max_pending: the max number of saves waiting to be written
+    :type max_pending: int
+    :param keep_last: the number of copies of each file to keep, 0 to keep none
+    :type keep_last: int
+    """
+
+    def __init__(self, max_pending=2, keep_last=0):
+        self.max_pending = max_pending
+        self.keep_last = keep_last
+        self._queue = Queue(maxsize=max_pending) if max_pending > 0 else None
+        self._thread = None
+        self._error = None
+        self._copies = {}
+
+    def save(self, obj, file_name, copy_name=None):
+        """Save an object to a file.
+
+        :param obj: the object to save, such as a state dict
+        :param file_name: the file name
+        :type file_name: str
+        :param copy_name: the file name of the copy to keep, the oldest copies are removed if there are
+            more than `keep_last` copies of the file
+        :type copy_name: str
+        """
+        self._raise_error()
+        if self._queue is None:
+            self._write(obj, file_name, copy_name)
+            return
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        self._queue.put((snapshot(obj), file_name, copy_name))
+
+    def flush(self):
+        """Wait until all saves are written, and raise the error of writing if any."""
+        if self._queue is not None:
+            self._queue.join()
+        self._raise_error()
+
+    def _run(self):
+        while True:
+            obj, file_name, copy_name = self._queue.get()
+            try:
+                self._write(obj, file_name, copy_name)
+            except Exception as e:
+                logging.error("Failed to save checkpoint {}, message: {}".format(file_name, e))
+                self._error = e
+            finally:
+                self._queue.task_done()
+
+    def _write(self, obj, file_name, copy_name):
+        import torch
+        tmp_file = "{}.tmp".format(file_name)
+        with open(tmp_file, "wb") as f:
+            torch.save(obj, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, file_name)
+        if copy_name and self.keep_last > 0:
+            self._keep_copy(file_name, copy_name)
+
+    def _keep_copy(self, file_name, copy_name):
+        if os.path.exists(copy_name):
+            os.remove(copy_name)
+        try:
+            os.link(file_name, copy_name)
+        except OSError:
+            shutil.copyfile(file_name, copy_name)
+        copies = self._copies.setdefault(file_name, deque())
+        if copy_name in copies:
+            copies.remove(copy_name)
+        copies.append(copy_name)
+        while len(copies) > self.keep_last:
+            old_copy = copies.popleft()
+            if os.path.exists(old_copy):
+                os.remove(old_copy)
+
+    def _raise_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+
+def snapshot(obj):
+    """Copy the tensors in an object to cpu memory, and copy the dicts, lists and tuples which contain them."""
+    import torch
+    if isinstance(obj, torch.Tensor):
+        return obj.detach().to("cpu", copy=True)
+    if isinstance(obj, dict):
+        copied = OrderedDict() if isinstance(obj, OrderedDict) else {}
+        for key, value in obj.items():
+            copied[key] = snapshot(value)
+        if hasattr(obj, "_metadata"):
+            copied._metadata = obj._metadata
+        return copied
+    if isinstance(obj, (list, tuple)):
+        copied = [snapshot(value) for value in obj]
+        return copied if isinstance(obj, list) else tuple(copied)
+    return obj
@@ -100,9 +100,15 @@ class TrainerConfig(ConfigSerializable):
     valid_report_steps = 10
     load_checkpoint = True
     save_checkpoint = True
+    checkpoint_interval = 1  # save the checkpoint every n epochs, and at the last epoch
+    checkpoint_keep_last = 0  # keep the checkpoints of the last n saves as checkpoint_<epoch>.pth
+    checkpoint_max_pending = 2  # max checkpoints waiting to be written in background, 0 to write synchronously
     load_weights_file = True
     use_unsupervised_pretrain = False
     calc_latency = False
+    compile_valid = None  # None, trace or script, validate the model as a frozen torch.jit graph
+    prefetch = None  # None, cuda or thread, prefetch the next batches of the train and valid loaders
+    prefetch_depth = 2  # max number of batches prefetched
     train_in_once = False
     mixup = False
     multi_task = False
@@ -174,7 +180,13 @@ class TrainerConfig(ConfigSerializable):
                                "load_checkpoint": {"type": bool},
                                "mixup": {"type": bool},
                                "multi_task": {"type": bool},
-                               "adaptive_muti_loss": {"type": bool}
+                               "adaptive_muti_loss": {"type": bool},
+                               "compile_valid": {"type": (str, None)},
+                               "checkpoint_interval": {"type": int},
+                               "checkpoint_keep_last": {"type": int},
+                               "checkpoint_max_pending": {"type": int},
+                               "prefetch": {"type": (str, None)},
+                               "prefetch_depth": {"type": int}
                                }
         return check_rules_trainer
 
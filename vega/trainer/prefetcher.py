@@ -0,0 +1,165 @@
+# -*- coding:utf-8 -*-
+
+# Copyright (C) 2020. Huawei Technologies Co., Ltd. All rights reserved.
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# MIT License for more details.
+
+"""Prefetch the batches of a pytorch data loader."""
+
+import threading
+from queue import Queue
+import torch
+
+
+class ThreadPrefetcher(object):
+    """Load and convert the next batches on a background thread.
+
+    The batches are fetched from the loader, which collates them if it has no workers, and converted by
+    `convert` on the thread, so it overlaps with the train step.
+
+    :param loader: the data loader
+    :param convert: the function to convert a batch, such as moving it to the device
+    :type convert: function
+    :param depth: the max number of batches prefetched
+    :type depth: int
+    """
+
+    def __init__(self, loader, convert=None, depth=2):
+        self.loader = loader
+        self.convert = convert
+        self.depth = depth
+
+    def __len__(self):
+        """Get the number of batches of the loader."""
+        return len(self.loader)
+
+    def __iter__(self):
+        """Iterate over the prefetched batches."""
+        queue = Queue(maxsize=max(self.depth, 1))
+        stop = threading.Event()
+        end = object()
+        thread = threading.Thread(target=self._run, args=(queue, stop, end), daemon=True)
+        thread.start()
+        try:
+            while True:
+                item = queue.get()
+                if item is end:
+                    break
+                if isinstance(item, _Error):
+                    raise item.error
+                yield item
+        finally:
+            stop.set()
+            while thread.is_alive():
+                while not queue.empty():
+                    queue.get_nowait()
+                thread.join(0.01)
+
+    def _run(self, queue, stop, end):
+        try:
+            for batch in self.loader:
+                if stop.is_set():
+                    return
+                queue.put(self.convert(batch) if self.convert is not None else batch)
+        except Exception as e:
+            queue.put(_Error(e))
+            return
+        queue.put(end)
+
+
+class CudaPrefetcher(object):
+    """Copy the next batches to the gpu on a side stream.
+
+    The tensors are pinned if the loader does not pin them, and copied with `non_blocking=True` on a side
+    stream while the current batch is processed. The current stream waits for the copy of a batch before
+    using it.
+
+    :param loader: the data loader
+    :param depth: the max number of batches prefetched
+    :type depth: int
+    """
+
+    def __init__(self, loader, depth=2):
+        self.loader = loader
+        self.depth = depth
+
+    def __len__(self):
+        """Get the number of batches of the loader."""
+        return len(self.loader)
+
+    def __iter__(self):
+        """Iterate over the batches on the gpu."""
+        stream = torch.cuda.Stream()
+        pending = []
+        for batch in self.loader:
+            with torch.cuda.stream(stream):
+                batch = self._to_device(batch)
+                event = torch.cuda.Event()
+                event.record(stream)
+            pending.append((batch, event))
+            if len(pending) > max(self.depth - 1, 0):
+                yield self._wait(*pending.pop(0))
+        while pending:
+            yield self._wait(*pending.pop(0))
+
+    def _to_device(self, data):
+        if torch.is_tensor(data):
+            if not data.is_cuda and not data.is_pinned():
+                data = data.pin_memory()
+            return data.cuda(non_blocking=True)
+        if isinstance(data, dict):
+            return {k: self._to_device(v) for k, v in data.items()}
+        elif isinstance(data, list):
+            return [self._to_device(v) for v in data]
+        elif isinstance(data, tuple):
+            return tuple([self._to_device(v) for v in data])
+        return data
+
+    def _wait(self, batch, event):
+        torch.cuda.current_stream().wait_event(event)
+        _record_stream(batch, torch.cuda.current_stream())
+        return batch
+
+
+def _record_stream(data, stream):
+    """Mark the tensors as used by the stream, so their memory is not reused by the side stream too early."""
+    if torch.is_tensor(data):
+        data.record_stream(stream)
+    elif isinstance(data, dict):
+        for v in data.values():
+            _record_stream(v, stream)
+    elif isinstance(data, (list, tuple)):
+        for v in data:
+            _record_stream(v, stream)
+
+
+class _Error(object):
+    """The error raised on the prefetching thread."""
+
+    def __init__(self, error):
+        self.error = error
+
+
+def prefetch(loader, mode, convert=None, depth=2):
+    """Wrap a data loader with a prefetcher.
+
+    :param loader: the data loader
+    :param mode: None, cuda or thread, cuda falls back to thread if gpu is not available
+    :type mode: str
+    :param convert: the function to convert a batch on the thread
+    :type convert: function
+    :param depth: the max number of batches prefetched
+    :type depth: int
+    :return: the prefetcher, or the loader itself if mode is None
+    """
+    if not mode:
+        return loader
+    if mode not in ("cuda", "thread"):
+        raise ValueError("Prefetch mode should be cuda or thread, but got {}.".format(mode))
+    if mode == "cuda" and torch.cuda.is_available():
+        return CudaPrefetcher(loader, depth)
+    return ThreadPrefetcher(loader, convert, depth)
@@ -70,6 +70,7 @@ class TrainerBase(DistributedWorker):
         self.valid_loader = None
         self.train_step = None
         self.valid_step = None
+        self.valid_model = None
         self.make_batch = None
         self.model_fn = None
         self.train_input_fn = None
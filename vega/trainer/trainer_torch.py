@@ -16,6 +16,7 @@ from vega.trainer.trainer_base import TrainerBase
 from vega.modules.loss import Loss
 from vega.trainer.modules.lr_schedulers import LrScheduler
 from vega.trainer.modules.optimizer import Optimizer
+from vega.trainer.prefetcher import prefetch
 from vega.common import ClassFactory, ClassType
 
 
@@ -86,7 +87,7 @@ class TrainerTorch(TrainerBase):
 
     def _train_epoch(self):
         self.model.train()
-        for batch_index, batch in enumerate(self.train_loader):
+        for batch_index, batch in enumerate(self._prefetch(self.train_loader)):
             if self.config.max_train_steps and batch_index >= self.config.max_train_steps:
                 return
             batch = self.make_batch(batch)
@@ -99,19 +100,30 @@ class TrainerTorch(TrainerBase):
             self.callbacks.after_train_step(batch_index, batch_logs)
 
     def _valid_epoch(self):
+        from vega.model_zoo.compiler import compile_model
         self.callbacks.before_valid()
         valid_logs = None
         self.model.eval()
+        self.valid_model = compile_model(self.model, self.config.compile_valid)
         with torch.no_grad():
-            for batch_index, batch in enumerate(self.valid_loader):
+            for batch_index, batch in enumerate(self._prefetch(self.valid_loader)):
                 batch = self.make_batch(batch)
                 batch_logs = {'valid_batch': batch}
                 self.callbacks.before_valid_step(batch_index, batch_logs)
                 valid_batch_output = self.valid_step(batch)
                 self.callbacks.after_valid_step(batch_index, valid_batch_output)
 
+        self.valid_model = None
         self.callbacks.after_valid(valid_logs)
 
+    def _prefetch(self, loader):
+        """Wrap the loader with the prefetcher of the config, the batches are moved to the device in advance."""
+        mode = self.config.prefetch
+        if mode == "cuda" and not vega.is_gpu_device():
+            mode = "thread"
+        convert = None if vega.is_cpu_device() else self._set_device
+        return prefetch(loader, mode, convert, self.config.prefetch_depth)
+
     def _default_make_batch(self, batch):
         """Unpack batch to get input and target."""
         if not vega.is_cpu_device():
@@ -187,13 +199,14 @@ class TrainerTorch(TrainerBase):
         return train_batch_output
 
     def _default_valid_step(self, batch):
+        model = self.model if self.valid_model is None else self.valid_model
         if isinstance(batch, dict):
-            output = self.model(**batch)
+            output = model(**batch)
         elif isinstance(batch, list) and isinstance(batch[0], dict):
-            output = self.model(batch)
+            output = model(batch)
         else:
             input, target = batch
-            output = self.model(input) if not isinstance(input, dict) else self.model(**input)
+            output = model(input) if not isinstance(input, dict) else model(**input)
         return {'valid_batch_output': output}
 
     def _mixup_batch(self, x, y, ratio):